@@ -4,6 +4,7 @@ import traceback
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utils import DTS_PATTERN
 
 # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!! ATTENTION! !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 #             ONLY EDIT THIS FILE IF YOU KNOW WHAT YOU ARE DOING!
@@ -12,6 +13,28 @@ import traceback
 # !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!! ATTENTION! !!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!!
 
 
+class Template(str):
+    """Text with <dts> substitutions, split once into text and DTS parts.
+
+    Rendering replaces the DTS parts with their values and joins the parts,
+    instead of searching the text for every DTS of the event.
+    """
+
+    def __new__(cls, text):
+        template = super(Template, cls).__new__(cls, text)
+        # Alternates text and DTS keys: [text, key, text, ..., text]
+        template._parts = DTS_PATTERN.split(text)
+        return template
+
+    def render(self, dts):
+        """Returns the text with its DTS replaced by their values."""
+        parts = self._parts.copy()
+        for i in range(1, len(parts), 2):
+            key = parts[i]
+            parts[i] = str(dts[key]) if key in dts else f"<{key}>"
+        return "".join(parts)
+
+
 # This is a basic interface for the Alarms Modules to implement
 class Alarm(object):
 
@@ -21,6 +44,9 @@ class Alarm(object):
         "gyms": {},
     }
 
+    # DTS used by the templates of the alarm (set when loaded)
+    dts_keys = frozenset()
+
     # Gather settings and create alarm
     def __init__(self):
         raise NotImplementedError("This is an abstract method.")
@@ -79,10 +105,22 @@ class Alarm(object):
         if string is None:
             return None
 
-        s = string
-        for key in pkinfo:
-            s = s.replace(f"<{key}>", str(pkinfo[key]))
-        return s
+        if not isinstance(string, Template):
+            string = Template(string)
+        return string.render(pkinfo)
+
+    # Return the alert settings with their strings parsed as Templates
+    @staticmethod
+    def parse_templates(settings):
+        if isinstance(settings, str):
+            return Template(settings)
+        if isinstance(settings, dict):
+            return {
+                key: Alarm.parse_templates(value) for key, value in settings.items()
+            }
+        if isinstance(settings, list):
+            return [Alarm.parse_templates(value) for value in settings]
+        return settings
 
     @staticmethod
     def pop_type(data, param_name, kind, default=None):
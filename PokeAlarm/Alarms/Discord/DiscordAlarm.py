@@ -235,7 +235,7 @@ class DiscordAlarm(Alarm):
             alert["timestamp"] = default["footer_timestamp"]
 
         reject_leftover_parameters(settings, "'Alert level in Discord alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Send Alert to Discord
     def send_alert(self, alert, info):
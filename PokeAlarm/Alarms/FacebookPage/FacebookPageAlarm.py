@@ -176,7 +176,7 @@ class FacebookPageAlarm(Alarm):
             "name": settings.pop("name", default["name"]),
         }
         reject_leftover_parameters(settings, "Alert level in FacebookPage alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Post Pokemon Message
     def send_alert(self, alert, info):
@@ -156,7 +156,7 @@ class PushbulletAlarm(Alarm):
             "channel": settings.pop("channel", None),
         }
         reject_leftover_parameters(settings, "Alert level in Pushbullet alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Send Alert to Pushbullet
     def send_alert(self, alert, info):
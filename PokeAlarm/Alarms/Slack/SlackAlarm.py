@@ -185,7 +185,7 @@ class SlackAlarm(Alarm):
             else get_gmaps_static_url(map, self.__static_map_key),
         }
         reject_leftover_parameters(settings, "'Alert level in Slack alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Send Alert to Slack
     def send_alert(self, alert, info):
@@ -223,7 +223,7 @@ class TelegramAlarm(Alarm):
                 f"'{key}' is not a recognized parameter for the Alert level in a Telegram Alarm"
             )
 
-        return alert
+        return TelegramAlarm.Alert._make(Alarm.parse_templates(list(alert)))
 
     # Sends a start up message on Telegram
     def startup_message(self):
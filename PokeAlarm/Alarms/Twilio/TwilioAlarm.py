@@ -132,7 +132,7 @@ class TwilioAlarm(Alarm):
             "message": settings.pop("message", default["message"]),
         }
         reject_leftover_parameters(settings, "'Alert level in Twilio alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Send Pokemon Info
     def send_alert(self, alert, info):
@@ -142,7 +142,7 @@ class TwitterAlarm(Alarm):
     def create_alert_settings(self, settings, default):
         alert = {"status": settings.pop("status", default["status"])}
         reject_leftover_parameters(settings, "'Alert level in Twitter alarm.")
-        return alert
+        return self.parse_templates(alert)
 
     # Shortens the tweet down, calculating for urls being shortened
     def shorten(self, message, limit=280, url_length=23):
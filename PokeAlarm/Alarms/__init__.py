@@ -1,5 +1,5 @@
-from PokeAlarm.Utils import require_and_remove_key
-from .Alarm import Alarm  # noqa F401
+from PokeAlarm.Utils import get_dts_keys, require_and_remove_key
+from .Alarm import Alarm, Template  # noqa F401
 
 
 def alarm_factory(mgr, settings, max_attempts, api_key, signing_secret_key):
@@ -7,30 +7,34 @@ def alarm_factory(mgr, settings, max_attempts, api_key, signing_secret_key):
     if kind == "discord":
         from PokeAlarm.Alarms.Discord import DiscordAlarm
 
-        return DiscordAlarm(mgr, settings, max_attempts, api_key, signing_secret_key)
+        alarm = DiscordAlarm(mgr, settings, max_attempts, api_key, signing_secret_key)
     elif kind == "facebook_page":
         from PokeAlarm.Alarms.FacebookPage import FacebookPageAlarm
 
-        return FacebookPageAlarm(mgr, settings)
+        alarm = FacebookPageAlarm(mgr, settings)
     elif kind == "pushbullet":
         from PokeAlarm.Alarms.Pushbullet import PushbulletAlarm
 
-        return PushbulletAlarm(mgr, settings)
+        alarm = PushbulletAlarm(mgr, settings)
     elif kind == "slack":
         from PokeAlarm.Alarms.Slack import SlackAlarm
 
-        return SlackAlarm(mgr, settings, api_key, signing_secret_key)
+        alarm = SlackAlarm(mgr, settings, api_key, signing_secret_key)
     elif kind == "telegram":
         from PokeAlarm.Alarms.Telegram import TelegramAlarm
 
-        return TelegramAlarm(mgr, settings)
+        alarm = TelegramAlarm(mgr, settings)
     elif kind == "twilio":
         from PokeAlarm.Alarms.Twilio import TwilioAlarm
 
-        return TwilioAlarm(mgr, settings)
+        alarm = TwilioAlarm(mgr, settings)
     elif kind == "twitter":
         from PokeAlarm.Alarms.Twitter import TwitterAlarm
 
-        return TwitterAlarm(mgr, settings)
+        alarm = TwitterAlarm(mgr, settings)
     else:
         raise ValueError(f"{kind} is not a valid alarm type!")
+
+    # Templates are in the settings of the alarm, with their defaults applied
+    alarm.dts_keys = frozenset(get_dts_keys(list(vars(alarm).values())))
+    return alarm
@@ -1,11 +1,117 @@
 # Standard Library Imports
+import heapq
+from collections import OrderedDict, namedtuple
 from datetime import datetime
 
 # 3rd Party Imports
 # Local Imports
-from PokeAlarm import Unknown
+from PokeAlarm import config, Unknown
 from PokeAlarm.Utils import get_image_url
 
+_MISSING = object()
+
+
+class HistDict(dict):
+    """Dict of keys to the datetime they expire at.
+
+    Expirations are also kept ordered in a heap, so expired keys can be
+    removed without going over every key. Entries of the heap that were
+    changed or deleted since are skipped when reached.
+    """
+
+    __slots__ = ("_heap", "evicted")
+
+    def __init__(self, *args):
+        super(HistDict, self).__init__(*args)
+        self.evicted = 0  # Keys removed by expire
+        self.rebuild()
+
+    def rebuild(self):
+        """Recreates the heap from the current contents."""
+        self._heap = [(expiration, key) for key, expiration in self.items()]
+        heapq.heapify(self._heap)
+
+    def __setitem__(self, key, value):
+        super(HistDict, self).__setitem__(key, value)
+        heapq.heappush(self._heap, (value, key))
+        if len(self._heap) > 2 * len(self) + 100:  # Mostly outdated entries
+            self.rebuild()
+
+    def clear(self):
+        super(HistDict, self).clear()
+        self._heap = []
+
+    def expire(self, now):
+        """Removes the keys that expired before now and returns how many."""
+        heap, count = self._heap, 0
+        while len(heap) > 0 and heap[0][0] < now:
+            expiration, key = heapq.heappop(heap)
+            if dict.get(self, key, _MISSING) == expiration:
+                del self[key]
+                count += 1
+        self.evicted += count
+        return count
+
+    def stats(self):
+        return {"size": len(self), "heap": len(self._heap), "evicted": self.evicted}
+
+
+class LRUDict(OrderedDict):
+    """Dict that removes its least recently used keys past maxsize.
+
+    Reading a key with get or setting it marks it as used. A maxsize of 0
+    means no limit.
+    """
+
+    __slots__ = ("maxsize", "evicted")
+
+    def __init__(self, maxsize, *args):
+        self.maxsize = maxsize
+        self.evicted = 0  # Keys removed for being over maxsize
+        super(LRUDict, self).__init__(*args)
+
+    def get(self, key, default=None):
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING:
+            return default
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super(LRUDict, self).__setitem__(key, value)
+        self.move_to_end(key)
+        while 0 < self.maxsize < len(self):
+            del self[next(iter(self))]
+            self.evicted += 1
+
+    def stats(self):
+        return {"size": len(self), "maxsize": self.maxsize, "evicted": self.evicted}
+
+
+class GymInfo(namedtuple("GymInfo", "team slots name desc image")):
+    """Cached details of a gym."""
+
+    __slots__ = ()
+
+
+class CellInfo(namedtuple("CellInfo", "weather_id severity_id day_or_night_id")):
+    """Cached weather of a s2 cell."""
+
+    __slots__ = ()
+
+
+class QuestInfo(namedtuple("QuestInfo", "reward task last_modified")):
+    """Cached quest of a stop."""
+
+    __slots__ = ()
+
+
+NO_GYM = GymInfo(
+    Unknown.TINY, Unknown.TINY, Unknown.REGULAR, Unknown.REGULAR, Unknown.REGULAR
+)
+NO_CELL = CellInfo(Unknown.REGULAR, Unknown.REGULAR, Unknown.REGULAR)
+NO_QUEST = QuestInfo(Unknown.REGULAR, Unknown.REGULAR, Unknown.REGULAR)
+
 
 class Cache(object):
     """Basic object for caching information.
@@ -16,27 +122,33 @@ class Cache(object):
 
     default_image_url = (get_image_url("regular/gyms/0.png"),)
 
+    # Names of the maps of expirations, stored as self._<name>
+    HIST = (
+        "mon_hist",
+        "stop_hist",
+        "egg_hist",
+        "raid_hist",
+        "quest_hist",
+        "grunt_hist",
+    )
+    # Most entries kept in each map of records, overridden by
+    # config["CACHE_SIZES"]. Records of older objects are removed first.
+    SIZES = {"gyms": 100000, "cells": 100000, "quests": 100000}
+
     def __init__(self, mgr):
         """Initializes a new cache object for storing data between events."""
         self._log = mgr.get_child_logger("cache")
 
-        self._mon_hist = {}
-        self._stop_hist = {}
-        self._egg_hist = {}
-        self._raid_hist = {}
-        self._quest_hist = {}
-        self._grunt_hist = {}
-        self._gym_team = {}
-        self._gym_slots = {}
-        self._gym_name = {}
-        self._gym_desc = {}
-        self._gym_image = {}
-        self._cell_weather_id = {}
-        self._severity_id = {}
-        self._day_or_night_id = {}
-        self._quest_reward = {}
-        self._quest_task = {}
-        self._quest_last_modified = {}
+        self._mon_hist = HistDict()
+        self._stop_hist = HistDict()
+        self._egg_hist = HistDict()
+        self._raid_hist = HistDict()
+        self._quest_hist = HistDict()
+        self._grunt_hist = HistDict()
+        self._sizes = dict(self.SIZES, **config.get("CACHE_SIZES", {}))
+        self._gyms = LRUDict(self._sizes["gyms"])
+        self._cells = LRUDict(self._sizes["cells"])
+        self._quests = LRUDict(self._sizes["quests"])
 
     def monster_expiration(self, mon_id, expiration=None):
         """Update and return the datetime that a monster expires."""
@@ -74,92 +186,115 @@ class Cache(object):
             self._grunt_hist[stop_id] = expiration
         return self._grunt_hist.get(stop_id)
 
+    def processed(self, kind, key, expiration):
+        """Return if an object was processed before, else store its expiration.
+
+        The kind is "monster", "stop", "egg", "raid" or "grunt".
+        """
+        expiration_of = getattr(self, f"{kind}_expiration")
+        if expiration_of(key) is not None:
+            return True
+        expiration_of(key, expiration)
+        return False
+
+    @staticmethod
+    def _update(records, key, empty, **fields):
+        """Updates the given fields of the record of a key and returns it."""
+        record = records.get(key, empty)._replace(**fields)
+        records[key] = record
+        return record
+
     def gym_team(self, gym_id, team_id=Unknown.TINY):
         """Update and return the team_id of a gym."""
         if Unknown.is_not(team_id):
-            self._gym_team[gym_id] = team_id
-        return self._gym_team.get(gym_id, Unknown.TINY)
+            return self._update(self._gyms, gym_id, NO_GYM, team=team_id).team
+        return self._gyms.get(gym_id, NO_GYM).team
 
     def gym_slots(self, gym_id, available_slots=Unknown.TINY):
         """Update and return the team_id of a gym."""
         if Unknown.is_not(available_slots):
-            self._gym_slots[gym_id] = available_slots
-        return self._gym_slots.get(gym_id, Unknown.TINY)
+            return self._update(self._gyms, gym_id, NO_GYM, slots=available_slots).slots
+        return self._gyms.get(gym_id, NO_GYM).slots
 
     def gym_name(self, gym_id, gym_name=Unknown.REGULAR):
         """Update and return the gym_name for a gym."""
         if Unknown.is_not(gym_name):
-            self._gym_name[gym_id] = gym_name
-        return self._gym_name.get(gym_id, Unknown.REGULAR)
+            return self._update(self._gyms, gym_id, NO_GYM, name=gym_name).name
+        return self._gyms.get(gym_id, NO_GYM).name
 
     def gym_desc(self, gym_id, gym_desc=Unknown.REGULAR):
         """Update and return the gym_desc for a gym."""
         if Unknown.is_not(gym_desc):
-            self._gym_desc[gym_id] = gym_desc
-        return self._gym_desc.get(gym_id, Unknown.REGULAR)
+            return self._update(self._gyms, gym_id, NO_GYM, desc=gym_desc).desc
+        return self._gyms.get(gym_id, NO_GYM).desc
 
     def gym_image(self, gym_id, gym_image=Unknown.REGULAR):
         """Update and return the gym_image for a gym."""
         if Unknown.is_not(gym_image):
-            self._gym_image[gym_id] = gym_image
-        return self._gym_image.get(gym_id, get_image_url("icons/gym_0.png"))
+            return self._update(self._gyms, gym_id, NO_GYM, image=gym_image).image
+        gym_image = self._gyms.get(gym_id, NO_GYM).image
+        return (
+            gym_image if Unknown.is_not(gym_image) else get_image_url("icons/gym_0.png")
+        )
 
     def cell_weather_id(self, s2_cell_id, cell_weather_id=Unknown.REGULAR):
         """Update and return weather_id for a cell"""
         if Unknown.is_not(cell_weather_id):
-            self._cell_weather_id[s2_cell_id] = cell_weather_id
-        return self._cell_weather_id.get(s2_cell_id, Unknown.REGULAR)
+            return self._update(
+                self._cells, s2_cell_id, NO_CELL, weather_id=cell_weather_id
+            ).weather_id
+        return self._cells.get(s2_cell_id, NO_CELL).weather_id
 
     def severity_id(self, s2_cell_id, severity_id=Unknown.REGULAR):
         """Update and return severity_id for a cell"""
         if Unknown.is_not(severity_id):
-            self._severity_id[s2_cell_id] = severity_id
-        return self._severity_id.get(s2_cell_id, Unknown.REGULAR)
+            return self._update(
+                self._cells, s2_cell_id, NO_CELL, severity_id=severity_id
+            ).severity_id
+        return self._cells.get(s2_cell_id, NO_CELL).severity_id
 
     def day_or_night_id(self, s2_cell_id, day_or_night_id=Unknown.REGULAR):
         """Update and return day_or_night_id for a cell"""
         if Unknown.is_not(day_or_night_id):
-            self._day_or_night_id[s2_cell_id] = day_or_night_id
-        return self._day_or_night_id.get(s2_cell_id, Unknown.REGULAR)
+            return self._update(
+                self._cells, s2_cell_id, NO_CELL, day_or_night_id=day_or_night_id
+            ).day_or_night_id
+        return self._cells.get(s2_cell_id, NO_CELL).day_or_night_id
 
     def quest_reward(self, stop_id, reward=None, task=None, last_modified=None):
         """Update and return the reward and task for a quest."""
+        fields = {}
         if Unknown.is_not(reward):
-            self._quest_reward[stop_id] = reward
+            fields["reward"] = reward
         if Unknown.is_not(task):
-            self._quest_task[stop_id] = task
+            fields["task"] = task
         if Unknown.is_not(last_modified):
-            self._quest_last_modified[stop_id] = last_modified
-        return (
-            self._quest_reward.get(stop_id, Unknown.REGULAR),
-            self._quest_task.get(stop_id, Unknown.REGULAR),
-            self._quest_last_modified.get(stop_id, Unknown.REGULAR),
-        )
+            fields["last_modified"] = last_modified
+        return tuple(self._update(self._quests, stop_id, NO_QUEST, **fields))
 
-    def clean_and_save(self):
+    def clean_and_save(self, wait=False):
         """Cleans the cache and saves the contents if capable."""
         self._clean_hist()
-        self._save()
+        self._save(wait)
+
+    def _save(self, wait=False):
+        """Export the data to a more permanent location.
 
-    def _save(self):
-        """Export the data to a more permanent location."""
+        Unless `wait` is set, the data may be written in the background.
+        """
         pass  # Mem cache isn't backed up.
 
+    def stats(self):
+        """Returns the size and evicted count of each map."""
+        stats = {name: getattr(self, f"_{name}").stats() for name in self.HIST}
+        for name in self.SIZES:
+            stats[name] = getattr(self, f"_{name}").stats()
+        return stats
+
     def _clean_hist(self):
         """Clean expired objects to free up memory."""
-        for hist in (
-            self._mon_hist,
-            self._stop_hist,
-            self._egg_hist,
-            self._raid_hist,
-            self._quest_hist,
-            self._grunt_hist,
-        ):
-            old = []
-            now = datetime.utcnow()
-            for key, expiration in hist.items():
-                if expiration < now:  # Track expired items
-                    old.append(key)
-            for key in old:  # Remove expired events
-                del hist[key]
-        self._log.debug("Cleared %s items from cache.", len(old))
+        now = datetime.utcnow()
+        removed = {name: getattr(self, f"_{name}").expire(now) for name in self.HIST}
+        self._log.debug(
+            "Cleared %s items from cache: %s", sum(removed.values()), removed
+        )
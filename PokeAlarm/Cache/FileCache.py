@@ -2,21 +2,93 @@
 import os
 
 # 3rd Party Imports
+import gevent
 import pickle
 import portalocker
 import traceback
 
 # Local Imports
 from ..Utils import get_path
-from . import Cache
+from .Cache import Cache, HistDict, LRUDict, NO_CELL, NO_GYM, NO_QUEST
+
+_MISSING = object()
+
+
+class JournalDict(dict):
+    """Dict that records its changes in a list shared with other dicts.
+
+    Sets are recorded as (name, key, value) and deletes as (name, key).
+    Setting a key to the value it already has isn't recorded.
+    """
+
+    def __init__(self, name, changes, *args):
+        self.name = name
+        self.changes = changes
+        super(JournalDict, self).__init__(*args)
+
+    def __setitem__(self, key, value):
+        if dict.get(self, key, _MISSING) != value:
+            super(JournalDict, self).__setitem__(key, value)
+            self.changes.append((self.name, key, value))
+
+    def __delitem__(self, key):
+        super(JournalDict, self).__delitem__(key)
+        self.changes.append((self.name, key))
+
+
+class JournalHistDict(JournalDict, HistDict):
+    """HistDict that records its changes like a JournalDict."""
+
+
+class JournalLRUDict(JournalDict, LRUDict):
+    """LRUDict that records its changes like a JournalDict."""
 
 
 class FileCache(Cache):
+    """Cache that is saved to a file in the cache folder.
+
+    The file holds a full snapshot of the cache. Changes made since are
+    appended to a journal next to it, and replayed on load. Once the journal
+    is larger than the cache, a new snapshot is written and the journal is
+    emptied. Files are written in a background thread, so saving doesn't
+    stop the Manager from processing events.
+    """
+
+    # Names of the saved maps, stored as self._<name>
+    PERSISTED = (
+        "mon_hist",
+        "stop_hist",
+        "grunt_hist",
+        "egg_hist",
+        "raid_hist",
+        "gyms",
+        "cells",
+        "quests",
+    )
+    COMPACT_MIN = 100000  # Journal changes always allowed before compacting
+    # Maps saved before gyms, cells and quests were cached as records:
+    # name -> (name of the records, empty record, field of the records)
+    LEGACY = {
+        "gym_team": ("gyms", NO_GYM, "team"),
+        "gym_name": ("gyms", NO_GYM, "name"),
+        "gym_desc": ("gyms", NO_GYM, "desc"),
+        "gym_image": ("gyms", NO_GYM, "image"),
+        "cell_weather_id": ("cells", NO_CELL, "weather_id"),
+        "severity_id": ("cells", NO_CELL, "severity_id"),
+        "day_or_night_id": ("cells", NO_CELL, "day_or_night_id"),
+        "quest_reward": ("quests", NO_QUEST, "reward"),
+        "quest_task": ("quests", NO_QUEST, "task"),
+    }
+
     def __init__(self, mgr):
         """Initializes a new cache object for storing data between events."""
         super(FileCache, self).__init__(mgr)
         self._name = mgr.get_name()
         self._file = get_path(os.path.join("cache", f"{self._name}.cache"))
+        self._journal = f"{self._file}.journal"
+        self._changes = []  # Changes not written to the journal yet
+        self._journal_len = 0  # Changes in the journal
+        self._writer = None  # Background write in progress
 
         self._log.debug("Checking for previous cache at %s", self._file)
         cache_folder = get_path("cache")
@@ -25,54 +97,103 @@ class FileCache(Cache):
         if os.path.isfile(self._file):
             self._load()
         else:
-            self._save()
+            self._set_data({})
+            self._save(wait=True)
+
+    def _set_data(self, data):
+        for name in self.PERSISTED:
+            if name in self.HIST:
+                value = JournalHistDict(name, self._changes, data.get(name, {}))
+            else:
+                value = JournalLRUDict(
+                    name, self._changes, self._sizes[name], data.get(name, {})
+                )
+            setattr(self, f"_{name}", value)
+        del self._changes[:]
+
+    def _set_legacy(self, name, key, value):
+        """Sets a value saved in one of the LEGACY maps into its record."""
+        records, empty, field = self.LEGACY[name]
+        self._update(getattr(self, f"_{records}"), key, empty, **{field: value})
 
     def _load(self):
+        data = {}
         try:
             with portalocker.Lock(self._file, mode="rb") as f:
                 data = pickle.load(f)
-                self._mon_hist = data.get("mon_hist", {})
-                self._stop_hist = data.get("stop_hist", {})
-                self._grunt_hist = data.get("grunt_hist", {})
-                self._egg_hist = data.get("egg_hist", {})
-                self._raid_hist = data.get("raid_hist", {})
-                self._gym_team = data.get("gym_team", {})
-                self._gym_name = data.get("gym_name", {})
-                self._gym_desc = data.get("gym_desc", {})
-                self._gym_image = data.get("gym_image", {})
-                self._cell_weather_id = data.get("cell_weather_id", {})
-                self._severity_id = data.get("severity_id", {})
-                self._day_or_night_id = data.get("day_or_night_id", {})
-                self._quest_reward = data.get("quest_reward", {})
-                self._quest_task = data.get("quest_task", {})
-
-                self._log.debug("Cache loaded successfully.")
+            self._log.debug("Cache loaded successfully.")
         except Exception as e:
             self._log.error(
                 "There was an error attempting to load the cache. "
                 "The old cache will be overwritten."
             )
             self._log.error("%s: %s", type(e).__name__, e)
+        self._set_data(data)
+        for name in self.LEGACY.keys() & data.keys():  # Saved by older versions
+            for key, value in data[name].items():
+                self._set_legacy(name, key, value)
 
-    def _save(self):
+        # Replay the changes made since the snapshot
+        if not os.path.isfile(self._journal):
+            return
+        try:
+            with portalocker.Lock(self._journal, mode="rb") as f:
+                while True:
+                    try:
+                        changes = pickle.load(f)
+                    except EOFError:
+                        break
+                    for change in changes:
+                        if change[0] in self.LEGACY:
+                            if len(change) == 3:
+                                self._set_legacy(*change)
+                            continue
+                        values = getattr(self, f"_{change[0]}")
+                        if len(change) == 3:
+                            values[change[1]] = change[2]
+                        else:
+                            values.pop(change[1], None)
+                    self._journal_len += len(changes)
+            self._log.debug("Replayed %s cache changes.", self._journal_len)
+        except Exception as e:
+            # A save was interrupted, keep what could be read
+            self._log.error(
+                "Encountered error while reading cache journal: %s: %s",
+                type(e).__name__,
+                e,
+            )
+        del self._changes[:]  # Changes from replaying are already saved
+
+    def _save(self, wait=False):
         """Export the data to a more permanent location."""
+        if self._writer is not None and not self._writer.ready():
+            if not wait:
+                self._log.debug("Previous cache write still running.")
+                return
+            self._writer.wait()
+
+        size = sum(len(getattr(self, f"_{name}")) for name in self.PERSISTED)
+        journal_len = self._journal_len + len(self._changes)
+        if not os.path.isfile(self._file) or journal_len > max(self.COMPACT_MIN, size):
+            # Copies are cheap next to pickling, which is left to the thread
+            data = {name: dict(getattr(self, f"_{name}")) for name in self.PERSISTED}
+            del self._changes[:]
+            self._journal_len = 0
+            task = (self._write_snapshot, data)
+        elif len(self._changes) > 0:
+            changes = self._changes[:]
+            del self._changes[:]
+            self._journal_len += len(changes)
+            task = (self._write_journal, changes)
+        else:
+            return
+
         self._log.debug("Writing cache to file...")
-        data = {
-            "mon_hist": self._mon_hist,
-            "stop_hist": self._stop_hist,
-            "grunt_hist": self._grunt_hist,
-            "egg_hist": self._egg_hist,
-            "raid_hist": self._raid_hist,
-            "gym_team": self._gym_team,
-            "gym_name": self._gym_name,
-            "gym_desc": self._gym_desc,
-            "gym_image": self._gym_image,
-            "cell_weather_id": self._cell_weather_id,
-            "severity_id": self._severity_id,
-            "day_or_night_id": self._day_or_night_id,
-            "quest_reward": self._quest_reward,
-            "quest_task": self._quest_task,
-        }
+        self._writer = gevent.get_hub().threadpool.spawn(*task)
+        if wait:
+            self._writer.wait()
+
+    def _write_snapshot(self, data):
         try:
             # Write to temporary file and then rename
             temp = f"{self._file}.new"
@@ -82,9 +203,23 @@ class FileCache(Cache):
                 if os.path.exists(self._file):
                     os.remove(self._file)  # Required for Windows
                 os.rename(temp, self._file)
+                if os.path.exists(self._journal):
+                    os.remove(self._journal)
             self._log.debug("Cache saved successfully.")
         except Exception as e:
             self._log.error(
                 "Encountered error while saving cache: %s: %s", type(e).__name__, e
             )
             self._log.error("Stack trace: \n %s", traceback.format_exc())
+
+    def _write_journal(self, changes):
+        try:
+            with portalocker.Lock(f"{self._file}.lock", timeout=5, mode="wb+"):
+                with open(self._journal, "ab") as f:
+                    pickle.dump(changes, f, protocol=pickle.HIGHEST_PROTOCOL)
+            self._log.debug("Appended %s changes to cache journal.", len(changes))
+        except Exception as e:
+            self._log.error(
+                "Encountered error while saving cache: %s: %s", type(e).__name__, e
+            )
+            self._log.error("Stack trace: \n %s", traceback.format_exc())
@@ -0,0 +1,374 @@
+# Standard Library Imports
+import itertools
+import json
+import socket
+import time
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+# 3rd Party Imports
+import gevent
+from gevent.lock import Semaphore
+
+# Local Imports
+from PokeAlarm import config, Unknown
+from PokeAlarm.Utils import get_image_url
+from . import Cache
+
+_MISSING = object()
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(dt):
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros):
+    return _EPOCH + int(micros) * _MICROSECOND
+
+
+class RedisError(Exception):
+    """Error replied by the server."""
+
+
+class RedisProtocolError(RedisError):
+    """Reply not understood, after which the connection can't be used."""
+
+
+class RedisClient(object):
+    """Minimal client for servers speaking the Redis protocol (RESP).
+
+    Commands are sent as pipelines: every command of a call is written at
+    once and their replies are read back together.
+    """
+
+    def __init__(self, url, timeout=5):
+        # redis://[:password@]host[:port][/db]
+        parsed = urlparse(url)
+        self._address = (parsed.hostname or "localhost", parsed.port or 6379)
+        self._password = parsed.password
+        self._db = int(parsed.path.lstrip("/") or 0)
+        self._timeout = timeout
+        self._sock = None
+        self._file = None
+        self._lock = Semaphore()
+
+    def execute(self, *commands):
+        """Sends the commands and returns their replies, in order."""
+        with self._lock:
+            for attempt in range(2):  # Reconnect once if the connection dropped
+                try:
+                    if self._sock is None:
+                        self._connect()
+                    return self._pipeline(commands)
+                except (OSError, EOFError, RedisProtocolError):
+                    self.close()  # Replies left unread would answer later commands
+                    if attempt > 0:
+                        raise
+
+    def close(self):
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+        self._sock = self._file = None
+
+    def _connect(self):
+        self._sock = socket.create_connection(self._address, self._timeout)
+        self._file = self._sock.makefile("rb")
+        setup = []
+        if self._password:
+            setup.append(("AUTH", self._password))
+        if self._db != 0:
+            setup.append(("SELECT", self._db))
+        if len(setup) > 0:
+            self._pipeline(setup)
+
+    def _pipeline(self, commands):
+        buf = bytearray()
+        for command in commands:
+            buf += b"*%d\r\n" % len(command)
+            for arg in command:
+                if not isinstance(arg, bytes):
+                    arg = str(arg).encode()
+                buf += b"$%d\r\n%s\r\n" % (len(arg), arg)
+        self._sock.sendall(buf)
+        replies = [self._read() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def _read(self):
+        line = self._file.readline()
+        if not line.endswith(b"\r\n"):
+            raise EOFError("Connection closed by server.")
+        kind, value = line[:1], line[1:-2]
+        if kind == b"+":
+            return value.decode()
+        if kind == b"-":
+            return RedisError(value.decode())
+        if kind == b":":
+            return int(value)
+        if kind == b"$":
+            if int(value) < 0:
+                return None
+            return self._file.read(int(value) + 2)[:-2]
+        if kind == b"*":
+            if int(value) < 0:
+                return None
+            return [self._read() for _ in range(int(value))]
+        raise RedisProtocolError(f"Unexpected reply: {line!r}")
+
+
+class RedisCache(Cache):
+    """Cache stored on a server speaking the Redis protocol.
+
+    Several PokeAlarm instances using the same server share the cache of
+    their Managers of the same name, so an event is only sent once by all
+    of them. History entries are sent at once (only set if missing when
+    checking if an event was processed) and expire on the server. Other
+    writes are kept locally (where reads see them) and sent together once
+    per FLUSH_INTERVAL.
+    """
+
+    DEFAULT_URL = "redis://localhost:6379/0"
+    FLUSH_INTERVAL = 0.1  # Seconds between sending writes
+    RETRY_INTERVAL = 5  # Seconds to wait before reconnecting after an error
+    # Expired history is kept as long as Managers keep it between cleanings
+    HIST_MIN_TTL = timedelta(minutes=5)
+    RECORD_TTL = timedelta(days=7)  # Gyms, cells and quests not updated since
+    # Most writes kept while the server is down. Older writes are dropped first.
+    MAX_PENDING = 10000
+    # Names of the history keys of the kinds of processed objects
+    KINDS = {
+        "monster": "mon",
+        "stop": "stop",
+        "egg": "egg",
+        "raid": "raid",
+        "grunt": "grunt",
+    }
+
+    def __init__(self, mgr):
+        """Initializes a new cache object for storing data between events."""
+        super(RedisCache, self).__init__(mgr)
+        self._prefix = f"pokealarm:{mgr.get_name()}:"
+        self._client = RedisClient(config.get("REDIS_URL", self.DEFAULT_URL))
+        self._pending = {}  # (key, field) -> command not sent yet
+        self._timer = None
+        self._down_until = 0  # Time before which the server isn't retried
+
+    def _execute(self, *commands):
+        """Returns the replies of the commands, or None if the server failed."""
+        if time.monotonic() < self._down_until:
+            return None
+        try:
+            return self._client.execute(*commands)
+        except (OSError, EOFError, RedisError) as e:
+            self._down_until = time.monotonic() + self.RETRY_INTERVAL
+            self._log.error(
+                "Encountered error while using cache server: %s: %s",
+                type(e).__name__,
+                e,
+            )
+            return None
+
+    def _queue(self, key, field, command):
+        self._pending[(key, field)] = command
+        if self._timer is None:
+            self._timer = gevent.spawn_later(self.FLUSH_INTERVAL, self._flush)
+
+    def _flush(self):
+        """Sends all pending writes to the server."""
+        if self._timer is not None:
+            if self._timer is not gevent.getcurrent():
+                self._timer.kill(block=False)
+            self._timer = None
+        if len(self._pending) == 0:
+            return
+        # Writes made while these are sent wait for the next flush
+        pending, self._pending = self._pending, {}
+        commands = list(pending.values())
+        ttl = self.RECORD_TTL // timedelta(milliseconds=1)
+        for key in {key for key, field in pending if field is not None}:
+            commands.append(("PEXPIRE", key, ttl))
+        if self._execute(*commands) is None:
+            self._keep(pending)
+            return
+        self._log.debug("Sent %s cache values.", len(pending))
+
+    def _keep(self, pending):
+        """Keeps writes that failed to be sent again, before newer ones."""
+        for key in self._pending.keys() & pending.keys():
+            del pending[key]
+        pending.update(self._pending)
+        dropped = len(pending) - self.MAX_PENDING
+        if dropped > 0:
+            for key in list(itertools.islice(pending, dropped)):
+                del pending[key]
+            self._log.warning("Dropped %s cache values not sent to server.", dropped)
+        self._pending = pending
+
+    def _set_expiration(self, key, expiration, *options):
+        """Sends the expiration of a history key at once. Returns the replies,
+        or None if it failed and the write was kept to be sent again."""
+        ttl = max(expiration - datetime.utcnow(), self.HIST_MIN_TTL)
+        ttl = ttl // timedelta(milliseconds=1)
+        command = ("SET", key, _to_micros(expiration)) + options + ("PX", ttl)
+        self._pending.pop((key, None), None)  # Replaced by this write
+        replies = self._execute(command)
+        if replies is None:
+            self._queue(key, None, command)
+        return replies
+
+    def _expiration(self, kind, id_, expiration):
+        key = f"{self._prefix}{kind}:{id_}"
+        if expiration is not None:
+            self._set_expiration(key, expiration)
+            return expiration
+        command = self._pending.get((key, None))
+        if command is not None:
+            return _from_micros(command[2])
+        replies = self._execute(("GET", key))
+        if replies is None or replies[0] is None:
+            return None
+        return _from_micros(replies[0])
+
+    def processed(self, kind, key, expiration):
+        """Return if an object was processed before, else store its expiration.
+
+        The expiration is only set if missing on the server, so one of the
+        instances sharing it processes the object.
+        """
+        key = f"{self._prefix}{self.KINDS[kind]}:{key}"
+        if (key, None) in self._pending:  # Stored while the server was down
+            return True
+        replies = self._set_expiration(key, expiration, "NX")
+        return replies is not None and replies[0] is None  # None if already set
+
+    def _set_field(self, kind, id_, field, value):
+        key = f"{self._prefix}{kind}:{id_}"
+        self._queue(key, field, ("HSET", key, field, json.dumps(value)))
+        return value
+
+    def _get_fields(self, kind, id_, *fields):
+        key = f"{self._prefix}{kind}:{id_}"
+        values, missing = {}, []
+        for field in fields:
+            command = self._pending.get((key, field))
+            if command is not None:
+                values[field] = json.loads(command[3])
+            else:
+                missing.append(field)
+        if len(missing) > 0:
+            replies = self._execute(("HMGET", key) + tuple(missing))
+            replies = replies[0] if replies is not None else [None] * len(missing)
+            for field, value in zip(missing, replies):
+                values[field] = _MISSING if value is None else json.loads(value)
+        return [values[field] for field in fields]
+
+    def _get_field(self, kind, id_, field, default):
+        value = self._get_fields(kind, id_, field)[0]
+        return default if value is _MISSING else value
+
+    def monster_expiration(self, mon_id, expiration=None):
+        """Update and return the datetime that a monster expires."""
+        return self._expiration("mon", mon_id, expiration)
+
+    def stop_expiration(self, stop_id, expiration=None):
+        """Update and return the datetime that a stop expires."""
+        return self._expiration("stop", stop_id, expiration)
+
+    def egg_expiration(self, egg_id, expiration=None):
+        """Update and return the datetime that an egg expires."""
+        return self._expiration("egg", egg_id, expiration)
+
+    def raid_expiration(self, raid_id, expiration=None):
+        """Update and return the datetime that a raid expires."""
+        return self._expiration("raid", raid_id, expiration)
+
+    def quest_expiration(self, stop_id, last_modified=None):
+        """Update and return the datetime that the stop last had a quest."""
+        return self._expiration("quest_hist", stop_id, last_modified)
+
+    def grunt_expiration(self, stop_id, expiration=None):
+        """Update and return the datetime that a stop expires."""
+        return self._expiration("grunt", stop_id, expiration)
+
+    def gym_team(self, gym_id, team_id=Unknown.TINY):
+        """Update and return the team_id of a gym."""
+        if Unknown.is_not(team_id):
+            return self._set_field("gym", gym_id, "team", team_id)
+        return self._get_field("gym", gym_id, "team", Unknown.TINY)
+
+    def gym_slots(self, gym_id, available_slots=Unknown.TINY):
+        """Update and return the team_id of a gym."""
+        if Unknown.is_not(available_slots):
+            return self._set_field("gym", gym_id, "slots", available_slots)
+        return self._get_field("gym", gym_id, "slots", Unknown.TINY)
+
+    def gym_name(self, gym_id, gym_name=Unknown.REGULAR):
+        """Update and return the gym_name for a gym."""
+        if Unknown.is_not(gym_name):
+            return self._set_field("gym", gym_id, "name", gym_name)
+        return self._get_field("gym", gym_id, "name", Unknown.REGULAR)
+
+    def gym_desc(self, gym_id, gym_desc=Unknown.REGULAR):
+        """Update and return the gym_desc for a gym."""
+        if Unknown.is_not(gym_desc):
+            return self._set_field("gym", gym_id, "desc", gym_desc)
+        return self._get_field("gym", gym_id, "desc", Unknown.REGULAR)
+
+    def gym_image(self, gym_id, gym_image=Unknown.REGULAR):
+        """Update and return the gym_image for a gym."""
+        if Unknown.is_not(gym_image):
+            return self._set_field("gym", gym_id, "image", gym_image)
+        default = get_image_url("icons/gym_0.png")
+        return self._get_field("gym", gym_id, "image", default)
+
+    def cell_weather_id(self, s2_cell_id, cell_weather_id=Unknown.REGULAR):
+        """Update and return weather_id for a cell"""
+        if Unknown.is_not(cell_weather_id):
+            return self._set_field("cell", s2_cell_id, "weather_id", cell_weather_id)
+        return self._get_field("cell", s2_cell_id, "weather_id", Unknown.REGULAR)
+
+    def severity_id(self, s2_cell_id, severity_id=Unknown.REGULAR):
+        """Update and return severity_id for a cell"""
+        if Unknown.is_not(severity_id):
+            return self._set_field("cell", s2_cell_id, "severity_id", severity_id)
+        return self._get_field("cell", s2_cell_id, "severity_id", Unknown.REGULAR)
+
+    def day_or_night_id(self, s2_cell_id, day_or_night_id=Unknown.REGULAR):
+        """Update and return day_or_night_id for a cell"""
+        if Unknown.is_not(day_or_night_id):
+            return self._set_field(
+                "cell", s2_cell_id, "day_or_night_id", day_or_night_id
+            )
+        return self._get_field("cell", s2_cell_id, "day_or_night_id", Unknown.REGULAR)
+
+    def quest_reward(self, stop_id, reward=None, task=None, last_modified=None):
+        """Update and return the reward and task for a quest."""
+        if reward is not None and Unknown.is_not(reward):
+            self._set_field("quest", stop_id, "reward", reward)
+        if task is not None and Unknown.is_not(task):
+            self._set_field("quest", stop_id, "task", task)
+        if last_modified is not None and Unknown.is_not(last_modified):
+            micros = _to_micros(last_modified)
+            self._set_field("quest", stop_id, "last_modified", micros)
+        values = self._get_fields("quest", stop_id, "reward", "task", "last_modified")
+        values = [Unknown.REGULAR if v is _MISSING else v for v in values]
+        if Unknown.is_not(values[2]):
+            values[2] = _from_micros(values[2])
+        return tuple(values)
+
+    def stats(self):
+        """Returns the number of writes not sent to the server yet."""
+        return {"pending": len(self._pending)}
+
+    def _save(self, wait=False):
+        """Export the data to a more permanent location."""
+        self._flush()
+
+    def _clean_hist(self):
+        """Clean expired objects to free up memory."""
+        pass  # Expired on the server
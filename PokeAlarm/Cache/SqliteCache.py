@@ -0,0 +1,260 @@
+# Standard Library Imports
+import os
+import sqlite3
+import traceback
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# 3rd Party Imports
+import gevent
+
+# Local Imports
+from PokeAlarm import Unknown
+from PokeAlarm.Utils import get_image_url, get_path
+from . import Cache
+
+_MISSING = object()
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(dt):
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(micros):
+    return _EPOCH + micros * _MICROSECOND
+
+
+class SqliteCache(Cache):
+    """Cache stored in a SQLite database in the cache folder.
+
+    Nothing is loaded up front: values are read from the database when
+    needed. Writes are kept in memory (where reads see them) and committed
+    together once per COMMIT_INTERVAL.
+    """
+
+    COMMIT_INTERVAL = 1.0  # Seconds between commits
+
+    # Table -> columns, each table is keyed by a text id
+    TABLES = {
+        "mon_hist": ("expiration",),
+        "stop_hist": ("expiration",),
+        "egg_hist": ("expiration",),
+        "raid_hist": ("expiration",),
+        "quest_hist": ("expiration",),
+        "grunt_hist": ("expiration",),
+        "gym": ("team", "slots", "name", "desc", "image"),
+        "cell": ("weather_id", "severity_id", "day_or_night_id"),
+        "quest": ("reward", "task", "last_modified"),
+    }
+
+    def __init__(self, mgr):
+        """Initializes a new cache object for storing data between events."""
+        super(SqliteCache, self).__init__(mgr)
+        self._name = mgr.get_name()
+        cache_folder = get_path("cache")
+        if not os.path.exists(cache_folder):
+            os.makedirs(cache_folder)
+        self._file = os.path.join(cache_folder, f"{self._name}.sqlite")
+        self._log.debug("Opening cache database at %s", self._file)
+
+        self._db = sqlite3.connect(self._file, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        for table, columns in self.TABLES.items():
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                f"(id TEXT PRIMARY KEY, {', '.join(columns)}) WITHOUT ROWID"
+            )
+        for table in self.HIST:
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_expiration "
+                f"ON {table} (expiration)"
+            )
+
+        self._pending = {}  # (table, column, id) -> value not committed yet
+        self._timer = None
+        self._evicted = dict.fromkeys(self.HIST, 0)
+
+    def _get(self, table, column, key, default=None):
+        key = str(key)
+        value = self._pending.get((table, column, key), _MISSING)
+        if value is _MISSING:
+            row = self._db.execute(
+                f"SELECT {column} FROM {table} WHERE id = ?", (key,)
+            ).fetchone()
+            value = default if row is None or row[0] is None else row[0]
+        return value
+
+    def _set(self, table, column, key, value):
+        self._pending[(table, column, str(key))] = value
+        if self._timer is None:
+            self._timer = gevent.spawn_later(self.COMMIT_INTERVAL, self._commit)
+
+    def _expiration(self, table, key, expiration):
+        if expiration is not None:
+            self._set(table, "expiration", key, _to_micros(expiration))
+        micros = self._get(table, "expiration", key)
+        return None if micros is None else _from_micros(micros)
+
+    def _commit(self):
+        """Writes all pending values to the database."""
+        if self._timer is not None:
+            if self._timer is not gevent.getcurrent():
+                self._timer.kill(block=False)
+            self._timer = None
+        if len(self._pending) == 0:
+            return
+        rows = defaultdict(list)
+        for (table, column, key), value in self._pending.items():
+            rows[(table, column)].append((key, value))
+        try:
+            self._db.execute("BEGIN")
+            for (table, column), values in rows.items():
+                self._db.executemany(
+                    f"INSERT INTO {table} (id, {column}) VALUES (?, ?) "
+                    f"ON CONFLICT (id) DO UPDATE SET {column} = excluded.{column}",
+                    values,
+                )
+            self._db.execute("COMMIT")
+            self._log.debug("Committed %s cache values.", len(self._pending))
+            self._pending.clear()
+        except sqlite3.Error as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            self._log.error(
+                "Encountered error while saving cache: %s: %s", type(e).__name__, e
+            )
+            self._log.error("Stack trace: \n %s", traceback.format_exc())
+
+    def monster_expiration(self, mon_id, expiration=None):
+        """Update and return the datetime that a monster expires."""
+        return self._expiration("mon_hist", mon_id, expiration)
+
+    def stop_expiration(self, stop_id, expiration=None):
+        """Update and return the datetime that a stop expires."""
+        return self._expiration("stop_hist", stop_id, expiration)
+
+    def egg_expiration(self, egg_id, expiration=None):
+        """Update and return the datetime that an egg expires."""
+        return self._expiration("egg_hist", egg_id, expiration)
+
+    def raid_expiration(self, raid_id, expiration=None):
+        """Update and return the datetime that a raid expires."""
+        return self._expiration("raid_hist", raid_id, expiration)
+
+    def quest_expiration(self, stop_id, last_modified=None):
+        """Update and return the datetime that the stop last had a quest."""
+        return self._expiration("quest_hist", stop_id, last_modified)
+
+    def grunt_expiration(self, stop_id, expiration=None):
+        """Update and return the datetime that a stop expires."""
+        return self._expiration("grunt_hist", stop_id, expiration)
+
+    def gym_team(self, gym_id, team_id=Unknown.TINY):
+        """Update and return the team_id of a gym."""
+        if Unknown.is_not(team_id):
+            self._set("gym", "team", gym_id, team_id)
+        return self._get("gym", "team", gym_id, Unknown.TINY)
+
+    def gym_slots(self, gym_id, available_slots=Unknown.TINY):
+        """Update and return the team_id of a gym."""
+        if Unknown.is_not(available_slots):
+            self._set("gym", "slots", gym_id, available_slots)
+        return self._get("gym", "slots", gym_id, Unknown.TINY)
+
+    def gym_name(self, gym_id, gym_name=Unknown.REGULAR):
+        """Update and return the gym_name for a gym."""
+        if Unknown.is_not(gym_name):
+            self._set("gym", "name", gym_id, gym_name)
+        return self._get("gym", "name", gym_id, Unknown.REGULAR)
+
+    def gym_desc(self, gym_id, gym_desc=Unknown.REGULAR):
+        """Update and return the gym_desc for a gym."""
+        if Unknown.is_not(gym_desc):
+            self._set("gym", "desc", gym_id, gym_desc)
+        return self._get("gym", "desc", gym_id, Unknown.REGULAR)
+
+    def gym_image(self, gym_id, gym_image=Unknown.REGULAR):
+        """Update and return the gym_image for a gym."""
+        if Unknown.is_not(gym_image):
+            self._set("gym", "image", gym_id, gym_image)
+        return self._get("gym", "image", gym_id, get_image_url("icons/gym_0.png"))
+
+    def cell_weather_id(self, s2_cell_id, cell_weather_id=Unknown.REGULAR):
+        """Update and return weather_id for a cell"""
+        if Unknown.is_not(cell_weather_id):
+            self._set("cell", "weather_id", s2_cell_id, cell_weather_id)
+        return self._get("cell", "weather_id", s2_cell_id, Unknown.REGULAR)
+
+    def severity_id(self, s2_cell_id, severity_id=Unknown.REGULAR):
+        """Update and return severity_id for a cell"""
+        if Unknown.is_not(severity_id):
+            self._set("cell", "severity_id", s2_cell_id, severity_id)
+        return self._get("cell", "severity_id", s2_cell_id, Unknown.REGULAR)
+
+    def day_or_night_id(self, s2_cell_id, day_or_night_id=Unknown.REGULAR):
+        """Update and return day_or_night_id for a cell"""
+        if Unknown.is_not(day_or_night_id):
+            self._set("cell", "day_or_night_id", s2_cell_id, day_or_night_id)
+        return self._get("cell", "day_or_night_id", s2_cell_id, Unknown.REGULAR)
+
+    def quest_reward(self, stop_id, reward=None, task=None, last_modified=None):
+        """Update and return the reward and task for a quest."""
+        if reward is not None and Unknown.is_not(reward):
+            self._set("quest", "reward", stop_id, reward)
+        if task is not None and Unknown.is_not(task):
+            self._set("quest", "task", stop_id, task)
+        if last_modified is not None and Unknown.is_not(last_modified):
+            micros = _to_micros(last_modified)
+            self._set("quest", "last_modified", stop_id, micros)
+        last_modified = self._get("quest", "last_modified", stop_id, Unknown.REGULAR)
+        if Unknown.is_not(last_modified):
+            last_modified = _from_micros(last_modified)
+        return (
+            self._get("quest", "reward", stop_id, Unknown.REGULAR),
+            self._get("quest", "task", stop_id, Unknown.REGULAR),
+            last_modified,
+        )
+
+    def stats(self):
+        """Returns the size and evicted count of each map of expirations."""
+        self._commit()
+        return {
+            table: {
+                "size": self._db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0],
+                "evicted": self._evicted[table],
+            }
+            for table in self.HIST
+        }
+
+    def _save(self, wait=False):
+        """Export the data to a more permanent location."""
+        self._commit()
+
+    def _clean_hist(self):
+        """Clean expired objects to free up memory."""
+        self._commit()
+        now = _to_micros(datetime.utcnow())
+        removed = {}
+        try:
+            self._db.execute("BEGIN")
+            for table in self.HIST:
+                cursor = self._db.execute(
+                    f"DELETE FROM {table} WHERE expiration < ?", (now,)
+                )
+                removed[table] = cursor.rowcount
+            self._db.execute("COMMIT")
+        except sqlite3.Error as e:
+            if self._db.in_transaction:
+                self._db.execute("ROLLBACK")
+            self._log.error(
+                "Encountered error while cleaning cache: %s: %s", type(e).__name__, e
+            )
+            return
+        for table, count in removed.items():
+            self._evicted[table] += count
+        self._log.debug(
+            "Cleared %s items from cache: %s", sum(removed.values()), removed
+        )
@@ -1,7 +1,15 @@
+# Standard Library Imports
+import logging
+
+# Local Imports
+from PokeAlarm import config
+from PokeAlarm.Utilities.Logging import ContextFilter
 from .Cache import Cache
 from .FileCache import FileCache
+from .SqliteCache import SqliteCache
+from .RedisCache import RedisCache
 
-cache_options = ["mem", "file"]
+cache_options = ["mem", "file", "sqlite", "redis"]
 
 
 def cache_factory(mgr, kind):
@@ -9,5 +17,41 @@ def cache_factory(mgr, kind):
         return Cache(mgr)
     elif kind == cache_options[1]:
         return FileCache(mgr)
+    elif kind == cache_options[2]:
+        return SqliteCache(mgr)
+    elif kind == cache_options[3]:
+        return RedisCache(mgr)
     else:
         raise ValueError(f"{kind} is not a valid cache type!")
+
+
+class SharedOwner(object):
+    """Stands in for the Manager of a cache shared by several Managers."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def get_name(self):
+        return self.name
+
+    def get_child_logger(self, name):
+        logger = logging.getLogger(f"pokealarm.{self.name}").getChild(name)
+        logger.addFilter(ContextFilter())
+        return logger
+
+
+_shared = {}
+
+
+def shared_cache(kind):
+    """Returns the cache of the given type shared by the Managers of this process.
+
+    It is only meant for details that are the same for every Manager, such
+    as the names of gyms, and is saved as the 'shared' cache.
+    """
+    if kind not in _shared:
+        name = "shared"
+        if config.get("WORKER_GROUP") is not None:  # Processes can't share a file
+            name = f"shared_{config['WORKER_GROUP']}"
+        _shared[kind] = cache_factory(SharedOwner(name), kind)
+    return _shared[kind]
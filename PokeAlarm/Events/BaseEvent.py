@@ -1,14 +1,55 @@
 # Standard Library Imports
+from collections.abc import MutableMapping
+from functools import partial
 import logging
+from operator import attrgetter
 import time
+from types import FunctionType, MethodType
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utils import DTS_PATTERN
 
 
 class BaseEvent(object):
     """Abstract class representing details related to different events."""
 
+    # Attributes of events are listed in the __slots__ of their class, which
+    # saves memory and time over storing them in a __dict__ for each event
+    __slots__ = (
+        "_log",
+        "_mgr",
+        "id",
+        "_dts_memo",
+        # Set by all kinds of events
+        "lat",
+        "lng",
+        "distance",
+        "direction",
+        "name",
+        "geofence",
+        "custom_dts",
+    )
+
+    # Attributes set by each Manager, which the DTS of the event depend on
+    manager_attrs = ("distance", "direction")
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Attributes Managers can set on their view of this kind of event
+        slots = ("name", "custom_dts", "geofence") + cls.manager_attrs
+        attrs = {"__slots__": slots}
+        for klass in reversed(cls.__mro__[:-1]):
+            for name, value in vars(klass).items():
+                if name in slots or name.startswith("__"):
+                    continue
+                if name in klass.__dict__.get("__slots__", ()):
+                    # Read from the event without going through __getattr__
+                    attrs[name] = property(attrgetter(f"_event.{name}"))
+                elif isinstance(value, FunctionType):
+                    attrs[name] = value  # Bound to the view
+        cls._view_class = type(f"{cls.__name__}View", (EventView,), attrs)
+
     def __init__(self, kind):
         """Initializes base parameters for an event."""
         self._log = logging.getLogger(kind)
@@ -19,15 +60,154 @@ class BaseEvent(object):
         # Create an id for this event to be recognized as
         self.id = time.time()
 
+        # DTS already generated, by locale, timezone, units and manager_attrs
+        self._dts_memo = {}
+
+    def view(self):
+        """Return a new view of this event for a Manager."""
+        return self._view_class(self)
+
     def update_with_cache(self, cache):
         """Update event infos using cached data from previous events."""
         raise NotImplementedError("This is an abstract method.")
 
     def generate_dts(self, locale, timezone, units):
         """Return a dict with all the DTS for this event."""
+        key = (locale.name, timezone, units)
+        key += tuple(getattr(self, attr) for attr in self.manager_attrs)
+        shared = self._dts_memo.get(key)
+        if shared is None:
+            shared = self._generate_dts(locale, timezone, units)
+            self._dts_memo[key] = shared
+        # Rule specific DTS, over the ones shared by every rule and Manager
+        dts = LazyDts(self.custom_dts, base=shared)
+        dts["geofence"] = self.geofence
+        return dts
+
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
         raise NotImplementedError("This is an abstract method.")
 
     @classmethod
     def check_for_none(cls, cast, val, default):
         """Returns val as type cast or default if val is None"""
         return cast(val) if val is not None else default
+
+
+class EventView(object):
+    """View of an event for one Manager.
+
+    Events are parsed once and shared by all Managers, which don't change
+    them. Instead, the attributes a Manager derives for itself (name,
+    distance, values from its cache, the rule that passed...) are set on
+    its view, which reads all the others from the event.
+    """
+
+    __slots__ = ("_event",)
+
+    def __init__(self, event):
+        self._event = event
+
+    def __getattr__(self, name):
+        # Only called for attributes of the view not set, and class
+        # attributes of the event
+        value = getattr(self._event, name)
+        if isinstance(value, MethodType) and value.__self__ is self._event:
+            # Methods of the event use the attributes of the view
+            return MethodType(value.__func__, self)
+        return value
+
+
+class LazyDts(MutableMapping):
+    """DTS of an event, where costly values are computed on first access.
+
+    Custom DTS can use the other DTS of the event, which are substituted
+    when the custom DTS is read. DTS missing are read from base, if given,
+    which is never changed: like a ChainMap, writes and deletions only
+    apply to this one.
+    """
+
+    def __init__(self, custom_dts=None, base=None):
+        self._values = {}
+        self._lazy = {}  # key -> (keys, func) computing it
+        self._custom = set()  # Custom DTS not overridden by the event
+        self._base = base
+        for key, value in (custom_dts or {}).items():
+            if base is not None and key in base:
+                continue
+            self.lazy(key, partial(self._expand, value))
+            self._custom.add(key)
+
+    def lazy(self, keys, func):
+        """Adds DTS computed by func when one of them is first read.
+
+        keys is a single key with func returning its value, or a tuple of
+        keys with func returning a sequence of their values.
+        """
+        entry = (keys, func)
+        for key in (keys,) if isinstance(keys, str) else keys:
+            self._values.pop(key, None)
+            self._custom.discard(key)
+            self._lazy[key] = entry
+
+    def compute(self, keys):
+        """Computes the values of the given keys now, if not done yet."""
+        for key in keys:
+            if key in self._lazy:
+                self[key]
+            elif key not in self._values and self._base is not None:
+                self._base.compute((key,))
+
+    def _expand(self, value):
+        def replace(match):
+            key = match.group(1)
+            if key in self._custom or key not in self:
+                return match.group(0)
+            return str(self[key])
+
+        return DTS_PATTERN.sub(replace, value)
+
+    def __getitem__(self, key):
+        if key in self._values:
+            return self._values[key]
+        if key not in self._lazy and self._base is not None:
+            return self._base[key]
+        keys, func = entry = self._lazy[key]
+        if isinstance(keys, str):
+            keys, values = (keys,), (func(),)
+        else:
+            values = func()
+        for k, value in zip(keys, values):
+            if self._lazy.get(k) is entry:
+                del self._lazy[k]
+                self._values[k] = value
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self._lazy.pop(key, None)
+        self._custom.discard(key)
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        if key in self._lazy:
+            del self._lazy[key]
+        else:
+            del self._values[key]
+        self._custom.discard(key)
+
+    def __contains__(self, key):
+        if key in self._values or key in self._lazy:
+            return True
+        return self._base is not None and key in self._base
+
+    def __iter__(self):
+        # Copied, as reading values while iterating computes them
+        keys = list(self._values) + list(self._lazy)
+        if self._base is not None:
+            keys += [
+                k for k in self._base if k not in self._values and k not in self._lazy
+            ]
+        return iter(keys)
+
+    def __len__(self):
+        return sum(1 for _ in self)
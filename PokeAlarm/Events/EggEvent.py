@@ -14,13 +14,41 @@ from PokeAlarm.Utils import (
     get_team_emoji,
     get_ex_eligible_emoji,
 )
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm import Unknown
 
 
 class EggEvent(BaseEvent):
     """Event representing the change occurred in a Gym."""
 
+    __slots__ = (
+        "gym_id",
+        "hatch_time",
+        "time_left",
+        "raid_end",
+        "weather_id",
+        "egg_lvl",
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "slots_available",
+        "guard_count",
+        "sponsor_id",
+        "park",
+        "ex_eligible",
+        "is_exclusive",
+        "current_team_id",
+    )
+
+    manager_attrs = BaseEvent.manager_attrs + (
+        "slots_available",
+        "guard_count",
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "current_team_id",
+    )
+
     def __init__(self, data):
         """Creates a new Stop Event based on the given dict."""
         super(EggEvent, self).__init__("egg")
@@ -86,37 +114,17 @@ class EggEvent(BaseEvent):
             else Unknown.TINY
         )
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        hatch_time = get_time_as_str(self.hatch_time, timezone)
-        raid_end_time = get_time_as_str(self.raid_end, timezone)
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
         weather_name = locale.get_weather_name(self.weather_id)
-        dts = self.custom_dts.copy()
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
                 "gym_id": self.gym_id,
                 # Hatch Time Remaining
-                "hatch_time_left": hatch_time[0],
-                "12h_hatch_time": hatch_time[1],
-                "24h_hatch_time": hatch_time[2],
-                "hatch_time_no_secs": hatch_time[3],
-                "12h_hatch_time_no_secs": hatch_time[4],
-                "24h_hatch_time_no_secs": hatch_time[5],
-                "hatch_time_raw_hours": hatch_time[6],
-                "hatch_time_raw_minutes": hatch_time[7],
-                "hatch_time_raw_seconds": hatch_time[8],
                 "hatch_time_utc": self.hatch_time.strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
                 # Raid Time Remaining
-                "raid_time_left": raid_end_time[0],
-                "12h_raid_end": raid_end_time[1],
-                "24h_raid_end": raid_end_time[2],
-                "raid_time_no_secs": raid_end_time[3],
-                "12h_raid_end_no_secs": raid_end_time[4],
-                "24h_raid_end_no_secs": raid_end_time[5],
-                "raid_time_raw_hours": raid_end_time[6],
-                "raid_time_raw_minutes": raid_end_time[7],
-                "raid_time_raw_seconds": raid_end_time[8],
                 "raid_end_utc": self.raid_end,
                 "current_timestamp_utc": datetime.utcnow(),
                 # Location
@@ -136,7 +144,6 @@ class EggEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 "weather_id": self.weather_id,
                 "weather": weather_name,
                 "weather_or_empty": Unknown.or_empty(weather_name),
@@ -168,4 +175,34 @@ class EggEvent(BaseEvent):
                 "team_leader": locale.get_leader_name(self.current_team_id),
             }
         )
+
+        # Costly DTS, computed only if used
+        dts.lazy(
+            (
+                "hatch_time_left",
+                "12h_hatch_time",
+                "24h_hatch_time",
+                "hatch_time_no_secs",
+                "12h_hatch_time_no_secs",
+                "24h_hatch_time_no_secs",
+                "hatch_time_raw_hours",
+                "hatch_time_raw_minutes",
+                "hatch_time_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.hatch_time, timezone),
+        )
+        dts.lazy(
+            (
+                "raid_time_left",
+                "12h_raid_end",
+                "24h_raid_end",
+                "raid_time_no_secs",
+                "12h_raid_end_no_secs",
+                "24h_raid_end_no_secs",
+                "raid_time_raw_hours",
+                "raid_time_raw_minutes",
+                "raid_time_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.raid_end, timezone),
+        )
         return dts
@@ -4,7 +4,7 @@ from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm.Utils import (
     get_gmaps_link,
     get_applemaps_link,
@@ -30,6 +30,27 @@ from PokeAlarm.Utilities.GruntUtils import (
 class GruntEvent(BaseEvent):
     """Event representing the invasion of a PokeStop."""
 
+    __slots__ = (
+        "stop_id",
+        "stop_name",
+        "stop_image",
+        "expiration",
+        "time_left",
+        "grunt_type_id",
+        "grunt_name",
+        "gender_id",
+        "gender",
+        "mon_type_id",
+        "reward_mon_ids",
+        "mon_battle1_ids",
+        "mon_battle2_ids",
+        "mon_battle3_ids",
+        "weather_id",
+        "boosted_weather_id",
+    )
+
+    manager_attrs = BaseEvent.manager_attrs + ("weather_id", "boosted_weather_id")
+
     def __init__(self, data):
         """Creates a new Stop Event based on the given dict."""
         super(GruntEvent, self).__init__("grunt")
@@ -108,10 +129,9 @@ class GruntEvent(BaseEvent):
             ):
                 self.boosted_weather_id = self.weather_id
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        time = get_time_as_str(self.expiration, timezone)
-        dts = self.custom_dts.copy()
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
+        dts = LazyDts()
         weather_name = locale.get_weather_name(self.weather_id)
         boosted_weather_name = locale.get_weather_name(self.boosted_weather_id)
         dts.update(
@@ -147,15 +167,6 @@ class GruntEvent(BaseEvent):
                     map(str, [locale.get_pokemon_name(x) for x in self.mon_battle3_ids])
                 ),
                 # Time left
-                "time_left": time[0],
-                "12h_time": time[1],
-                "24h_time": time[2],
-                "time_left_no_secs": time[3],
-                "12h_time_no_secs": time[4],
-                "24h_time_no_secs": time[5],
-                "time_left_raw_hours": time[6],
-                "time_left_raw_minutes": time[7],
-                "time_left_raw_seconds": time[8],
                 "expiration_utc": self.expiration,
                 "current_timestamp_utc": datetime.utcnow(),
                 # Location
@@ -175,7 +186,6 @@ class GruntEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Weather
                 "weather_id": self.weather_id,
                 "weather": weather_name,
@@ -195,4 +205,20 @@ class GruntEvent(BaseEvent):
                 else "",
             }
         )
+
+        # Costly DTS, computed only if used
+        dts.lazy(
+            (
+                "time_left",
+                "12h_time",
+                "24h_time",
+                "time_left_no_secs",
+                "12h_time_no_secs",
+                "24h_time_no_secs",
+                "time_left_raw_hours",
+                "time_left_raw_minutes",
+                "time_left_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.expiration, timezone),
+        )
         return dts
@@ -11,13 +11,33 @@ from PokeAlarm.Utils import (
     get_team_emoji,
     get_ex_eligible_emoji,
 )
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm import Unknown
 
 
 class GymEvent(BaseEvent):
     """Event representing the change occurred in a Gym."""
 
+    __slots__ = (
+        "gym_id",
+        "old_team_id",
+        "new_team_id",
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "ex_eligible",
+        "slots_available",
+        "guard_count",
+        "sponsor_id",
+    )
+
+    manager_attrs = BaseEvent.manager_attrs + (
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "old_team_id",
+    )
+
     def __init__(self, data):
         """Creates a new Gym Event based on the given dict."""
         super(GymEvent, self).__init__("gym")
@@ -68,9 +88,9 @@ class GymEvent(BaseEvent):
         # Nothing to update
         pass
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        dts = self.custom_dts.copy()
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
@@ -92,7 +112,6 @@ class GymEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Team Info
                 "old_team": locale.get_team_name(self.old_team_id),
                 "old_team_id": self.old_team_id,
@@ -36,13 +36,78 @@ from PokeAlarm.Utils import (
     get_evolution_costs,
     calculate_evolution_cost,
 )
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm.Utilities import MonUtils
 
 
 class MonEvent(BaseEvent):
     """Event representing the discovery of a Pokemon."""
 
+    __slots__ = (
+        "enc_id",
+        "monster_id",
+        "form_id",
+        "disappear_time",
+        "time_left",
+        "spawn_start",
+        "spawn_end",
+        "spawn_verified",
+        "spawnpoint_id",
+        "weather_id",
+        "boosted_weather_id",
+        "mon_lvl",
+        "cp",
+        "atk_iv",
+        "def_iv",
+        "sta_iv",
+        "iv",
+        "great_product",
+        "great_id",
+        "great_cp",
+        "great_level",
+        "great_candy",
+        "great_stardust",
+        "ultra_product",
+        "ultra_id",
+        "ultra_cp",
+        "ultra_level",
+        "ultra_candy",
+        "ultra_stardust",
+        "great_rank",
+        "ultra_rank",
+        "quick_id",
+        "quick_type",
+        "quick_damage",
+        "quick_dps",
+        "quick_duration",
+        "quick_energy",
+        "charge_id",
+        "charge_type",
+        "charge_damage",
+        "charge_dps",
+        "charge_duration",
+        "charge_energy",
+        "base_catch",
+        "great_catch",
+        "ultra_catch",
+        "atk_grade",
+        "def_grade",
+        "gender",
+        "height",
+        "weight",
+        "size_id",
+        "types",
+        "can_be_shiny",
+        "costume_id",
+        "rarity_id",
+        "display_monster_id",
+        "display_form_id",
+        "display_costume_id",
+        "display_gender",
+    )
+
+    manager_attrs = BaseEvent.manager_attrs + ("weather_id", "boosted_weather_id")
+
     def __init__(self, data):
         """Creates a new Monster Event based on the given dict."""
         super(MonEvent, self).__init__("monster")
@@ -104,6 +169,8 @@ class MonEvent(BaseEvent):
                 self.ultra_level,
                 self.ultra_candy,
                 self.ultra_stardust,
+                self.great_rank,
+                self.ultra_rank,
             ) = PvpUtils.get_pvp_info(
                 self.monster_id,
                 self.form_id,
@@ -126,6 +193,8 @@ class MonEvent(BaseEvent):
             self.ultra_candy = (Unknown.SMALL, 0)
             self.great_stardust = Unknown.SMALL
             self.ultra_stardust = Unknown.SMALL
+            self.great_rank = Unknown.SMALL
+            self.ultra_rank = Unknown.SMALL
 
         # Quick Move
         self.quick_id = check_for_none(int, data.get("move_1"), Unknown.TINY)
@@ -204,10 +273,8 @@ class MonEvent(BaseEvent):
             if is_weather_boosted(self.weather_id, self.monster_id, self.form_id):
                 self.boosted_weather_id = self.weather_id
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        time = get_time_as_str(self.disappear_time, timezone)
-
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
         form_name = locale.get_form_name(self.monster_id, self.form_id)
         costume_name = locale.get_costume_name(self.monster_id, self.costume_id)
 
@@ -217,21 +284,12 @@ class MonEvent(BaseEvent):
         type1 = locale.get_type_name(self.types[0])
         type2 = locale.get_type_name(self.types[1])
 
-        evolutions = get_evolutions(self.monster_id, self.form_id)
-        evolution_costs = get_evolution_costs(self.monster_id, self.form_id)
-
-        last_evo_id = evolutions[-1][0] if evolutions else self.monster_id
-        last_evo_form_id = evolutions[-1][1] if evolutions else self.form_id
-
-        evo_candy_cost = calculate_evolution_cost(
-            self.monster_id, last_evo_id, evolutions, evolution_costs
-        )
-
         # Remove ".0" from full PvP levels
-        if Unknown.is_not(self.great_level) and int(self.great_level) == self.great_level:
-            self.great_level = int(self.great_level)
-        if Unknown.is_not(self.ultra_level) and int(self.ultra_level) == self.ultra_level:
-            self.ultra_level = int(self.ultra_level)
+        great_level, ultra_level = self.great_level, self.ultra_level
+        if Unknown.is_not(great_level) and int(great_level) == great_level:
+            great_level = int(great_level)
+        if Unknown.is_not(ultra_level) and int(ultra_level) == ultra_level:
+            ultra_level = int(ultra_level)
 
         # Stringify PvP candy costs
         if self.great_candy[1] > 0:
@@ -243,53 +301,7 @@ class MonEvent(BaseEvent):
         else:
             ultra_candy = str(self.ultra_candy[0])
 
-        # PvP misc
-        pvpoke_domain = locale.get_pvpoke_domain()
-        great_monster_name_formatted = (
-            re.sub(
-                r"[^A-Za-z0-9\s]+",
-                "",
-                locale.get_english_pokemon_name(self.great_id),
-            )
-            .lower()
-            .replace(" ", "_")
-        )
-        great_pvpoke_monster_formatted = great_monster_name_formatted
-        if not any(
-            x in locale.get_english_form_name(self.great_id, self.form_id)
-            for x in ["unknown", "Normal"]
-        ):
-            great_pvpoke_monster_formatted += "_" + re.sub(
-                r"[^A-Za-z0-9\s]+",
-                "",
-                locale.get_english_form_name(self.great_id, self.form_id)
-                .lower()
-                .replace(" ", "_"),
-            )
-
-        ultra_monster_name_formatted = (
-            re.sub(
-                r"[^A-Za-z0-9\s]+",
-                "",
-                locale.get_english_pokemon_name(self.ultra_id),
-            )
-            .lower()
-            .replace(" ", "_")
-        )
-        ultra_pvpoke_monster_formatted = ultra_monster_name_formatted
-        if not any(
-            x in locale.get_english_form_name(self.ultra_id, self.form_id)
-            for x in ["unknown", "Normal"]
-        ):
-            ultra_pvpoke_monster_formatted += "_" + re.sub(
-                r"[^A-Za-z0-9\s]+",
-                "",
-                locale.get_english_form_name(self.ultra_id, self.form_id)
-                .lower()
-                .replace(" ", "_"),
-            )
-
-        dts = self.custom_dts.copy()
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
@@ -298,15 +310,6 @@ class MonEvent(BaseEvent):
                 "mon_id": self.monster_id,
                 "mon_id_3": f"{self.monster_id:03}",
                 # Time Remaining
-                "time_left": time[0],
-                "12h_time": time[1],
-                "24h_time": time[2],
-                "time_left_no_secs": time[3],
-                "12h_time_no_secs": time[4],
-                "24h_time_no_secs": time[5],
-                "time_left_raw_hours": time[6],
-                "time_left_raw_minutes": time[7],
-                "time_left_raw_seconds": time[8],
                 "disappear_time_utc": self.disappear_time,
                 "current_timestamp_utc": datetime.utcnow(),
                 # Spawn Data
@@ -344,7 +347,6 @@ class MonEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Weather
                 "weather_id": self.weather_id,
                 "weather": weather_name,
@@ -365,30 +367,6 @@ class MonEvent(BaseEvent):
                 # Encounter Stats
                 "mon_lvl": self.mon_lvl,
                 "cp": self.cp,
-                # Max out
-                "max_cp": calculate_cp(
-                    self.monster_id,
-                    self.form_id,
-                    self.atk_iv,
-                    self.def_iv,
-                    self.sta_iv,
-                    50,
-                ),
-                "max_perfect_cp": max_cp(self.monster_id, self.form_id),
-                "stardust_cost": calculate_stardust_cost(self.mon_lvl, 50),
-                "candy_cost": calculate_candy_cost(self.mon_lvl, 50),
-                "max_evo_cp": calculate_cp(
-                    last_evo_id,
-                    last_evo_form_id,
-                    self.atk_iv,
-                    self.def_iv,
-                    self.sta_iv,
-                    50,
-                ),
-                "max_perfect_evo_cp": max_cp(last_evo_id, last_evo_form_id),
-                "candy_cost_with_evo": calculate_candy_cost(
-                    self.mon_lvl, 50, evo_candy_cost
-                ),
                 # IVs
                 "iv_0": (f"{self.iv:.0f}" if Unknown.is_not(self.iv) else Unknown.TINY),
                 "iv": (f"{self.iv:.1f}" if Unknown.is_not(self.iv) else Unknown.SMALL),
@@ -401,42 +379,18 @@ class MonEvent(BaseEvent):
                 # PVP Information
                 "great_mon_id": self.great_id,
                 "great_product": self.great_product,
+                "great_rank": self.great_rank,
                 "great_mon_name": locale.get_pokemon_name(self.great_id),
                 "great_cp": self.great_cp,
-                "great_level": str(self.great_level),
-                "great_url": "https://www.stadiumgaming.gg/rank-checker?"
-                + urlencode(
-                    {
-                        "pokemon": great_monster_name_formatted,
-                        "league": "1500",
-                        "att_iv": f'"{self.atk_iv}"',
-                        "def_iv": f'"{self.def_iv}"',
-                        "hp_iv": f'"{self.sta_iv}"',
-                        "min-iv": "0",
-                        "levelCap": "50",
-                    }
-                ),
-                "great_pvpoke": f"https://{pvpoke_domain}/rankings/all/1500/overall/{great_pvpoke_monster_formatted}/",
+                "great_level": str(great_level),
                 "great_candy": great_candy,
                 "great_stardust": f"{self.great_stardust:,}".replace(",", " "),
                 "ultra_mon_id": self.ultra_id,
                 "ultra_product": self.ultra_product,
+                "ultra_rank": self.ultra_rank,
                 "ultra_mon_name": locale.get_pokemon_name(self.ultra_id),
                 "ultra_cp": self.ultra_cp,
-                "ultra_level": str(self.ultra_level),
-                "ultra_url": "https://www.stadiumgaming.gg/rank-checker?"
-                + urlencode(
-                    {
-                        "pokemon": ultra_monster_name_formatted,
-                        "league": "2500",
-                        "att_iv": f'"{self.atk_iv}"',
-                        "def_iv": f'"{self.def_iv}"',
-                        "hp_iv": f'"{self.sta_iv}"',
-                        "min-iv": "0",
-                        "levelCap": "50",
-                    }
-                ),
-                "ultra_pvpoke": f"https://{pvpoke_domain}/rankings/all/2500/overall/{ultra_pvpoke_monster_formatted}/",
+                "ultra_level": str(ultra_level),
                 "ultra_candy": ultra_candy,
                 "ultra_stardust": f"{self.ultra_stardust:,}".replace(",", " "),
                 # Type
@@ -547,52 +501,6 @@ class MonEvent(BaseEvent):
                 "def_grade": (Unknown.or_empty(self.def_grade, Unknown.TINY)),
                 "rarity_id": self.rarity_id,
                 "rarity": locale.get_rarity_name(self.rarity_id),
-                # Catch Prob
-                "base_catch_0": (
-                    f"{self.base_catch * 100:.0f}"
-                    if Unknown.is_not(self.base_catch)
-                    else Unknown.TINY
-                ),
-                "base_catch": (
-                    f"{self.base_catch * 100:.1f}"
-                    if Unknown.is_not(self.base_catch)
-                    else Unknown.SMALL
-                ),
-                "base_catch_2": (
-                    f"{self.base_catch * 100:.2f}"
-                    if Unknown.is_not(self.base_catch)
-                    else Unknown.SMALL
-                ),
-                "great_catch_0": (
-                    f"{self.great_catch * 100:.0f}"
-                    if Unknown.is_not(self.great_catch)
-                    else Unknown.TINY
-                ),
-                "great_catch": (
-                    f"{self.great_catch * 100:.1f}"
-                    if Unknown.is_not(self.great_catch)
-                    else Unknown.SMALL
-                ),
-                "great_catch_2": (
-                    f"{self.great_catch * 100:.2f}"
-                    if Unknown.is_not(self.great_catch)
-                    else Unknown.SMALL
-                ),
-                "ultra_catch_0": (
-                    f"{self.ultra_catch * 100:.0f}"
-                    if Unknown.is_not(self.ultra_catch)
-                    else Unknown.TINY
-                ),
-                "ultra_catch": (
-                    f"{self.ultra_catch * 100:.1f}"
-                    if Unknown.is_not(self.ultra_catch)
-                    else Unknown.SMALL
-                ),
-                "ultra_catch_2": (
-                    f"{self.ultra_catch * 100:.2f}"
-                    if Unknown.is_not(self.ultra_catch)
-                    else Unknown.SMALL
-                ),
                 # Misc
                 "big_karp": (
                     "big"
@@ -610,4 +518,137 @@ class MonEvent(BaseEvent):
                 ),
             }
         )
+
+        # Costly DTS, computed only if used
+        dts.lazy(
+            (
+                "time_left",
+                "12h_time",
+                "24h_time",
+                "time_left_no_secs",
+                "12h_time_no_secs",
+                "24h_time_no_secs",
+                "time_left_raw_hours",
+                "time_left_raw_minutes",
+                "time_left_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.disappear_time, timezone),
+        )
+        dts.lazy(
+            ("max_cp", "max_perfect_cp", "stardust_cost", "candy_cost"),
+            self._max_out,
+        )
+        dts.lazy(
+            ("max_evo_cp", "max_perfect_evo_cp", "candy_cost_with_evo"),
+            self._max_out_evolution,
+        )
+        dts.lazy(
+            ("great_url", "great_pvpoke"),
+            lambda: self._pvp_links(locale, self.great_id, 1500),
+        )
+        dts.lazy(
+            ("ultra_url", "ultra_pvpoke"),
+            lambda: self._pvp_links(locale, self.ultra_id, 2500),
+        )
+        dts.lazy(
+            (
+                "base_catch_0",
+                "base_catch",
+                "base_catch_2",
+                "great_catch_0",
+                "great_catch",
+                "great_catch_2",
+                "ultra_catch_0",
+                "ultra_catch",
+                "ultra_catch_2",
+            ),
+            self._catch_rates,
+        )
         return dts
+
+    def _max_out(self):
+        """Returns the CP of this monster at level 50 and its cost."""
+        return (
+            calculate_cp(
+                self.monster_id,
+                self.form_id,
+                self.atk_iv,
+                self.def_iv,
+                self.sta_iv,
+                50,
+            ),
+            max_cp(self.monster_id, self.form_id),
+            calculate_stardust_cost(self.mon_lvl, 50),
+            calculate_candy_cost(self.mon_lvl, 50),
+        )
+
+    def _max_out_evolution(self):
+        """Returns the CP of the last evolution at level 50 and its cost."""
+        evolutions = get_evolutions(self.monster_id, self.form_id)
+        evolution_costs = get_evolution_costs(self.monster_id, self.form_id)
+
+        last_evo_id = evolutions[-1][0] if evolutions else self.monster_id
+        last_evo_form_id = evolutions[-1][1] if evolutions else self.form_id
+
+        evo_candy_cost = calculate_evolution_cost(
+            self.monster_id, last_evo_id, evolutions, evolution_costs
+        )
+        return (
+            calculate_cp(
+                last_evo_id,
+                last_evo_form_id,
+                self.atk_iv,
+                self.def_iv,
+                self.sta_iv,
+                50,
+            ),
+            max_cp(last_evo_id, last_evo_form_id),
+            calculate_candy_cost(self.mon_lvl, 50, evo_candy_cost),
+        )
+
+    def _pvp_links(self, locale, monster_id, league):
+        """Returns the rank checker and pvpoke links of a PvP league."""
+        monster_name_formatted = (
+            re.sub(
+                r"[^A-Za-z0-9\s]+",
+                "",
+                locale.get_english_pokemon_name(monster_id),
+            )
+            .lower()
+            .replace(" ", "_")
+        )
+        pvpoke_monster_formatted = monster_name_formatted
+        form_name = locale.get_english_form_name(monster_id, self.form_id)
+        if not any(x in form_name for x in ["unknown", "Normal"]):
+            pvpoke_monster_formatted += "_" + re.sub(
+                r"[^A-Za-z0-9\s]+", "", form_name.lower().replace(" ", "_")
+            )
+
+        url = "https://www.stadiumgaming.gg/rank-checker?" + urlencode(
+            {
+                "pokemon": monster_name_formatted,
+                "league": str(league),
+                "att_iv": f'"{self.atk_iv}"',
+                "def_iv": f'"{self.def_iv}"',
+                "hp_iv": f'"{self.sta_iv}"',
+                "min-iv": "0",
+                "levelCap": "50",
+            }
+        )
+        pvpoke = (
+            f"https://{locale.get_pvpoke_domain()}/rankings/all/{league}/overall/"
+            f"{pvpoke_monster_formatted}/"
+        )
+        return url, pvpoke
+
+    def _catch_rates(self):
+        """Returns the catch rates with 0, 1 and 2 decimals for each ball."""
+        rates = []
+        for catch in (self.base_catch, self.great_catch, self.ultra_catch):
+            if Unknown.is_not(catch):
+                rates.extend(
+                    [f"{catch * 100:.0f}", f"{catch * 100:.1f}", f"{catch * 100:.2f}"]
+                )
+            else:
+                rates.extend([Unknown.TINY, Unknown.SMALL, Unknown.SMALL])
+        return rates
@@ -4,7 +4,7 @@ from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm.Utils import (
     get_gmaps_link,
     get_applemaps_link,
@@ -21,6 +21,30 @@ from PokeAlarm.Utilities.MonUtils import get_shiny_status
 class QuestEvent(BaseEvent):
     """Event representing the discovery of a Quest."""
 
+    __slots__ = (
+        "stop_id",
+        "stop_name",
+        "stop_image",
+        "quest_type_raw",
+        "quest_type_id",
+        "quest_target",
+        "quest_task_raw",
+        "quest_condition_raw",
+        "quest_template",
+        "last_modified",
+        "reward_type_id",
+        "reward_type_raw",
+        "reward_amount",
+        "monster_id",
+        "monster_form_id",
+        "monster_costume_id",
+        "monster_types",
+        "monster_can_be_shiny",
+        "item_amount",
+        "item_type",
+        "item_id",
+    )
+
     def __init__(self, data):
         """Creates a new Quest Event based on the given dict."""
         super(QuestEvent, self).__init__("quests")
@@ -88,13 +112,13 @@ class QuestEvent(BaseEvent):
         # Nothing to update
         pass
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
         form_name = locale.get_form_name(self.monster_id, self.monster_form_id)
         costume_name = locale.get_costume_name(self.monster_id, self.monster_costume_id)
         type1 = locale.get_type_name(self.monster_types[0])
         type2 = locale.get_type_name(self.monster_types[1])
-        dts = self.custom_dts.copy()
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
@@ -118,7 +142,6 @@ class QuestEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Quest Details
                 # ToDo: Interpret the 'quest_condition' field and use that instead
                 #  of 'quest_type'
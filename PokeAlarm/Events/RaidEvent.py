@@ -4,7 +4,7 @@ from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm.Utils import (
     get_gmaps_link,
     get_applemaps_link,
@@ -38,6 +38,57 @@ from PokeAlarm.Utilities import MonUtils
 class RaidEvent(BaseEvent):
     """Event representing the discovery of a Raid."""
 
+    __slots__ = (
+        "gym_id",
+        "raid_end",
+        "time_left",
+        "raid_lvl",
+        "mon_id",
+        "form_id",
+        "cp",
+        "types",
+        "boss_level",
+        "gender",
+        "can_be_shiny",
+        "evolution_id",
+        "costume_id",
+        "weather_id",
+        "boosted_weather_id",
+        "quick_id",
+        "quick_type",
+        "quick_damage",
+        "quick_dps",
+        "quick_duration",
+        "quick_energy",
+        "charge_id",
+        "charge_type",
+        "charge_damage",
+        "charge_dps",
+        "charge_duration",
+        "charge_energy",
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "slots_available",
+        "guard_count",
+        "sponsor_id",
+        "park",
+        "ex_eligible",
+        "current_team_id",
+    )
+
+    manager_attrs = BaseEvent.manager_attrs + (
+        "weather_id",
+        "boosted_weather_id",
+        "boss_level",
+        "slots_available",
+        "guard_count",
+        "gym_name",
+        "gym_description",
+        "gym_image",
+        "current_team_id",
+    )
+
     def __init__(self, data):
         """Creates a new Stop Event based on the given dict."""
         super(RaidEvent, self).__init__("raid")
@@ -145,10 +196,9 @@ class RaidEvent(BaseEvent):
             else Unknown.TINY
         )
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        raid_end_time = get_time_as_str(self.raid_end, timezone)
-        dts = self.custom_dts.copy()
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
+        dts = LazyDts()
 
         form_name = locale.get_form_name(self.mon_id, self.form_id)
         evolution_name = locale.get_evolution_name(self.evolution_id)
@@ -160,28 +210,13 @@ class RaidEvent(BaseEvent):
         type1 = locale.get_type_name(self.types[0])
         type2 = locale.get_type_name(self.types[1])
 
-        cp_range = get_pokemon_cp_range(self.boss_level, self.mon_id, self.form_id)
-
-        evolutions = get_evolutions(self.mon_id, self.form_id)
-        last_evo_id = evolutions[-1][0] if evolutions else self.mon_id
-        last_evo_form_id = evolutions[-1][1] if evolutions else self.form_id
-
         dts.update(
             {
                 # Identification
                 "gym_id": self.gym_id,
                 # Time Remaining
-                "raid_time_left": raid_end_time[0],
-                "12h_raid_end": raid_end_time[1],
-                "24h_raid_end": raid_end_time[2],
                 # Time Remaining Without Seconds
-                "raid_time_no_secs": raid_end_time[3],
-                "12h_raid_end_no_secs": raid_end_time[4],
-                "24h_raid_end_no_secs": raid_end_time[5],
                 # Raw time remaining values
-                "raid_time_raw_hours": raid_end_time[6],
-                "raid_time_raw_minutes": raid_end_time[7],
-                "raid_time_raw_seconds": raid_end_time[8],
                 "raid_end_utc": self.raid_end,
                 "current_timestamp_utc": datetime.utcnow(),
                 # Type
@@ -238,7 +273,6 @@ class RaidEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Weather
                 "weather_id": self.weather_id,
                 "weather": weather_name,
@@ -284,11 +318,7 @@ class RaidEvent(BaseEvent):
                 "charge_energy": self.charge_energy,
                 # CP info
                 "cp": self.cp,
-                "min_cp": cp_range[0],
-                "max_cp": cp_range[1],
                 # Max out
-                "max_perfect_cp": max_cp(self.mon_id, self.form_id),
-                "max_perfect_evo_cp": max_cp(last_evo_id, last_evo_form_id),
                 "stardust_cost": calculate_stardust_cost(self.raid_lvl, 50),
                 "candy_cost": calculate_candy_cost(self.raid_lvl, 50),
                 # Gym Details
@@ -313,4 +343,34 @@ class RaidEvent(BaseEvent):
                 "team_leader": locale.get_leader_name(self.current_team_id),
             }
         )
+
+        # Costly DTS, computed only if used
+        dts.lazy(
+            (
+                "raid_time_left",
+                "12h_raid_end",
+                "24h_raid_end",
+                "raid_time_no_secs",
+                "12h_raid_end_no_secs",
+                "24h_raid_end_no_secs",
+                "raid_time_raw_hours",
+                "raid_time_raw_minutes",
+                "raid_time_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.raid_end, timezone),
+        )
+        boss_level = self.boss_level  # Other Managers may change it before use
+        dts.lazy(
+            ("min_cp", "max_cp"),
+            lambda: get_pokemon_cp_range(boss_level, self.mon_id, self.form_id),
+        )
+        dts.lazy("max_perfect_cp", lambda: max_cp(self.mon_id, self.form_id))
+        dts.lazy("max_perfect_evo_cp", self._max_perfect_evolution_cp)
         return dts
+
+    def _max_perfect_evolution_cp(self):
+        """Returns the CP of the last evolution with perfect IVs at level 50."""
+        evolutions = get_evolutions(self.mon_id, self.form_id)
+        last_evo_id = evolutions[-1][0] if evolutions else self.mon_id
+        last_evo_form_id = evolutions[-1][1] if evolutions else self.form_id
+        return max_cp(last_evo_id, last_evo_form_id)
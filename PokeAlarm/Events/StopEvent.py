@@ -4,7 +4,7 @@ from datetime import datetime
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm.Utils import (
     get_gmaps_link,
     get_applemaps_link,
@@ -18,6 +18,15 @@ from PokeAlarm.Utils import (
 class StopEvent(BaseEvent):
     """Event representing the discovery of a PokeStop."""
 
+    __slots__ = (
+        "stop_id",
+        "stop_name",
+        "stop_image",
+        "lure_type_id",
+        "expiration",
+        "time_left",
+    )
+
     def __init__(self, data):
         """Creates a new Stop Event based on the given dict."""
         super(StopEvent, self).__init__("stop")
@@ -61,10 +70,9 @@ class StopEvent(BaseEvent):
         # Nothing to update
         pass
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
-        time = get_time_as_str(self.expiration, timezone)
-        dts = self.custom_dts.copy()
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
@@ -76,15 +84,6 @@ class StopEvent(BaseEvent):
                 "lure_type_id_3": f"{self.lure_type_id:03}",
                 "lure_type_name": locale.get_lure_type_name(self.lure_type_id),
                 # Time left
-                "time_left": time[0],
-                "12h_time": time[1],
-                "24h_time": time[2],
-                "time_left_no_secs": time[3],
-                "12h_time_no_secs": time[4],
-                "24h_time_no_secs": time[5],
-                "time_left_raw_hours": time[6],
-                "time_left_raw_minutes": time[7],
-                "time_left_raw_seconds": time[8],
                 "expiration_utc": self.expiration,
                 "current_timestamp_utc": datetime.utcnow(),
                 # Location
@@ -104,7 +103,22 @@ class StopEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
             }
         )
+
+        # Costly DTS, computed only if used
+        dts.lazy(
+            (
+                "time_left",
+                "12h_time",
+                "24h_time",
+                "time_left_no_secs",
+                "12h_time_no_secs",
+                "24h_time_no_secs",
+                "time_left_raw_hours",
+                "time_left_raw_minutes",
+                "time_left_raw_seconds",
+            ),
+            lambda: get_time_as_str(self.expiration, timezone),
+        )
         return dts
@@ -10,13 +10,20 @@ from PokeAlarm.Utils import (
     get_weather_emoji,
     get_waze_link,
 )
-from . import BaseEvent
+from . import BaseEvent, LazyDts
 from PokeAlarm import Unknown
 
 
 class WeatherEvent(BaseEvent):
     """Event representing the change occurred in Weather."""
 
+    __slots__ = (
+        "s2_cell_id",
+        "weather_id",
+        "severity_id",
+        "day_or_night_id",
+    )
+
     def __init__(self, data):
         """Creates a new Weather Event based on the given dict."""
         super(WeatherEvent, self).__init__("weather")
@@ -50,11 +57,11 @@ class WeatherEvent(BaseEvent):
         # Nothing to update
         pass
 
-    def generate_dts(self, locale, timezone, units):
-        """Return a dict with all the DTS for this event."""
+    def _generate_dts(self, locale, timezone, units):
+        """Return a dict with the DTS of this event shared by all rules."""
         weather_name = locale.get_weather_name(self.weather_id)
         severity_locale = locale.get_severity_name(self.severity_id)
-        dts = self.custom_dts.copy()
+        dts = LazyDts()
         dts.update(
             {
                 # Identification
@@ -76,7 +83,6 @@ class WeatherEvent(BaseEvent):
                 "applenav": get_applemaps_link(self.lat, self.lng, True),
                 "waze": get_waze_link(self.lat, self.lng, False),
                 "wazenav": get_waze_link(self.lat, self.lng, True),
-                "geofence": self.geofence,
                 # Weather Info
                 "weather_id": self.weather_id,
                 "weather_id_3": f"{self.weather_id:03}",
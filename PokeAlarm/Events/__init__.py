@@ -1,7 +1,7 @@
 import logging
 import traceback
 
-from .BaseEvent import BaseEvent  # noqa F401
+from .BaseEvent import BaseEvent, EventView, LazyDts  # noqa F401
 from .MonEvent import MonEvent
 from .StopEvent import StopEvent
 from .GymEvent import GymEvent
@@ -56,3 +56,17 @@ def event_factory(data):
             e,
         )
         log.debug("Stack trace: \n %s", traceback.format_exc())
+
+
+def batch_event_factory(frames):
+    """Creates and returns a flat list of Events from a list of frames."""
+    events = []
+    for data in frames:
+        obj = event_factory(data)
+        if obj is None:
+            continue
+        if isinstance(obj, list):
+            events.extend(obj)
+        else:
+            events.append(obj)
+    return events
@@ -1,17 +1,36 @@
 # Standard Library Imports
+import keyword
 import logging
+import math
+import operator
 from datetime import datetime, timedelta
 
 # 3rd Party Imports
 # Local Imports
 from PokeAlarm import Unknown
+from PokeAlarm.Geofence import Geofences
 
 log = logging.getLogger("Filter")
 
+_UNKNOWN = frozenset([Unknown.TINY, Unknown.SMALL, Unknown.REGULAR])
+
+# Comparisons that can be inlined into compiled checks, as `limit OP value`
+_INLINE_OPS = {
+    operator.le: "<=",
+    operator.ge: ">=",
+    operator.lt: "<",
+    operator.gt: ">",
+    operator.eq: "==",
+    operator.ne: "!=",
+}
+
 
 class BaseFilter(object):
     """Abstract class representing details related to different events."""
 
+    # Number of checked events between reordering the checks
+    REORDER_INTERVAL = 1000
+
     def __init__(self, mgr, kind, name, geofences_ref):
         """Initializes base parameters for a filter."""
 
@@ -26,6 +45,9 @@ class BaseFilter(object):
 
         # Functions for checking set parameters
         self._check_list = []
+        self._compiled_check = None  # Generated from _check_list when needed
+        self._checked = 0  # Events checked since the stats were last updated
+        self._rejects = []  # Rejections by each check since then
 
         # Missing Info
         self.is_missing_info = None
@@ -41,20 +63,175 @@ class BaseFilter(object):
         raise NotImplementedError("This is an abstract method.")
 
     def check_event(self, event):
+        if self._checked >= self.REORDER_INTERVAL:
+            self.reorder_checks()
+        if self._compiled_check is None:
+            self._compiled_check = self.compile_checks()
+        self._checked += 1
+        return self._compiled_check(event)
+
+    def check_event_list(self, event):
+        """Checks the event by calling each check in turn (not compiled)."""
         missing = False  # Event is missing no info to start
+        geofence = None  # Geofence matched, set once the event passes
         for check in self._check_list:
             result = check(self, event)
             if result is False:
                 return False
             elif Unknown.is_(result):
                 missing = True  # Mark Event as missing info
+            elif isinstance(check, CheckGeofence) and result is not True:
+                geofence = result
         # Do a special check for is missing_info is set
         if self.is_missing_info is not None and missing != self.is_missing_info:
             self.reject(event, "missing_info", missing, self.is_missing_info)
             return False
+        if geofence is not None:
+            event.geofence = geofence
         self.accept(event)
         return True
 
+    def compile_checks(self):
+        """Generates a single function that checks an event against this filter.
+
+        The function behaves exactly like `check_event_list`, but inlines the
+        limits and comparisons of simple attribute checks so that each event
+        is checked without calling a function per parameter.
+        """
+        self._update_check_stats()
+        self._rejects = [0] * len(self._check_list)
+        env = {"filtr": self, "_reject": self.reject, "_UNKNOWN": _UNKNOWN}
+        env["_rejects"] = self._rejects
+        env["_is_unknown"] = Unknown.is_
+        lines = [
+            "def check_event(event):",
+            "    missing = False",
+            "    geofence = None",
+        ]
+        for i, check in enumerate(self._check_list):
+            if not isinstance(check, CheckFunction):
+                env[f"_c{i}"] = check
+                lines += [
+                    f"    r = _c{i}(filtr, event)",
+                    "    if r is False:",
+                    f"        _rejects[{i}] += 1",
+                    "        return False",
+                    "    if r in _UNKNOWN:",
+                    "        missing = True",
+                ]
+                if isinstance(check, CheckGeofence):
+                    lines += ["    elif r is not True:", "        geofence = r"]
+                continue
+            attr = check.attr_name
+            env[f"_a{i}"] = attr
+            env[f"_l{i}"] = check.limit
+            limit = f"_l{i}"
+            if type(check.limit) in (int, float) and math.isfinite(check.limit):
+                limit = repr(check.limit)  # Finite numbers are inlined as is
+            if attr.isidentifier() and not keyword.iskeyword(attr):
+                lines.append(f"    v = event.{attr}")
+            else:
+                lines.append(f"    v = getattr(event, _a{i})")
+            lines += [
+                "    if (_is_unknown(*v) if v.__class__ is list else v in _UNKNOWN):",
+                "        missing = True",
+            ]
+            if check.eval_func is operator.contains:
+                lines.append(f"    elif v not in {limit}:")
+            elif check.eval_func in _INLINE_OPS:
+                op = _INLINE_OPS[check.eval_func]
+                lines.append(f"    elif ({limit} {op} v) is False:")
+            else:
+                env[f"_f{i}"] = check.eval_func
+                lines += [
+                    "    else:",
+                    f"        r = _f{i}(_l{i}, v)",
+                    "        if r is False:",
+                    f"            _reject(event, _a{i}, v, _l{i})",
+                    f"            _rejects[{i}] += 1",
+                    "            return False",
+                    "        if r in _UNKNOWN:",
+                    "            missing = True",
+                ]
+                continue
+            lines += [
+                f"        _reject(event, _a{i}, v, _l{i})",
+                f"        _rejects[{i}] += 1",
+                "        return False",
+            ]
+        lines += [
+            "    if filtr.is_missing_info is not None and missing != filtr.is_missing_info:",
+            '        _reject(event, "missing_info", missing, filtr.is_missing_info)',
+            "        return False",
+            "    if geofence is not None:",
+            "        event.geofence = geofence",
+            "    filtr.accept(event)",
+            "    return True",
+        ]
+        code = compile("\n".join(lines), f"<filter {self._name}>", "exec")
+        exec(code, env)
+        return env["check_event"]
+
+    def _update_check_stats(self):
+        """Adds the rejections counted by the compiled check to each check."""
+        reached = self._checked
+        for check, rejected in zip(self._check_list, self._rejects):
+            check.evaluated += reached
+            check.rejected += rejected
+            reached -= rejected  # Later checks never saw rejected events
+        self._checked = 0
+        self._rejects[:] = [0] * len(self._rejects)
+
+    def check_stats(self):
+        """Returns how many events each check evaluated and rejected."""
+        self._update_check_stats()
+        return [
+            {"check": c.name, "evaluated": c.evaluated, "rejected": c.rejected}
+            for c in self._check_list
+        ]
+
+    def reorder_checks(self):
+        """Sorts the checks so the cheapest, most rejecting ones run first."""
+        self._update_check_stats()
+        # Expected cost of a check per rejection, smoothed for unseen checks
+        self._check_list.sort(
+            key=lambda c: c.cost * (c.evaluated + 2) / (c.rejected + 1)
+        )
+        self._compiled_check = None
+        self._log.debug(
+            "Checks for '%s' reordered: %s",
+            self._name,
+            ", ".join(
+                f"{s['check']} ({s['rejected']}/{s['evaluated']} rejected)"
+                for s in self.check_stats()
+            ),
+        )
+
+    def index_values(self, attr_name):
+        """Returns the set of values of an attribute this filter can pass.
+
+        Returns None if the filter doesn't restrict the attribute to a
+        known set of values (i.e. any value could pass).
+        """
+        allowed, min_limit, max_limit = None, None, None
+        for check in self._check_list:
+            if not isinstance(check, CheckFunction) or check.attr_name != attr_name:
+                continue
+            if check.eval_func is operator.contains and isinstance(
+                check.limit, (set, list)
+            ):
+                limit = set(check.limit)
+                allowed = limit if allowed is None else allowed & limit
+            elif check.eval_func is operator.le and isinstance(check.limit, int):
+                min_limit = check.limit
+            elif check.eval_func is operator.ge and isinstance(check.limit, int):
+                max_limit = check.limit
+        # Integer ranges with both limits set can be listed as well
+        if min_limit is not None and max_limit is not None:
+            limit = set(range(min_limit, max_limit + 1))
+            allowed = limit if allowed is None else allowed & limit
+        return allowed
+
     def reject(self, event, attr_name, value, required):
         """Log the reason for rejecting the Event."""
         self._log.info("'%s' %s rejected by '%s'", event.name, self._type, self._name)
@@ -74,6 +251,7 @@ class BaseFilter(object):
 
         # Add check function to our list
         self._check_list.append(check)
+        self._compiled_check = None
         return limit
 
     def evaluate_time(self, min_time, max_time):
@@ -90,6 +268,7 @@ class BaseFilter(object):
 
         # Add check function to our list
         self._check_list.append(check)
+        self._compiled_check = None
 
     def evaluate_geofences(self, geofences, exclude_mode):
         if geofences is None:
@@ -100,6 +279,7 @@ class BaseFilter(object):
 
         # Add check function to our list
         self._check_list.append(check)
+        self._compiled_check = None
 
     @staticmethod
     def parse_as_type(kind, param_name, data):
@@ -230,6 +410,31 @@ class CheckFunction(object):
         self._limit = limit
         self._eval_func = eval_func
         self._attr_name = attr_name
+        self.evaluated = 0
+        self.rejected = 0
+
+    @property
+    def limit(self):
+        return self._limit
+
+    @property
+    def eval_func(self):
+        return self._eval_func
+
+    @property
+    def attr_name(self):
+        return self._attr_name
+
+    @property
+    def name(self):
+        return self._attr_name
+
+    @property
+    def cost(self):
+        """Rough relative cost of running this check."""
+        if self._eval_func is operator.contains or self._eval_func in _INLINE_OPS:
+            return 1  # Inlined when compiled
+        return 2
 
     def __call__(self, filtr, event):
         value = getattr(event, self._attr_name)  # event.event_attr
@@ -249,10 +454,15 @@ class CheckFunction(object):
 class CheckTime(object):
     """Function used to check if a timestamp passes or not."""
 
+    name = "time"
+    cost = 4  # Rough relative cost of running this check
+
     def __init__(self, min_time, max_time):
         self._min_time = min_time
         self._max_time = max_time
         self._override_time = None
+        self.evaluated = 0
+        self.rejected = 0
 
     def __call__(self, filtr, event):
         if self._override_time is not None:
@@ -295,6 +505,19 @@ class CheckGeofence(object):
         self._limit = limit
         self._geofences_ref = geofences_ref
         self._exclude_mode = exclude_mode
+        self.evaluated = 0
+        self.rejected = 0
+
+    @property
+    def name(self):
+        return "exclude_geofences" if self._exclude_mode else "geofences"
+
+    @property
+    def cost(self):
+        """Rough relative cost of running this check."""
+        if isinstance(self._geofences_ref, Geofences):
+            return 3  # Indexed lookup
+        return 2 + 4 * len(self._limit)
 
     def __call__(self, filtr, event):
         lat = getattr(event, "lat")
@@ -309,19 +532,22 @@ class CheckGeofence(object):
         targets = self._limit
         if len(targets) == 1 and "all" in targets:
             targets = self._geofences_ref.keys()
+        inside = None  # Geofences without an index are checked one by one
+        if isinstance(self._geofences_ref, Geofences):
+            inside = self._geofences_ref.containing(lat, lng)
         for name in targets:
             gf = self._geofences_ref.get(name)
             if not gf:  # gf doesn't exist :'(
                 filtr.reject(event, "geofence name", f"{name} not", "geofence list")
-            elif gf.contains(lat, lng):  # event in gf
+            elif name in inside if inside is not None else gf.contains(lat, lng):
+                # event in gf
                 if self._exclude_mode:
                     filtr.reject(
                         event, "location", f"{lat},{lng}", f"'{name}' geofence"
                     )
                     return False
                 else:
-                    event.geofence = name  # Set the geofence for dts
-                    return True
+                    return name  # Set as geofence of the event if it passes
             else:  # event not in gf
                 filtr.reject(
                     event, "location", f"{lat},{lng} not", f"'{name}' geofence"
@@ -152,6 +152,16 @@ class MonFilter(BaseFilter):
             eval_func=operator.le,
             limit=BaseFilter.parse_as_type(float, "min_cp_great", data),
         )
+        self.min_great_rank = self.evaluate_attribute(
+            event_attribute="great_rank",
+            eval_func=operator.le,
+            limit=BaseFilter.parse_as_type(int, "min_great_rank", data),
+        )
+        self.max_great_rank = self.evaluate_attribute(
+            event_attribute="great_rank",
+            eval_func=operator.ge,
+            limit=BaseFilter.parse_as_type(int, "max_great_rank", data),
+        )
         self.min_ultra = self.evaluate_attribute(
             event_attribute="ultra_product",
             eval_func=operator.le,
@@ -167,6 +177,16 @@ class MonFilter(BaseFilter):
             eval_func=operator.le,
             limit=BaseFilter.parse_as_type(float, "min_cp_ultra", data),
         )
+        self.min_ultra_rank = self.evaluate_attribute(
+            event_attribute="ultra_rank",
+            eval_func=operator.le,
+            limit=BaseFilter.parse_as_type(int, "min_ultra_rank", data),
+        )
+        self.max_ultra_rank = self.evaluate_attribute(
+            event_attribute="ultra_rank",
+            eval_func=operator.ge,
+            limit=BaseFilter.parse_as_type(int, "max_ultra_rank", data),
+        )
 
         # Form  TODO: names
         self.forms = self.evaluate_attribute(  # f.forms in m.form_id
@@ -351,10 +371,18 @@ class MonFilter(BaseFilter):
             settings["min_great"] = self.min_great
         if self.max_great is not None:
             settings["max_great"] = self.max_great
+        if self.min_great_rank is not None:
+            settings["min_great_rank"] = self.min_great_rank
+        if self.max_great_rank is not None:
+            settings["max_great_rank"] = self.max_great_rank
         if self.min_ultra is not None:
             settings["min_ultra"] = self.min_ultra
         if self.max_ultra is not None:
             settings["max_ultra"] = self.max_ultra
+        if self.min_ultra_rank is not None:
+            settings["min_ultra_rank"] = self.min_ultra_rank
+        if self.max_ultra_rank is not None:
+            settings["max_ultra_rank"] = self.max_ultra_rank
         # Form
         if self.forms is not None:
             settings["forms"] = self.forms
@@ -0,0 +1,457 @@
+# Standard Library Imports
+import logging
+import os
+import pickle
+import sys
+import time
+
+# 3rd Party Imports
+# Local Imports
+from PokeAlarm import config
+from PokeAlarm.Utilities.JsonUtils import load as json_load
+
+log = logging.getLogger("GameData")
+
+
+class GameData(object):
+    """Static game data from the data folder, loaded when first used.
+
+    Each source is parsed once and every table derived from it is built in
+    the same pass. Tables are then plain attributes, e.g. `game_data.base_stats`.
+    """
+
+    # Snapshot of all tables, written after the data files are updated
+    SNAPSHOT_FILE = "data/.game_data.pickle"
+    SNAPSHOT_VERSION = 1  # Bump when a builder changes its tables
+
+    def __init__(self):
+        self.__stats = {}  # Table name -> load stats
+
+    def __getattr__(self, name):
+        # Only called for tables that haven't been loaded yet
+        source = _table_sources().get(name)
+        if source is None:
+            raise AttributeError(f"'{name}' is not a game data table.")
+        self.load(source)
+        return self.__dict__[name]
+
+    def load(self, source):
+        """Parses the files of a source and builds all of its tables."""
+        files, builder = _SOURCES[source]
+        start = time.perf_counter()
+        data = []
+        for file_ in files:
+            with open(_get_path(file_), "r") as f:
+                data.append(json_load(f))
+        parsed = time.perf_counter()
+        tables = builder(*data)
+        built = time.perf_counter()
+        for name, table in tables.items():
+            setattr(self, name, table)
+            self.__stats[name] = {
+                "table": name,
+                "source": source,
+                "parse_time": parsed - start,
+                "build_time": built - parsed,
+            }
+        log.debug(
+            "Loaded %s data in %.3fs (parse %.3fs, build %.3fs).",
+            source,
+            built - start,
+            parsed - start,
+            built - parsed,
+        )
+
+    def load_all(self):
+        """Loads every source that isn't loaded yet."""
+        for source in _SOURCES:
+            if any(name not in self.__dict__ for name in _SOURCES[source][1].tables):
+                self.load(source)
+
+    def reload(self):
+        """Drops all loaded tables, so they are parsed again when next used."""
+        for name in list(self.__stats):
+            self.__dict__.pop(name, None)
+        self.__stats.clear()
+
+    def load_snapshot(self):
+        """Loads all tables from the snapshot file.
+
+        Returns False if there is no snapshot or if it was made from other
+        data files, in which case tables are still built from the json files.
+        """
+        start = time.perf_counter()
+        try:
+            with open(_get_path(self.SNAPSHOT_FILE), "rb") as f:
+                snapshot = pickle.loads(f.read())
+        except OSError as e:
+            log.debug("Unable to read game data snapshot: %s", e)
+            return False
+        except Exception as e:  # Corrupt, or made by an older version
+            log.warning(
+                "Unable to load game data snapshot, building tables from the "
+                "data files instead: %s: %s",
+                type(e).__name__,
+                e,
+            )
+            return False
+        if not isinstance(snapshot, dict):
+            log.warning("Game data snapshot is invalid.")
+            return False
+        if snapshot.get("version") != self.SNAPSHOT_VERSION:
+            log.debug("Game data snapshot version is outdated.")
+            return False
+        if snapshot.get("signature") != data_signature():
+            log.debug("Game data snapshot doesn't match the data files.")
+            return False
+        loaded = time.perf_counter()
+        for name, table in snapshot["tables"].items():
+            setattr(self, name, table)
+            self.__stats[name] = {
+                "table": name,
+                "source": "snapshot",
+                "parse_time": loaded - start,
+                "build_time": 0.0,
+            }
+        log.info("Loaded game data snapshot in %.3fs.", loaded - start)
+        return True
+
+    def save_snapshot(self):
+        """Builds all tables and writes them to the snapshot file."""
+        self.load_all()
+        names = _table_sources().keys()
+        snapshot = {
+            "version": self.SNAPSHOT_VERSION,
+            "signature": data_signature(),
+            "tables": {name: self.__dict__[name] for name in names},
+        }
+        path = _get_path(self.SNAPSHOT_FILE)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+        log.debug("Saved game data snapshot to %s.", path)
+
+    def stats(self):
+        """Returns load time and memory size of each loaded table."""
+        stats = []
+        for name, stat in self.__stats.items():
+            stat = dict(stat, size=deep_sizeof(self.__dict__[name]))
+            stats.append(stat)
+        return stats
+
+
+# Returns what identifies the data files the tables are built from
+def data_signature():
+    try:
+        with open(_get_path("data/.data_version"), "r") as f:
+            signature = {"data_version": json_load(f)}
+    except (OSError, ValueError):
+        signature = {"data_version": None}
+    # Bundled files aren't part of data_version, but change with updates
+    for source, (files, builder) in sorted(_SOURCES.items()):
+        for file_ in files:
+            try:
+                st = os.stat(_get_path(file_))
+                signature[file_] = (st.st_size, st.st_mtime_ns)
+            except OSError:
+                signature[file_] = None
+    return signature
+
+
+def _get_path(path):
+    if not os.path.isabs(path):
+        path = os.path.join(config["ROOT_PATH"], path)
+    return path
+
+
+# Returns the memory used by an object and everything it contains
+def deep_sizeof(obj):
+    seen = set()
+    stack = [obj]
+    size = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return size
+
+
+# ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~ BUILDERS ~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+
+def tables(*names):
+    """Declares the names of the tables returned by a builder."""
+
+    def decorator(builder):
+        builder.tables = names
+        return builder
+
+    return decorator
+
+
+@tables(
+    "base_heights",
+    "base_weights",
+    "base_stats",
+    "base_types",
+    "evolutions",
+    "evolution_costs",
+    "form_names",
+)
+def build_pokemon_tables(j):
+    heights, weights, stats, types = {}, {}, {}, {}
+    evolutions, evolution_costs, form_names = {}, {}, {}
+    for id_ in j:
+        mon = j[id_]
+        base_key = int(id_) * 100_000
+        heights[int(id_)] = mon.get("height")
+        weights[int(id_)] = mon.get("weight")
+
+        normal_form_stats = mon.get("stats")
+        normal_form_types = ([int(k) for k in mon.get("types")] + [0] * 2)[:2]
+        normal_form_chain = _evolution_chain(j, id_, "0")
+        normal_form_cost_chain = _evolution_cost_chain(j, id_, "0")
+        stats[base_key] = normal_form_stats
+        types[base_key] = normal_form_types
+        evolutions[base_key] = normal_form_chain
+        evolution_costs[base_key] = normal_form_cost_chain
+
+        form_names[int(id_)] = {0: "Normal"}
+        for form_id_ in mon.get("forms", {}):
+            if form_id_ == "0":
+                continue
+            form_ = mon["forms"][form_id_]
+            form_names[int(id_)][int(form_id_)] = form_["name"]
+            key = base_key + int(form_id_)
+            if form_["name"] in ("Shadow", "Purified", "Normal"):
+                stats[key] = normal_form_stats
+                types[key] = normal_form_types
+                evolutions[key] = normal_form_chain
+                evolution_costs[key] = normal_form_cost_chain
+                continue
+            if form_.get("stats") is None:
+                stats[key] = normal_form_stats
+            else:
+                stats[key] = form_["stats"]
+            if form_.get("types") is None:
+                types[key] = normal_form_types
+            else:
+                types[key] = ([int(k) for k in form_["types"]] + [0] * 2)[:2]
+            evolutions[key] = _evolution_chain(j, id_, form_id_)
+            evolution_costs[key] = _evolution_cost_chain(j, id_, form_id_)
+
+    return {
+        "base_heights": heights,
+        "base_weights": weights,
+        "base_stats": stats,
+        "base_types": types,
+        "evolutions": evolutions,
+        "evolution_costs": evolution_costs,
+        "form_names": form_names,
+    }
+
+
+# Return the list of evolutions depending on the form of the pokemon
+def _evolution_chain(j, id_, form_id_, a=None):
+    if a is None:
+        a = []
+    if form_id_ != "0":
+        evolutions = j[id_]["forms"][form_id_].get("evolutions")
+        if evolutions is not None:
+            for evo_id in evolutions:
+                if int(evo_id) > 1010:  # block unreleased generations
+                    continue
+
+                evo_form_id = evolutions[evo_id]["form"]
+                a.append((int(evo_id), int(evo_form_id)))
+
+                next_id_ = str(evolutions[evo_id]["pokemon"])
+                next_form_id_ = str(evolutions[evo_id]["form"])
+                _evolution_chain(j, next_id_, next_form_id_, a)
+    else:
+        evolutions = j[id_].get("evolutions")
+        if evolutions is not None:
+            for evo_id in evolutions:
+                if int(evo_id) > 1010:  # block unreleased generations
+                    continue
+
+                evo_form_id = evolutions[evo_id]["form"]
+                a.append((int(evo_id), int(evo_form_id)))
+
+                next_id_ = str(evolutions[evo_id]["pokemon"])
+                _evolution_chain(j, next_id_, "0", a)
+    return a
+
+
+# Return the list of evolution costs depending on the form of the pokemon
+def _evolution_cost_chain(j, id_, form_id_, a=None):
+    if a is None:
+        a = []
+    if form_id_ != "0":
+        evolutions = j[id_]["forms"][form_id_].get("evolutions", {})
+        for evo_id in evolutions:
+            if int(evo_id) > 1010:  # block unreleased generations
+                continue
+
+            candy_cost = int(evolutions[evo_id].get("candyCost", 0))
+            a.append(candy_cost)
+
+            _evolution_cost_chain(
+                j,
+                str(evolutions[evo_id]["pokemon"]),
+                str(evolutions[evo_id]["form"]),
+                a,
+            )
+    else:
+        evolutions = j[id_].get("evolutions", {})
+        for evo_id in evolutions:
+            if int(evo_id) > 1010:  # block unreleased generations
+                continue
+
+            candy_cost = int(evolutions[evo_id].get("candyCost", 0))
+            a.append(candy_cost)
+
+            _evolution_cost_chain(
+                j,
+                str(evolutions[evo_id]["pokemon"]),
+                "0",
+                a,
+            )
+    return a
+
+
+@tables("move_types", "move_damages", "move_dps", "move_durations", "move_energies")
+def build_move_tables(*files):
+    from PokeAlarm.Utils import get_type_id  # Utils depends on this module
+
+    types, damages, dps, durations, energies = {}, {}, {}, {}, {}
+    for j in files:
+        for mv in j:
+            id_ = mv["move_id"]
+            types[id_] = get_type_id(mv["type"])
+            damages[id_] = mv["power"]
+            dps[id_] = round((mv["power"] / mv["duration"]) * 1000, 2)
+            durations[id_] = mv["duration"]
+            energies[id_] = abs(mv["energy_delta"])
+    return {
+        "move_types": types,
+        "move_damages": damages,
+        "move_dps": dps,
+        "move_durations": durations,
+        "move_energies": energies,
+    }
+
+
+@tables("cp_multipliers", "cp_multiplier_squares")
+def build_cp_multiplier_tables(j):
+    multipliers = {float(lvl): j[lvl] for lvl in j}
+    squares = {lvl: multipliers[lvl] ** 2 for lvl in multipliers}
+    return {"cp_multipliers": multipliers, "cp_multiplier_squares": squares}
+
+
+@tables("best_products")
+def build_stat_product_tables(j):
+    best_products = {"great": {}, "ultra": {}}
+    for id_ in j:
+        for form_id_ in j[id_]:
+            key_ = int(id_) * 100_000 + int(form_id_)
+            products = j[id_][form_id_]
+            best_products["great"][key_] = products.get("1500_highest_product")
+            best_products["ultra"][key_] = products.get("2500_highest_product")
+    return {"best_products": best_products}
+
+
+@tables("powerup_costs")
+def build_powerup_cost_tables(j):
+    costs = {}
+    for type_ in j:
+        costs[type_] = []
+        for key in j[type_]:
+            levels = key.split("-")
+            level = float(levels[0])
+            endlevel = float(levels[1])
+            while level <= endlevel:
+                costs[type_].append(int(j[type_][key]))
+                level += 0.5
+    return {"powerup_costs": costs}
+
+
+@tables("weather_boosts")
+def build_weather_boost_tables(j):
+    return {"weather_boosts": {w_id: j[w_id] for w_id in j}}
+
+
+@tables("grunt_genders", "grunt_types", "grunt_names", "grunt_rewards", "grunt_battles")
+def build_invasion_tables(j):
+    from PokeAlarm.Utils import get_type_id  # Utils depends on this module
+
+    genders, types, names, rewards, battles = {}, {}, {}, {}, {}
+    for id_ in j:
+        grunt = j[id_]
+        if grunt["grunt"] == "Male":
+            genders[int(id_)] = 1
+        elif grunt["grunt"] == "Female":
+            genders[int(id_)] = 2
+        else:
+            genders[int(id_)] = 3
+        types[int(id_)] = get_type_id(grunt.get("type"))
+        names[int(id_)] = grunt["grunt"]
+        rewards[int(id_)] = []
+        if "pokemon" in grunt:
+            for i in range(1, 4):
+                battle = grunt["pokemon"][str(i)]
+                if battle["isReward"]:
+                    rewards[int(id_)].extend(battle["ids"])
+                battles[f"{id_}_{i}"] = battle["ids"]
+    return {
+        "grunt_genders": genders,
+        "grunt_types": types,
+        "grunt_names": names,
+        "grunt_rewards": rewards,
+        "grunt_battles": battles,
+    }
+
+
+@tables("shiny_possible")
+def build_shiny_tables(j):
+    shiny = {}
+    for id_form_id_ in j:
+        if "*" not in id_form_id_ and j[id_form_id_] == " \u2728":
+            shiny[id_form_id_] = True
+    return {"shiny_possible": shiny}
+
+
+# Source name -> (data files, builder for the tables of those files)
+_SOURCES = {
+    "pokemon": (["data/pokemon_data.json"], build_pokemon_tables),
+    "moves": (
+        ["data/fast_moves.json", "data/charged_moves.json"],
+        build_move_tables,
+    ),
+    "cp_multipliers": (["data/cp_multipliers.json"], build_cp_multiplier_tables),
+    "stat_products": (["data/stat_products.json"], build_stat_product_tables),
+    "powerup_costs": (["data/powerup_costs.json"], build_powerup_cost_tables),
+    "weather_boosts": (["data/weather_boosts.json"], build_weather_boost_tables),
+    "invasions": (["data/invasions.json"], build_invasion_tables),
+    "shiny_data": (["data/shiny_data.json"], build_shiny_tables),
+}
+
+
+# Returns a dict of table name -> source name
+def _table_sources():
+    if not hasattr(_table_sources, "info"):
+        _table_sources.info = {}
+        for source, (files, builder) in _SOURCES.items():
+            for name in builder.tables:
+                _table_sources.info[name] = source
+    return _table_sources.info
+
+
+game_data = GameData()
@@ -1,11 +1,18 @@
 # Standard Library Imports
 import re
 import logging
+import math
+import os
 import sys
 import traceback
 from collections import OrderedDict
 
 # 3rd Party Imports
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, used to speed up large geofences
+    np = None
+
 # Local Imports
 
 
@@ -15,7 +22,7 @@ log = logging.getLogger("Geofence")
 # Load in a geofence file
 def load_geofence_file(file_path):
     try:
-        geofences = OrderedDict()
+        geofences = Geofences()
         name_pattern = re.compile(r"(?<=\[)([^]]+)(?=\])")
         coor_patter = re.compile(
             r"[-+]?[0-9]*\.?[0-9]*" + r"[ \t]*,[ \t]*" + r"[-+]?[0-9]*\.?[0-9]*"
@@ -42,6 +49,7 @@ def load_geofence_file(file_path):
                 sys.exit(1)
         geofences[name] = Geofence(name, points)
         log.info("Geofence %s added!", name)
+        geofences.build_index()
         return geofences
     except IOError:
         log.error(
@@ -55,13 +63,107 @@ def load_geofence_file(file_path):
     sys.exit(1)
 
 
+# Returns the geofences in a file, shared by everyone loading the same file.
+# The file is only parsed again (and indexed) once it has been modified.
+def get_geofences(file_path):
+    if not hasattr(get_geofences, "cache"):
+        get_geofences.cache = {}
+    path = os.path.realpath(file_path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return load_geofence_file(path)  # Reports the error
+    cached = get_geofences.cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        log.debug("Geofences from %s already loaded.", path)
+        return cached[1]
+    geofences = load_geofence_file(path)
+    get_geofences.cache[path] = (mtime, geofences)
+    return geofences
+
+
+# Raycast from the point at the given X, Y against a list of edges and
+# toggle for every edge it hits
+def raycast(x, y, edges):
+    inside = False
+    for p1x, p1y, p2x, p2y in edges:
+        if min(p1y, p2y) < y <= max(p1y, p2y) and x <= max(p1x, p2x):
+            if p1y != p2y:
+                xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
+            if p1x == p2x or x <= xinters:
+                inside = not inside
+    return inside
+
+
+# Edges stored as contiguous NumPy arrays, so a raycast can test all of
+# them at once. Gives the same results as raycast() down to the last bit.
+class EdgeArrays(object):
+
+    # Chunk of points tested at once by raycast_many
+    CHUNK_SIZE = 1024
+
+    def __init__(self, edges):
+        a = np.array(edges, dtype=np.float64).reshape(-1, 4)
+        self.p1x, self.p1y, self.p2x, self.p2y = (
+            np.ascontiguousarray(a[:, k]) for k in range(4)
+        )
+        self.min_y = np.minimum(self.p1y, self.p2y)
+        self.max_y = np.maximum(self.p1y, self.p2y)
+        self.max_x = np.maximum(self.p1x, self.p2x)
+        self.vertical = self.p1x == self.p2x
+
+    def __len__(self):
+        return len(self.p1x)
+
+    def raycast(self, x, y):
+        hits = np.flatnonzero((self.min_y < y) & (y <= self.max_y) & (x <= self.max_x))
+        if hits.size == 0:
+            return False
+        p1x, p1y = self.p1x[hits], self.p1y[hits]
+        # Edges hit are never horizontal, so there is no division by zero
+        xinters = (y - p1y) * (self.p2x[hits] - p1x) / (self.p2y[hits] - p1y) + p1x
+        return bool(np.count_nonzero(self.vertical[hits] | (x <= xinters)) & 1)
+
+    def raycast_many(self, xs, ys):
+        inside = np.zeros(len(xs), dtype=bool)
+        for start in range(0, len(xs), self.CHUNK_SIZE):
+            x = xs[start : start + self.CHUNK_SIZE, None]
+            y = ys[start : start + self.CHUNK_SIZE, None]
+            hits = (self.min_y < y) & (y <= self.max_y) & (x <= self.max_x)
+            # Horizontal edges divide by zero, but are never hit
+            with np.errstate(divide="ignore", invalid="ignore"):
+                xinters = (y - self.p1y) * (self.p2x - self.p1x) / (
+                    self.p2y - self.p1y
+                ) + self.p1x
+            crossed = hits & (self.vertical | (x <= xinters))
+            inside[start : start + self.CHUNK_SIZE] = (
+                np.count_nonzero(crossed, axis=1) & 1
+            ).astype(bool)
+        return inside
+
+
+# Returns edges in the fastest form to raycast against
+def pack_edges(edges):
+    if np is not None and len(edges) >= Geofence.NUMPY_MIN_EDGES:
+        return EdgeArrays(edges)
+    return tuple(edges)
+
+
 # Geofence object used to determine if points are in a defined range
 class Geofence(object):
 
+    # Geofences with at least this many edges are raycast with NumPy
+    NUMPY_MIN_EDGES = 64
+
     # Initialize the Geofence from a given name and a list of points.
     def __init__(self, name, points):
         self.__name = name
         self.__points = points
+        self.__edges = [
+            (p1[0], p1[1], p2[0], p2[1])
+            for p1, p2 in zip(points, points[1:] + points[:1])
+        ]
+        self.__packed_edges = pack_edges(self.__edges)
 
         self.__min_x = points[0][0]
         self.__max_x = points[0][0]
@@ -75,27 +177,206 @@ class Geofence(object):
             self.__max_y = max(p[1], self.__max_y)
 
     # Returns True if the point at the given X, Y
-    # is inside the polygon, else false
-    def contains(self, x, y):
+    # is inside the polygon, else false. The raycast can be limited to
+    # packed edges spanning Y, which gives the same result.
+    def contains(self, x, y, edges=None):
         # Quick check the boundary box of the entire polygon
         if self.__max_x < x or x < self.__min_x or self.__max_y < y or y < self.__min_y:
             return False
 
         # If it is inside the boundary box, use a raycast
-        # from the line and toggle for every edge it hits
-        inside = False
-        p1x, p1y = self.__points[0]
-        n = len(self.__points)
-        for i in range(1, n + 1):
-            p2x, p2y = self.__points[i % n]
-            if min(p1y, p2y) < y <= max(p1y, p2y) and x <= max(p1x, p2x):
-                if p1y != p2y:
-                    xinters = (y - p1y) * (p2x - p1x) / (p2y - p1y) + p1x
-                if p1x == p2x or x <= xinters:
-                    inside = not inside
-            p1x, p1y = p2x, p2y
-        return inside
+        if edges is None:
+            edges = self.__packed_edges
+        if np is not None and isinstance(edges, EdgeArrays):
+            return edges.raycast(x, y)
+        return raycast(x, y, edges)
+
+    # Returns a list of booleans, True for each of the points at the given
+    # Xs and Ys that is inside the polygon
+    def contains_many(self, xs, ys):
+        if np is None:
+            return [self.contains(x, y) for x, y in zip(xs, ys)]
+        xs = np.asarray(xs, dtype=np.float64)
+        ys = np.asarray(ys, dtype=np.float64)
+        # Quick check the boundary box of the entire polygon
+        in_box = (
+            (self.__min_x <= xs)
+            & (xs <= self.__max_x)
+            & (self.__min_y <= ys)
+            & (ys <= self.__max_y)
+        )
+        inside = np.zeros(len(xs), dtype=bool)
+        box = np.flatnonzero(in_box)
+        if box.size > 0:
+            edges = self.__packed_edges
+            if not isinstance(edges, EdgeArrays):
+                edges = EdgeArrays(edges)
+            inside[box] = edges.raycast_many(xs[box], ys[box])
+        return inside.tolist()
 
     # Returns the name of this geofence
     def get_name(self):
         return self.__name
+
+    # Returns the points of this geofence
+    def get_points(self):
+        return self.__points
+
+    # Returns the edges of this geofence as (x1, y1, x2, y2)
+    def get_edges(self):
+        return self.__edges
+
+    # Returns the boundary box as min_x, max_x, min_y, max_y
+    def get_bounds(self):
+        return self.__min_x, self.__max_x, self.__min_y, self.__max_y
+
+
+# Geofences by name, with an index to find the ones containing a point
+class Geofences(OrderedDict):
+    def __init__(self, *args, **kwargs):
+        self.__index = None
+        super(Geofences, self).__init__(*args, **kwargs)
+
+    def __setitem__(self, key, value):
+        self.__index = None
+        super(Geofences, self).__setitem__(key, value)
+
+    def __delitem__(self, key):
+        self.__index = None
+        super(Geofences, self).__delitem__(key)
+
+    # Builds the index for the current geofences
+    def build_index(self):
+        self.__index = GeofenceIndex(self.values())
+        log.debug(
+            "Geofence index built with %s cells of %.5f degrees.",
+            len(self.__index),
+            self.__index.cell_size,
+        )
+
+    # Returns the set of names of the geofences containing the given X, Y
+    def containing(self, x, y):
+        if self.__index is None:
+            self.build_index()
+        return self.__index.containing(x, y)
+
+
+# Grid over a set of geofences. Each cell lists the geofences that fully
+# contain it and the ones with an edge crossing it, so only the latter
+# need a raycast to find which geofences contain a point. That raycast
+# only looks at the edges spanning the cell's column, right of the cell.
+class GeofenceIndex(object):
+
+    # Upper limit on the number of cells covering the geofences
+    MAX_CELLS = 250000
+
+    def __init__(self, geofences):
+        geofences = list(geofences)
+        self.__size = self.__pick_cell_size(geofences)
+        # Cells are widened by this margin when testing edges, so that float
+        # rounding can't place a point in a cell an edge seemed to miss
+        self.__margin = self.__size * 1e-6
+        cells = {}
+        for gf in geofences:
+            self.__add(cells, gf)
+        self.__cells = {
+            k: (frozenset(inside), tuple(edges)) for k, (inside, edges) in cells.items()
+        }
+
+    def __len__(self):
+        return len(self.__cells)
+
+    @property
+    def cell_size(self):
+        return self.__size
+
+    # Returns the set of names of the geofences containing the given X, Y
+    def containing(self, x, y):
+        cell = self.__cells.get(
+            (math.floor(x / self.__size), math.floor(y / self.__size))
+        )
+        if cell is None:
+            return frozenset()
+        inside, edges = cell
+        if not edges:
+            return inside
+        return inside.union(
+            gf.get_name() for gf, band in edges if gf.contains(x, y, band)
+        )
+
+    def __pick_cell_size(self, geofences):
+        # Aim for a few dozen cells across a typical geofence
+        extents = sorted(
+            max(max_x - min_x, max_y - min_y)
+            for min_x, max_x, min_y, max_y in (gf.get_bounds() for gf in geofences)
+        )
+        size = (extents[len(extents) // 2] if extents else 0) / 32 or 0.001
+        while sum(self.__count_cells(gf, size) for gf in geofences) > self.MAX_CELLS:
+            size *= 2
+        return size
+
+    @staticmethod
+    def __count_cells(gf, size):
+        min_x, max_x, min_y, max_y = gf.get_bounds()
+        rows = math.floor(max_x / size) - math.floor(min_x / size) + 1
+        cols = math.floor(max_y / size) - math.floor(min_y / size) + 1
+        return rows * cols
+
+    def __add(self, cells, gf):
+        size, margin = self.__size, self.__margin
+
+        # Find the cells crossed by the edges of the geofence
+        crossed = set()
+        bands = {}  # Edges spanning each column of cells
+        for edge in gf.get_edges():
+            ax, ay, bx, by = edge
+            for j in range(
+                math.floor((min(ay, by) - margin) / size),
+                math.floor((max(ay, by) + margin) / size) + 1,
+            ):
+                bands.setdefault(j, []).append(edge)
+            for i in range(
+                math.floor((min(ax, bx) - margin) / size),
+                math.floor((max(ax, bx) + margin) / size) + 1,
+            ):
+                for j in range(
+                    math.floor((min(ay, by) - margin) / size),
+                    math.floor((max(ay, by) + margin) / size) + 1,
+                ):
+                    if self.__crosses(ax, ay, bx, by, i, j):
+                        crossed.add((i, j))
+        for i, j in crossed:
+            # A raycast from the cell can't hit edges to the left of it
+            x0 = i * size - margin
+            band = pack_edges([e for e in bands[j] if max(e[0], e[2]) >= x0])
+            cells.setdefault((i, j), ([], []))[1].append((gf, band))
+
+        # Every run of uncrossed cells in a row is entirely inside or outside,
+        # so a single raycast decides the whole run
+        min_x, max_x, min_y, max_y = gf.get_bounds()
+        for i in range(math.floor(min_x / size), math.floor(max_x / size) + 1):
+            inside = None
+            for j in range(math.floor(min_y / size), math.floor(max_y / size) + 1):
+                if (i, j) in crossed:
+                    inside = None
+                    continue
+                if inside is None:
+                    inside = gf.contains((i + 0.5) * size, (j + 0.5) * size)
+                if inside:
+                    cells.setdefault((i, j), ([], []))[0].append(gf.get_name())
+
+    # Returns True if the edge from A to B might cross the cell at I, J
+    def __crosses(self, ax, ay, bx, by, i, j):
+        size, margin = self.__size, self.__margin
+        x0, x1 = i * size - margin, (i + 1) * size + margin
+        y0, y1 = j * size - margin, (j + 1) * size + margin
+        if max(ax, bx) < x0 or x1 < min(ax, bx):
+            return False
+        if max(ay, by) < y0 or y1 < min(ay, by):
+            return False
+        # The edge misses the cell if all corners are on the same side of it
+        sides = [
+            (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+            for cx, cy in ((x0, y0), (x0, y1), (x1, y0), (x1, y1))
+        ]
+        return not (min(sides) > 0 or max(sides) < 0)
@@ -1,11 +1,11 @@
 # Standard Library Imports
 import os
-import json
 import logging
 
 # 3rd Party Imports
 # Local Imports
 from .Utils import get_path, get_raw_form_names
+from .Utilities.JsonUtils import load as json_load
 
 log = logging.getLogger("Locale")
 
@@ -20,11 +20,11 @@ class Locale(object):
         self.name = language
         # Load in English as the default
         with open(os.path.join(get_path("locales"), "en.json")) as f:
-            default = json.loads(f.read())
+            default = json_load(f)
         # Now load in the actual language we want
         # (unnecessary for English but we don't want to discriminate)
         with open(os.path.join(get_path("locales"), f"{language}.json")) as f:
-            info = json.loads(f.read())
+            info = json_load(f)
 
         # Pokemon ID -> Name
         self.__pokemon_names = {}
@@ -16,8 +16,8 @@ from gevent.event import Event
 from . import Alarms
 from . import Filters
 from . import Events
-from .Cache import cache_factory
-from .Geofence import load_geofence_file
+from .Cache import cache_factory, shared_cache
+from .Geofence import get_geofences
 from .Locale import Locale
 from .LocationServices import GMaps
 from PokeAlarm import Unknown
@@ -44,6 +44,7 @@ class Manager(object):
         cache_type,
         geofence_file,
         debug,
+        share_cache=False,
     ):
         # Set the name of the Manager
         self.name = str(name).lower()
@@ -81,6 +82,10 @@ class Manager(object):
 
         # Create cache
         self.__cache = cache_factory(self, cache_type)
+        # Gym details are the same for every Manager, so they can be shared
+        self.__gym_cache = self.__cache
+        if share_cache:
+            self.__gym_cache = shared_cache(cache_type)
 
         # Load and Setup the Pokemon Filters
         self._mons_enabled, self._mon_filters = False, OrderedDict()
@@ -96,7 +101,7 @@ class Manager(object):
         # Create the Geofences to filter with from given file
         self.geofences = None
         if str(geofence_file).lower() != "none":
-            self.geofences = load_geofence_file(get_path(geofence_file))
+            self.geofences = get_geofences(get_path(geofence_file))
         # Create the alarms to send notifications out with
         self._alarms = {}
         self._max_attempts = int(max_attempts)  # TODO: Move to alarm level
@@ -111,6 +116,9 @@ class Manager(object):
         self.__quest_rules = {}
         self.__grunt_rules = {}
 
+        # Values an event must have for any rule to pass (None for any value)
+        self.__prefilters = {}
+
         # Initialize the queue and start the process
         self.__queue = Queue()
         self.__event = Event()
@@ -122,6 +130,10 @@ class Manager(object):
     def update(self, obj):
         self.__queue.put(obj)
 
+    # Update a list of objects into the queue as a single item
+    def update_batch(self, objs):
+        self.__queue.put(objs)
+
     # Get the name of this Manager
     def get_name(self):
         return self.name
@@ -261,6 +273,14 @@ class Manager(object):
         self._mon_filters[name] = f
         self._log.debug("Monster filter '%s' set: %s", name, f)
 
+    # Returns the ids of monsters listed in Monster Filters
+    def get_filtered_monster_ids(self):
+        ids = set()
+        for f in self._mon_filters.values():
+            if f.monster_ids is not None:
+                ids.update(f.monster_ids)
+        return ids
+
     # Enable/Disable Stops notifications
     def set_stops_enabled(self, boolean):
         self._stops_enabled = parse_bool(boolean)
@@ -565,10 +585,57 @@ class Manager(object):
 
     # Start it up
     def start(self):
+        self.build_prefilters()
         self.__process = gevent.spawn(self.run)
 
-    def setup_in_process(self):
+    def build_prefilters(self):
+        """Index the values that the filters in use can possibly pass."""
+        self.__prefilters = {
+            "monster": self._prefilter_values(
+                self._mon_filters, self.__mon_rules, "monster_id"
+            ),
+            "egg": self._prefilter_values(
+                self._egg_filters, self.__egg_rules, "egg_lvl"
+            ),
+            "raid": self._prefilter_values(
+                self._raid_filters, self.__raid_rules, "mon_id"
+            ),
+            "quest": self._prefilter_values(
+                self._quest_filters, self.__quest_rules, "monster_id"
+            ),
+            "grunt": self._prefilter_values(
+                self._grunt_filters, self.__grunt_rules, "grunt_type_id"
+            ),
+        }
+        for kind, values in self.__prefilters.items():
+            if values is not None:
+                self._log.debug(
+                    "Prefiltering %s events on %s value(s).", kind, len(values)
+                )
 
+    @staticmethod
+    def _prefilter_values(filter_set, rules, attr_name):
+        """Returns the values of `attr_name` any rule could pass, or None."""
+        if len(rules) == 0:  # If no rules, default to all
+            names = filter_set.keys()
+        else:
+            names = set(n for rule in rules.values() for n in rule.filter_names)
+        allowed = set()
+        for name in names:
+            values = filter_set[name].index_values(attr_name)
+            if values is None:
+                return None  # Any value could pass this filter
+            allowed |= values
+        return frozenset(allowed)
+
+    def _prefilter_rejects(self, kind, value):
+        """Returns True if no filter could ever pass an event with `value`."""
+        allowed = self.__prefilters.get(kind)
+        if allowed is None or Unknown.is_(value):
+            return False
+        return value not in allowed
+
+    def setup_in_process(self):
         # Update config
         config["DEBUG"] = self.__debug
         config["ROOT_PATH"] = os.path.abspath(f"{os.path.dirname(__file__)}/..")
@@ -590,16 +657,16 @@ class Manager(object):
         self.setup_in_process()
         last_clean = datetime.utcnow()
         while True:  # Run forever and ever
-
             # Clean out visited every 5 minutes
             if datetime.utcnow() - last_clean > timedelta(minutes=5):
                 self._log.debug("Cleaning cache...")
                 self.__cache.clean_and_save()
+                if self.__gym_cache is not self.__cache:
+                    self.__gym_cache.clean_and_save()
                 last_clean = datetime.utcnow()
 
-            try:  # Get next object to process
-                event = self.__queue.get(block=True, timeout=5)
-                event.update_with_cache(self.__cache)
+            try:  # Get next object (or batch of objects) to process
+                item = self.__queue.get(block=True, timeout=5)
             except gevent.queue.Empty:
                 # Check if the process should exit process
                 if self.__event.is_set():
@@ -608,39 +675,50 @@ class Manager(object):
                 gevent.sleep(0)
                 continue
 
-            try:
-                kind = type(event)
-                self._log.debug("Processing event: %s", event.id)
-                if kind == Events.MonEvent:
-                    self.process_monster(event)
-                elif kind == Events.StopEvent:
-                    self.process_stop(event)
-                elif kind == Events.GruntEvent:
-                    self.process_grunt(event)
-                elif kind == Events.GymEvent:
-                    self.process_gym(event)
-                elif kind == Events.EggEvent:
-                    self.process_egg(event)
-                elif kind == Events.RaidEvent:
-                    self.process_raid(event)
-                elif kind == Events.WeatherEvent:
-                    self.process_weather(event)
-                elif kind == Events.QuestEvent:
-                    self.process_quest(event)
-                else:
-                    self._log.error("!!! Manager does not support %s events!", kind)
-                self._log.debug("Finished event: %s", event.id)
-            except Exception as e:
-                self._log.error(
-                    "Encountered error during processing: %s: %s", type(e).__name__, e
-                )
-                self._log.error("Stack trace: \n %s", traceback.format_exc())
-            # Explict context yield
-            gevent.sleep(0)
+            events = item if isinstance(item, list) else [item]
+            for event in events:
+                self.process_event(event)
+                # Explict context yield, so batches don't block other greenlets
+                gevent.sleep(0)
         # Save cache and exit
-        self.__cache.clean_and_save()
+        self.__cache.clean_and_save(wait=True)
+        if self.__gym_cache is not self.__cache:
+            self.__gym_cache.clean_and_save(wait=True)
         raise gevent.GreenletExit()
 
+    # Dispatch an event to the matching process function
+    def process_event(self, event):
+        try:
+            kind = type(event)
+            # Keep what this Manager sets on the event to itself
+            event = event.view()
+            event.update_with_cache(self.__cache)
+            self._log.debug("Processing event: %s", event.id)
+            if kind == Events.MonEvent:
+                self.process_monster(event)
+            elif kind == Events.StopEvent:
+                self.process_stop(event)
+            elif kind == Events.GruntEvent:
+                self.process_grunt(event)
+            elif kind == Events.GymEvent:
+                self.process_gym(event)
+            elif kind == Events.EggEvent:
+                self.process_egg(event)
+            elif kind == Events.RaidEvent:
+                self.process_raid(event)
+            elif kind == Events.WeatherEvent:
+                self.process_weather(event)
+            elif kind == Events.QuestEvent:
+                self.process_quest(event)
+            else:
+                self._log.error("!!! Manager does not support %s events!", kind)
+            self._log.debug("Finished event: %s", event.id)
+        except Exception as e:
+            self._log.error(
+                "Encountered error during processing: %s: %s", type(e).__name__, e
+            )
+            self._log.error("Stack trace: \n %s", traceback.format_exc())
+
     # Set the location of the Manager
     def set_location(self, location):
         # Regex for Lat,Lng coordinate
@@ -710,6 +788,8 @@ class Manager(object):
             if not alarm:
                 self._log.critical("ERROR: No alarm named %s found!", name)
                 continue
+            # Compute the DTS the alarm uses before the alarms run concurrently
+            dts.compute(alarm.dts_keys)
             func = getattr(alarm, func_name)
             threads.append(gevent.spawn(func, dts))
 
@@ -728,18 +808,23 @@ class Manager(object):
 
         # Set the name for this event so we can log rejects better
         mon.name = self.__locale.get_pokemon_name(mon.monster_id)
+
+        # Skip monsters that no filter could pass
+        if self._prefilter_rejects("monster", mon.monster_id):
+            self._log.debug("%s monster ignored: no filter for this monster.", mon.name)
+            return
+
         boosted_status = int(
             is_weather_boosted(mon.weather_id, mon.monster_id, mon.form_id)
         )
 
         # Check if previously processed and update expiration
         monster_cache_id = f"{mon.enc_id}{mon.weight}{boosted_status}"
-        if self.__cache.monster_expiration(monster_cache_id) is not None:
+        if self.__cache.processed("monster", monster_cache_id, mon.disappear_time):
             self._log.debug(
                 "%s monster was skipped because it was previously processed.", mon.name
             )
             return
-        self.__cache.monster_expiration(monster_cache_id, mon.disappear_time)
 
         # Check the time remaining
         seconds_left = (mon.disappear_time - datetime.utcnow()).total_seconds()
@@ -797,12 +882,11 @@ class Manager(object):
 
         # Check if previously processed and update expiration
         stop_cache_id = f"{stop.stop_id}{stop.lure_type_id}"
-        if self.__cache.stop_expiration(stop_cache_id) is not None:
+        if self.__cache.processed("stop", stop_cache_id, stop.expiration):
             self._log.debug(
                 "Stop %s was skipped because it was previously processed.", stop.name
             )
             return
-        self.__cache.stop_expiration(stop_cache_id, stop.expiration)
 
         # Check the time remaining
         seconds_left = (stop.expiration - datetime.utcnow()).total_seconds()
@@ -858,15 +942,21 @@ class Manager(object):
             self._log.debug("Invasion ignored: stop was not invaded")
             return
 
+        # Skip invasions that no filter could pass
+        if self._prefilter_rejects("grunt", grunt.grunt_type_id):
+            self._log.debug(
+                "Invasion %s ignored: no filter for this grunt.", grunt.name
+            )
+            return
+
         # Check if previously processed and update expiration
         grunt_cache_id = f"{grunt.stop_id}{grunt.grunt_type_id}"
-        if self.__cache.grunt_expiration(grunt_cache_id) is not None:
+        if self.__cache.processed("grunt", grunt_cache_id, grunt.expiration):
             self._log.debug(
                 "Invasion %s was skipped because it was previously processed.",
                 grunt.name,
             )
             return
-        self.__cache.grunt_expiration(grunt_cache_id, grunt.expiration)
 
         # Check the time remaining
         seconds_left = (grunt.expiration - datetime.utcnow()).total_seconds()
@@ -913,9 +1003,9 @@ class Manager(object):
         """Process a gym event and notify alarms if it passes."""
 
         # Update Gym details (if they exist)
-        gym.gym_name = self.__cache.gym_name(gym.gym_id, gym.gym_name)
-        gym.gym_description = self.__cache.gym_desc(gym.gym_id, gym.gym_description)
-        gym.gym_image = self.__cache.gym_image(gym.gym_id, gym.gym_image)
+        gym.gym_name = self.__gym_cache.gym_name(gym.gym_id, gym.gym_name)
+        gym.gym_description = self.__gym_cache.gym_desc(gym.gym_id, gym.gym_description)
+        gym.gym_image = self.__gym_cache.gym_image(gym.gym_id, gym.gym_image)
 
         # Ignore changes to neutral
         if self._ignore_neutral and gym.new_team_id == 0:
@@ -972,9 +1062,9 @@ class Manager(object):
         """Process a egg event and notify alarms if it passes."""
 
         # Update Gym details (if they exist)
-        egg.gym_name = self.__cache.gym_name(egg.gym_id, egg.gym_name)
-        egg.gym_description = self.__cache.gym_desc(egg.gym_id, egg.gym_description)
-        egg.gym_image = self.__cache.gym_image(egg.gym_id, egg.gym_image)
+        egg.gym_name = self.__gym_cache.gym_name(egg.gym_id, egg.gym_name)
+        egg.gym_description = self.__gym_cache.gym_desc(egg.gym_id, egg.gym_description)
+        egg.gym_image = self.__gym_cache.gym_image(egg.gym_id, egg.gym_image)
 
         # Update Team if Unknown
         if Unknown.is_(egg.current_team_id):
@@ -985,13 +1075,17 @@ class Manager(object):
             self._log.debug("Egg ignored: egg notifications are disabled.")
             return
 
+        # Skip eggs that no filter could pass
+        if self._prefilter_rejects("egg", egg.egg_lvl):
+            self._log.debug("Egg %s ignored: no filter for this level.", egg.name)
+            return
+
         # Skip if previously processed
-        if self.__cache.egg_expiration(egg.gym_id) is not None:
+        if self.__cache.processed("egg", egg.gym_id, egg.hatch_time):
             self._log.debug(
                 "Egg %s was skipped because it was previously processed.", egg.name
             )
             return
-        self.__cache.egg_expiration(egg.gym_id, egg.hatch_time)
 
         # Check the time remaining
         seconds_left = (egg.hatch_time - datetime.utcnow()).total_seconds()
@@ -1038,9 +1132,11 @@ class Manager(object):
         """Process a raid event and notify alarms if it passes."""
 
         # Update Gym details (if they exist)
-        raid.gym_name = self.__cache.gym_name(raid.gym_id, raid.gym_name)
-        raid.gym_description = self.__cache.gym_desc(raid.gym_id, raid.gym_description)
-        raid.gym_image = self.__cache.gym_image(raid.gym_id, raid.gym_image)
+        raid.gym_name = self.__gym_cache.gym_name(raid.gym_id, raid.gym_name)
+        raid.gym_description = self.__gym_cache.gym_desc(
+            raid.gym_id, raid.gym_description
+        )
+        raid.gym_image = self.__gym_cache.gym_image(raid.gym_id, raid.gym_image)
 
         # Update Team if Unknown
         if Unknown.is_(raid.current_team_id):
@@ -1051,13 +1147,17 @@ class Manager(object):
             self._log.debug("Raid ignored: raid notifications are disabled.")
             return
 
+        # Skip raids that no filter could pass
+        if self._prefilter_rejects("raid", raid.mon_id):
+            self._log.debug("Raid %s ignored: no filter for this monster.", raid.name)
+            return
+
         # Skip if previously processed
-        if self.__cache.raid_expiration(raid.gym_id) is not None:
+        if self.__cache.processed("raid", raid.gym_id, raid.raid_end):
             self._log.debug(
                 "Raid %s was skipped because it was previously processed.", raid.name
             )
             return
-        self.__cache.raid_expiration(raid.gym_id, raid.raid_end)
 
         # Check the time remaining
         seconds_left = (raid.raid_end - datetime.utcnow()).total_seconds()
@@ -1216,6 +1316,11 @@ class Manager(object):
             quest.stop_id, quest.reward_type_raw, quest.quest_type_raw
         )
 
+        # Skip quests that no filter could pass
+        if self._prefilter_rejects("quest", quest.monster_id):
+            self._log.debug("Quest %s ignored: no filter for this reward.", quest.name)
+            return
+
         # Check for Rules
         rules = self.__quest_rules
         if len(rules) == 0:  # If no rules, default to all
@@ -0,0 +1,131 @@
+# Standard Library Imports
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+
+# 3rd Party Imports
+import gevent
+from gevent.queue import Full, Queue
+
+# Local Imports
+from PokeAlarm.Utilities import JsonUtils
+
+log = logging.getLogger("pokealarm.webserver")
+
+
+class ManagerProcess(object):
+    """Runs a group of Managers in a separate OS process.
+
+    The child process is a copy of the running script that only builds the
+    Managers assigned to its group. Webhook request bodies are fed to it
+    over a socket pair as they were received, each after a line with its
+    length. They are queued and written by a greenlet of their own, so a
+    slow child process doesn't hold up the webserver or the other groups.
+    """
+
+    MAX_QUEUED = 1000  # Request bodies waiting to be sent, others are dropped
+
+    def __init__(self, group):
+        self.group = group
+        self._sock = None
+        self._proc = None
+        self._queue = Queue(self.MAX_QUEUED)
+        self._writer = None
+
+    def start(self, script, argv):
+        """Start the child process running `script` with the given args."""
+        self._sock, child_sock = socket.socketpair()
+        child_fd = child_sock.fileno()
+        args = [sys.executable, script] + argv
+        args += ["--worker-group", self.group, "--worker-fd", str(child_fd)]
+        self._proc = subprocess.Popen(args, pass_fds=(child_fd,))
+        child_sock.close()
+        self._writer = gevent.spawn(self._write)
+        log.info(
+            "Started process %s for manager group '%s'.", self._proc.pid, self.group
+        )
+
+    def send(self, body):
+        """Queue a json encoded webhook request body for the child process."""
+        try:
+            self._queue.put_nowait(body)
+        except Full:
+            log.warning(
+                "Queue of manager group '%s' is full! Dropping webhook request.",
+                self.group,
+            )
+
+    def _write(self):
+        """Send the queued request bodies until stopped, then close the feed."""
+        while True:
+            body = self._queue.get()
+            if body is None:  # Stopped
+                break
+            try:
+                self._sock.sendall(b"%d\n" % len(body) + body)
+            except OSError as e:
+                log.error(
+                    "Unable to send data to manager group '%s': %s: %s",
+                    self.group,
+                    type(e).__name__,
+                    e,
+                )
+        self._sock.close()
+
+    def stop(self):
+        """Close the feed once sent, which tells the child process to finish up."""
+        log.info("Manager group '%s' shutting down...", self.group)
+        try:
+            self._queue.put_nowait(None)
+        except Full:  # Not sending the rest to a child process this far behind
+            self._writer.kill(block=False)
+            self._sock.close()
+
+    def join(self, timeout=30):
+        self._writer.join(timeout=timeout)
+        if not self._writer.dead:  # Child process not reading its feed
+            self._writer.kill(block=False)
+            self._sock.close()
+        try:
+            self._proc.wait(timeout=timeout)
+            log.info("Manager group '%s' successfully stopped!", self.group)
+        except subprocess.TimeoutExpired:
+            log.warning(
+                "Manager group '%s' could not be stopped in time! "
+                "Forcing process to stop.",
+                self.group,
+            )
+            self._proc.send_signal(signal.SIGKILL)
+            self._proc.wait()
+
+
+def read_frames(fd, _queue, batch=False):
+    """Read frames sent by a ManagerProcess and put them into the queue.
+
+    Returns once the parent process closes the feed.
+    """
+    sock = socket.socket(fileno=fd)
+    with sock.makefile("rb") as f:
+        for line in f:
+            body = f.read(int(line))
+            try:
+                frames = JsonUtils.loads(body)
+            except ValueError as e:
+                log.error(
+                    "Encountered error while reading frames: (%s: %s)",
+                    type(e).__name__,
+                    e,
+                )
+                continue
+            if isinstance(frames, dict):  # older webhook style
+                frames = [frames]
+            if batch:
+                _queue.put(frames)
+            else:
+                for frame in frames:
+                    _queue.put(frame)
+    sock.close()
+    log.debug("Feed closed for process %s.", os.getpid())
@@ -1,10 +1,10 @@
 # Standard Library Imports
 from glob import glob
-import json
 import re
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 from PokeAlarm.Utils import get_path
 
 
@@ -18,7 +18,7 @@ def get_team_id(team_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["teams"]
                     for id_ in j:
                         nm = j[id_].lower()
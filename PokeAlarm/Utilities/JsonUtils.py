@@ -0,0 +1,68 @@
+# Standard Library Imports
+import json
+import logging
+
+# 3rd Party Imports
+# Local Imports
+
+log = logging.getLogger("JsonUtils")
+
+json_backend_options = ["auto", "orjson", "ujson", "json"]
+
+
+def _import_loads(name):
+    """Returns the loads function for the given backend, or None."""
+    if name == "json":
+        return json.loads
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return module.loads
+
+
+def get_json_backends():
+    """Returns a dict of name -> loads for every installed backend."""
+    backends = {}
+    for name in json_backend_options[1:]:
+        loads_ = _import_loads(name)
+        if loads_ is not None:
+            backends[name] = loads_
+    return backends
+
+
+def set_json_backend(name="auto"):
+    """Selects the JSON decoder used by loads() and load()."""
+    if name not in json_backend_options:
+        raise ValueError(f"{name} is not a valid json backend!")
+    candidates = json_backend_options[1:] if name == "auto" else [name]
+    for candidate in candidates:
+        loads_ = _import_loads(candidate)
+        if loads_ is not None:
+            break
+        if name != "auto":
+            log.warning("Json backend '%s' is not installed.", candidate)
+    else:
+        candidate, loads_ = "json", json.loads
+    set_json_backend.name = candidate
+    set_json_backend.loads = loads_
+    log.debug("Json backend set to '%s'.", candidate)
+    return candidate
+
+
+def get_json_backend():
+    """Returns the name of the JSON decoder in use."""
+    return set_json_backend.name
+
+
+def loads(data):
+    """Decodes a str or bytes JSON document with the selected backend."""
+    return set_json_backend.loads(data)
+
+
+def load(f):
+    """Decodes a JSON document from a file with the selected backend."""
+    return set_json_backend.loads(f.read())
+
+
+set_json_backend()
@@ -1,9 +1,10 @@
 # Standard Library Imports
 from glob import glob
-import json
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.GameData import game_data
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 from PokeAlarm.Utils import get_path
 
 
@@ -17,7 +18,7 @@ def get_monster_id(pokemon_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["pokemon"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -41,7 +42,7 @@ def get_move_id(move_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["moves"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -65,7 +66,7 @@ def get_size_id(size_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["sizes"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -89,7 +90,7 @@ def get_type_id(type_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["types"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -113,7 +114,7 @@ def get_rarity_id(rarity_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["rarity"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -141,16 +142,7 @@ def get_pokemon_gender(gender):
 
 # Returns True if the pokemon is shiny in the wild
 def get_shiny_status(pokemon_id, form_id):
-    if not hasattr(get_shiny_status, "info"):
-        get_shiny_status.info = {}
-        file_ = get_path("data/shiny_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_form_id_ in j:
-            if "*" not in id_form_id_ and j[id_form_id_] == " \u2728":
-                get_shiny_status.info[id_form_id_] = True
-
-    return get_shiny_status.info.get(
-        f"{pokemon_id}", False
-    ) or get_shiny_status.info.get(f"{pokemon_id}_{form_id}", False)
+    shiny = game_data.shiny_possible
+    return shiny.get(f"{pokemon_id}", False) or shiny.get(
+        f"{pokemon_id}_{form_id}", False
+    )
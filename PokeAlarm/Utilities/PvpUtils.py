@@ -1,10 +1,195 @@
-import PokeAlarm.Utils as utils
 import logging
+import time
+from bisect import bisect_right
+from itertools import product
+
+import PokeAlarm.Utils as utils
+from PokeAlarm.GameData import game_data
+from PokeAlarm.Utilities.GenUtils import LRUCache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 log = logging.getLogger("PvpUtils")
 
+PVP_CACHE_SIZE = 50000
+RANK_TABLE_CACHE_SIZE = 512
+LEAGUES = (1500, 2500)
+
+# (monster_id, form_id, atk, de, sta, lvl) -> get_pvp_info result
+_pvp_info = LRUCache(PVP_CACHE_SIZE)
+# (limit, monster_id, form_id) -> RankTable
+_rank_tables = LRUCache(RANK_TABLE_CACHE_SIZE)
+# (limit, monster_id, form_id) -> RankTable, never evicted
+_precomputed = {}
+
+# Levels a monster can be powered up to, 0 when no level fits the limit
+LEVELS = (0,) + tuple(x / 10 for x in range(10, 500, 5)) + (50,)
+
+
+class RankTable(object):
+    """Best level, CP, stat product and rank of every IV spread of a monster
+    form in a league. Spreads are indexed by `atk * 256 + de * 16 + sta`.
+    """
+
+    def __init__(self, levels, cps, products):
+        self.levels = levels  # Index in LEVELS
+        self.cps = cps
+        self.products = products
+        if np is not None and isinstance(products, np.ndarray):
+            ordered = np.sort(products)
+            self.ranks = (
+                len(products) + 1 - np.searchsorted(ordered, products, side="right")
+            ).astype(np.uint16)
+        else:
+            ordered = sorted(products)
+            self.ranks = [
+                len(products) + 1 - bisect_right(ordered, p) for p in products
+            ]
+        self.best_product = float(ordered[-1])
+
+    def rating(self, atk, de, sta):
+        """Returns the (product, cp, level) of a spread like calculate_rating."""
+        i = atk * 256 + de * 16 + sta
+        return float(self.products[i]), int(self.cps[i]), LEVELS[self.levels[i]]
+
+    def rank(self, atk, de, sta):
+        """Returns the rank of a spread, 1 being the highest stat product."""
+        return int(self.ranks[atk * 256 + de * 16 + sta])
+
+    @classmethod
+    def build(cls, limit, monster_id, form_id):
+        if np is None:
+            levels, cps, products = [], [], []
+            for atk, de, sta in product(range(16), repeat=3):
+                p, cp, level = calculate_rating(
+                    limit, monster_id, form_id, atk, de, sta
+                )
+                levels.append(LEVELS.index(level))
+                cps.append(cp)
+                products.append(p)
+            return cls(levels, cps, products)
+
+        # Same operations as calculate_rating, for all spreads at once
+        base_stats = utils.get_base_stats(monster_id, form_id)
+        multipliers = utils.get_cp_multipliers()
+        multiplier_squares = utils.get_cp_multiplier_squares()
+        ivs = np.arange(16, dtype=np.float64)
+        atk = np.repeat(ivs, 256)
+        de = np.tile(np.repeat(ivs, 16), 16)
+        sta = np.tile(ivs, 256)
+        cp_base = (
+            (base_stats["attack"] + atk)
+            * np.sqrt(base_stats["defense"] + de)
+            * np.sqrt(base_stats["stamina"] + sta)
+            / 10
+        )
+        squares = np.array([0.0] + [multiplier_squares[lvl] for lvl in LEVELS[1:]])
+
+        # Binary search over levels 1 to 49.5, see utils.bisect_levels
+        n = len(cp_base)
+        first = np.ones(n, dtype=np.int64)
+        last = np.full(n, len(LEVELS) - 2, dtype=np.int64)
+        best = np.zeros(n, dtype=np.int64)
+        best_cp = np.zeros(n, dtype=np.int64)
+        active = first <= last
+        while active.any():
+            mid = (first + last) // 2
+            cp = np.maximum(10, (cp_base * squares[mid]).astype(np.int64))
+            fits = active & (cp <= limit)
+            last = np.where(active & ~fits, mid - 1, last)
+            first = np.where(fits, mid + 1, first)
+            best = np.where(fits, mid, best)
+            best_cp = np.where(fits, cp, best_cp)
+            # Stop once the exact limit is found
+            active = (first <= last) & ~(fits & (cp == limit))
+
+        max_cp = (cp_base * squares[-1]).astype(np.int64)
+        max_level = max_cp <= limit
+        best = np.where(max_level, len(LEVELS) - 1, best)
+        best_cp = np.where(max_level, max_cp, best_cp)
+
+        factors = np.array([0.0] + [multipliers[lvl] for lvl in LEVELS[1:]])[best]
+        attack = (base_stats["attack"] + atk) * factors
+        defense = (base_stats["defense"] + de) * factors
+        stamina = np.floor((base_stats["stamina"] + sta) * factors)
+        products = attack * defense * stamina
+
+        none = (cp_base == 0) | (best == 0)
+        return cls(
+            np.where(none, 0, best).astype(np.uint8),
+            np.where(none, 0, best_cp).astype(np.uint16),
+            np.where(none, 0.0, products),
+        )
+
+
+def rank_table(limit, monster_id, form_id):
+    """Returns the RankTable of a monster form for a league CP limit."""
+    key = (limit, monster_id, form_id)
+    table = _precomputed.get(key)
+    if table is None:
+        table = _rank_tables.get(key)
+        if table is None:
+            table = RankTable.build(limit, monster_id, form_id)
+            _rank_tables[key] = table
+    return table
+
+
+def has_rank_table(limit, monster_id, form_id):
+    # Without NumPy, building tables is only fast enough to do up front
+    return np is not None or (limit, monster_id, form_id) in _precomputed
+
+
+def set_cache_size(size):
+    """Sets the number of PvP results kept, 0 disables the cache."""
+    _pvp_info.resize(size)
+
+
+def cache_stats():
+    stats = _pvp_info.stats()
+    stats["rank_tables"] = len(_rank_tables)
+    stats["precomputed"] = len(_precomputed)
+    return stats
+
+
+def precompute_ratings(monster_ids):
+    """Builds the rank tables of the given monsters for both leagues.
+
+    Covers all forms of each monster and their evolutions.
+    """
+    start = time.perf_counter()
+    mons = set()
+    for monster_id in monster_ids:
+        for form_id in game_data.form_names.get(monster_id, {0: None}):
+            mons.add((monster_id, form_id))
+            mons.update(utils.get_evolutions(monster_id, form_id))
+    for monster_id, form_id in mons:
+        for limit in LEAGUES:
+            key = (limit, monster_id, form_id)
+            if key not in _precomputed:
+                _precomputed[key] = RankTable.build(*key)
+    log.info(
+        "Precomputed PvP ratings of %s monster forms in %.2fs.",
+        len(mons),
+        time.perf_counter() - start,
+    )
+
 
 def pokemon_rating(limit, monster_id, form_id, atk, de, sta):
+    if has_rank_table(limit, monster_id, form_id):
+        return rank_table(limit, monster_id, form_id).rating(atk, de, sta)
+    return calculate_rating(limit, monster_id, form_id, atk, de, sta)
+
+
+def pokemon_rank(limit, monster_id, form_id, atk, de, sta, default=None):
+    if has_rank_table(limit, monster_id, form_id):
+        return rank_table(limit, monster_id, form_id).rank(atk, de, sta)
+    return default
+
+
+def calculate_rating(limit, monster_id, form_id, atk, de, sta):
     multipliers = utils.get_cp_multipliers()
     multiplier_squares = utils.get_cp_multiplier_squares()
     base_stats = utils.get_base_stats(monster_id, form_id)
@@ -28,6 +213,15 @@ def pokemon_rating(limit, monster_id, form_id, atk, de, sta):
 
 
 def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
+    key = (monster_id, form_id, atk, de, sta, lvl)
+    info = _pvp_info.get(key)
+    if info is None:
+        info = calculate_pvp_info(monster_id, form_id, atk, de, sta, lvl)
+        _pvp_info[key] = info
+    return info
+
+
+def calculate_pvp_info(monster_id, form_id, atk, de, sta, lvl):
     lvl = float(lvl)
 
     best_great_product = utils.get_best_great_product(monster_id, form_id)
@@ -42,7 +236,7 @@ def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
     great_rating = (
         0 if best_great_product == 0 else 100 * (great_product / best_great_product)
     )
-    great_id = monster_id
+    great_id, great_form = monster_id, form_id
     great_candy = utils.calculate_candy_cost(lvl, great_level)
     great_stardust = utils.calculate_stardust_cost(lvl, great_level)
 
@@ -52,7 +246,7 @@ def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
     ultra_rating = (
         0 if best_ultra_product == 0 else 100 * (ultra_product / best_ultra_product)
     )
-    ultra_id = monster_id
+    ultra_id, ultra_form = monster_id, form_id
     ultra_candy = utils.calculate_candy_cost(lvl, ultra_level)
     ultra_stardust = utils.calculate_stardust_cost(lvl, ultra_level)
 
@@ -91,7 +285,7 @@ def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
             great_rating = evo_great
             great_cp = evo_great_cp
             great_level = evo_great_level
-            great_id = evo_id
+            great_id, great_form = evo_id, evo_form_id
             evo_candy_cost = utils.calculate_evolution_cost(
                 monster_id, evo_id, evolutions, evolution_costs
             )
@@ -102,7 +296,7 @@ def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
             ultra_rating = evo_ultra
             ultra_cp = evo_ultra_cp
             ultra_level = evo_ultra_level
-            ultra_id = evo_id
+            ultra_id, ultra_form = evo_id, evo_form_id
             evo_candy_cost = utils.calculate_evolution_cost(
                 monster_id, evo_id, evolutions, evolution_costs
             )
@@ -122,4 +316,6 @@ def get_pvp_info(monster_id, form_id, atk, de, sta, lvl):
         ultra_level,
         ultra_candy,
         ultra_stardust,
+        pokemon_rank(1500, great_id, great_form, atk, de, sta, utils.Unknown.SMALL),
+        pokemon_rank(2500, ultra_id, ultra_form, atk, de, sta, utils.Unknown.SMALL),
     )
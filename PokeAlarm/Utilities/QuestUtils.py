@@ -1,9 +1,9 @@
 # Standard Library Imports
 from glob import glob
-import json
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 from PokeAlarm.Utils import get_path
 
 
@@ -16,7 +16,7 @@ def get_reward_type(reward_type):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["quest_reward_types"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -59,7 +59,7 @@ def get_item_id(item_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["items"]
                     for id_ in j:
                         nm = j[id_].lower()
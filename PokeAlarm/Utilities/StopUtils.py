@@ -1,9 +1,9 @@
 # Standard Library Imports
 from glob import glob
-import json
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 from PokeAlarm.Utils import get_path
 
 
@@ -17,7 +17,7 @@ def get_lure_id(lure_name):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["lure_types"]
                     for id_ in j:
                         nm = j[id_].lower()
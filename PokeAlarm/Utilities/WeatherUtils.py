@@ -1,9 +1,9 @@
 # Standard Library Imports
 from glob import glob
-import json
 
 # 3rd Party Imports
 # Local Imports
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 from PokeAlarm.Utils import get_path
 
 
@@ -15,7 +15,7 @@ def get_severity_id(severity):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["severity"]
                     for id_ in j:
                         nm = j[id_].lower()
@@ -38,7 +38,7 @@ def get_day_or_night_id(day_or_night):
             files = glob(get_path("locales/*.json"))
             for file_ in files:
                 with open(file_, "r") as f:
-                    j = json.loads(f.read())
+                    j = json_load(f)
                     j = j["day_or_night"]
                     for id_ in j:
                         nm = j[id_].lower()
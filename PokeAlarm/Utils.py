@@ -2,10 +2,10 @@
 # Standard Library Imports
 from datetime import datetime, timedelta
 from glob import glob
-import json
 import logging
 from math import radians, sin, cos, atan2, sqrt, degrees
 import os
+import re
 import sys
 import hashlib
 import hmac
@@ -20,6 +20,8 @@ from s2cell import s2cell
 from PokeAlarm import not_so_secret_url
 from PokeAlarm import config
 from PokeAlarm import Unknown
+from PokeAlarm.GameData import game_data
+from PokeAlarm.Utilities.JsonUtils import load as json_load
 
 log = logging.getLogger("Utils")
 
@@ -34,6 +36,24 @@ def contains_arg(line, args):
     return False
 
 
+# Matches the <dts> substitutions in a line
+DTS_PATTERN = re.compile(r"<([^<>]+)>")
+
+
+# Returns the set of DTS used by the lines in settings (a string, or dicts
+# and lists of them)
+def get_dts_keys(settings):
+    if isinstance(settings, str):
+        return set(DTS_PATTERN.findall(settings))
+    if isinstance(settings, dict):
+        settings = list(settings.values())
+    keys = set()
+    if isinstance(settings, (list, tuple)):
+        for value in settings:
+            keys.update(get_dts_keys(value))
+    return keys
+
+
 def get_path(path):
     if not os.path.isabs(path):  # If not absolute path
         path = os.path.join(config["ROOT_PATH"], path)
@@ -98,7 +118,7 @@ def get_pkmn_id(pokemon_name):
         files = glob(get_path("locales/*.json"))
         for file_ in files:
             with open(file_, "r") as f:
-                j = json.load(f)
+                j = json_load(f)
                 f.close()
             j = j["pokemon"]
             for id_ in j:
@@ -118,7 +138,7 @@ def get_move_id(move_name):
         files = glob(get_path("locales/*.json"))
         for file_ in files:
             with open(file_, "r") as f:
-                j = json.load(f)
+                j = json_load(f)
                 f.close()
             j = j["moves"]
             for id_ in j:
@@ -139,7 +159,7 @@ def get_team_id(team_name):
         files = glob(get_path("locales/*.json"))
         for file_ in files:
             with open(file_, "r") as f:
-                j = json.load(f)
+                j = json_load(f)
                 f.close()
             j = j["teams"]
             for id_ in j:
@@ -158,7 +178,7 @@ def get_type_id(type_name):
         get_type_id.info = {}
         file_ = get_path("locales/en.json")
         with open(file_, "r") as f:
-            j = json.load(f)
+            j = json_load(f)
             f.close()
         for id_, name_ in j["types"].items():
             get_type_id.info[name_.lower()] = int(id_)
@@ -168,339 +188,70 @@ def get_type_id(type_name):
 
 # Returns the types of a move when requesting
 def get_move_type(move_id):
-    try:
-        return get_move_type.info.get(move_id, Unknown.SMALL)
-    except AttributeError:
-        get_move_type.info = {}
-        file1_ = get_path("data/fast_moves.json")
-        file2_ = get_path("data/charged_moves.json")
-        for file_ in [file1_, file2_]:
-            with open(file_, "r") as f:
-                j = json.load(f)
-                f.close()
-            for mv in j:
-                get_move_type.info[mv["move_id"]] = get_type_id(mv["type"])
-
-        return get_move_type.info.get(move_id, Unknown.SMALL)
+    return game_data.move_types.get(move_id, Unknown.SMALL)
 
 
 # Returns the damage of a move when requesting
 def get_move_damage(move_id):
-    try:
-        return get_move_damage.info.get(move_id, "unkn")
-    except AttributeError:
-        get_move_damage.info = {}
-        file1_ = get_path("data/fast_moves.json")
-        file2_ = get_path("data/charged_moves.json")
-        for file_ in [file1_, file2_]:
-            with open(file_, "r") as f:
-                j = json.load(f)
-                f.close()
-            for mv in j:
-                get_move_damage.info[mv["move_id"]] = mv["power"]
-
-        return get_move_damage.info.get(move_id, "unkn")
+    return game_data.move_damages.get(move_id, "unkn")
 
 
 # Returns the dps of a move when requesting
 def get_move_dps(move_id):
-    try:
-        return get_move_dps.info.get(move_id, "unkn")
-    except AttributeError:
-        get_move_dps.info = {}
-        file1_ = get_path("data/fast_moves.json")
-        file2_ = get_path("data/charged_moves.json")
-        for file_ in [file1_, file2_]:
-            with open(file_, "r") as f:
-                j = json.load(f)
-                f.close()
-            for mv in j:
-                get_move_dps.info[mv["move_id"]] = round(
-                    (mv["power"] / mv["duration"]) * 1000, 2
-                )
-
-        return get_move_dps.info.get(move_id, "unkn")
+    return game_data.move_dps.get(move_id, "unkn")
 
 
 # Returns the duration of a move when requesting
 def get_move_duration(move_id):
-    try:
-        return get_move_duration.info.get(move_id, "unkn")
-    except AttributeError:
-        get_move_duration.info = {}
-        file1_ = get_path("data/fast_moves.json")
-        file2_ = get_path("data/charged_moves.json")
-        for file_ in [file1_, file2_]:
-            with open(file_, "r") as f:
-                j = json.load(f)
-                f.close()
-            for mv in j:
-                get_move_duration.info[mv["move_id"]] = mv["duration"]
-
-        return get_move_duration.info.get(move_id, "unkn")
+    return game_data.move_durations.get(move_id, "unkn")
 
 
 # Returns the duration of a move when requesting
 def get_move_energy(move_id):
-    try:
-        return get_move_energy.info.get(move_id, "unkn")
-    except AttributeError:
-        get_move_energy.info = {}
-        file1_ = get_path("data/fast_moves.json")
-        file2_ = get_path("data/charged_moves.json")
-        for file_ in [file1_, file2_]:
-            with open(file_, "r") as f:
-                j = json.load(f)
-                f.close()
-            for mv in j:
-                get_move_energy.info[mv["move_id"]] = abs(mv["energy_delta"])
-
-        return get_move_energy.info.get(move_id, "unkn")
+    return game_data.move_energies.get(move_id, "unkn")
 
 
 # Returns the base height for a pokemon
 def get_base_height(pokemon_id):
-    try:
-        return get_base_height.info.get(pokemon_id, 0)
-    except AttributeError:
-        get_base_height.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            get_base_height.info[int(id_)] = j[id_].get("height")
-
-        return get_base_height.info.get(pokemon_id, 0)
+    return game_data.base_heights.get(pokemon_id, 0)
 
 
 # Returns the base weight for a pokemon
 def get_base_weight(pokemon_id):
-    try:
-        return get_base_weight.info.get(pokemon_id, 0)
-    except AttributeError:
-        get_base_weight.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            get_base_weight.info[int(id_)] = j[id_].get("weight")
-
-        return get_base_weight.info.get(pokemon_id, 0)
+    return game_data.base_weights.get(pokemon_id, 0)
 
 
 # Returns the types for a pokemon and its forms
 def get_base_stats(pokemon_id, form_id=0):
-    try:
-        get_base_stats.info
-    except AttributeError:
-        get_base_stats.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            normal_form_stats = j[id_].get("stats")
-            get_base_stats.info[int(id_) * 100_000] = normal_form_stats
-
-            for form_id_ in j[id_].get("forms", {}):
-                if form_id_ == "0":
-                    continue
-                form_ = j[id_]["forms"][form_id_]
-                if (
-                    form_["name"] in ("Shadow", "Purified", "Normal")
-                    or form_.get("stats") is None
-                ):
-                    form_stats = normal_form_stats
-                else:
-                    form_stats = form_["stats"]
-                stats_key = int(id_) * 100_000 + int(form_id_)
-                get_base_stats.info[stats_key] = form_stats
-
     stats_key = pokemon_id * 100_000 + form_id
     default_stats = {"attack": 0, "defense": 0, "stamina": 0}
-    return get_base_stats.info.get(stats_key, default_stats)
+    return game_data.base_stats.get(stats_key, default_stats)
 
 
 # Returns possible evolutions for a pokemon and its forms
 def get_evolutions(base_pokemon_id, base_form_id=0):
-    try:
-        get_evolutions.info
-    except AttributeError:
-        get_evolutions.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            normal_form_chain = get_evolution_chain(j, id_, "0")
-            get_evolutions.info[int(id_) * 100_000] = normal_form_chain
-            for form_id_ in j[id_].get("forms", {}):
-                if form_id_ == "0":
-                    continue
-                if j[id_]["forms"][form_id_]["name"] in (
-                    "Shadow",
-                    "Purified",
-                    "Normal",
-                ):
-                    evo_chain = normal_form_chain
-                else:
-                    evo_chain = get_evolution_chain(j, id_, form_id_)
-
-                evo_key = int(id_) * 100_000 + int(form_id_)
-                get_evolutions.info[evo_key] = evo_chain
-
     evo_key = base_pokemon_id * 100_000 + base_form_id
-    return get_evolutions.info.get(evo_key, [])
-
-
-# Return the list of evolutions depending on the form of the pokemon
-def get_evolution_chain(j, id_, form_id_, a=None):
-    if a is None:
-        a = []
-    if form_id_ != "0":
-        evolutions = j[id_]["forms"][form_id_].get("evolutions")
-        if evolutions is not None:
-            for evo_id in evolutions:
-                if int(evo_id) > 1010:  # block unreleased generations
-                    continue
-
-                evo_form_id = evolutions[evo_id]["form"]
-                a.append((int(evo_id), int(evo_form_id)))
-
-                next_id_ = str(evolutions[evo_id]["pokemon"])
-                next_form_id_ = str(evolutions[evo_id]["form"])
-                get_evolution_chain(j, next_id_, next_form_id_, a)
-    else:
-        evolutions = j[id_].get("evolutions")
-        if evolutions is not None:
-            for evo_id in evolutions:
-                if int(evo_id) > 1010:  # block unreleased generations
-                    continue
-
-                evo_form_id = evolutions[evo_id]["form"]
-                a.append((int(evo_id), int(evo_form_id)))
-
-                next_id_ = str(evolutions[evo_id]["pokemon"])
-                get_evolution_chain(j, next_id_, "0", a)
-    return a
+    return game_data.evolutions.get(evo_key, [])
 
 
 # Returns evolution costs from a pokemon and its forms
 def get_evolution_costs(pokemon_id, form_id=0):
-    try:
-        get_evolution_costs.info
-    except AttributeError:
-        get_evolution_costs.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            normal_form_chain = get_evolution_cost_chain(j, id_, "0")
-            get_evolution_costs.info[int(id_) * 100_000] = normal_form_chain
-            for form_id_ in j[id_].get("forms", {}):
-                if form_id_ == "0":
-                    continue
-                if j[id_]["forms"][form_id_]["name"] in (
-                    "Shadow",
-                    "Purified",
-                    "Normal",
-                ):
-                    cost_chain = normal_form_chain
-                else:
-                    cost_chain = get_evolution_cost_chain(j, id_, form_id_)
-
-                mon_key = int(id_) * 100_000 + int(form_id_)
-                get_evolution_costs.info[mon_key] = cost_chain
-
     mon_key = pokemon_id * 100_000 + form_id
-    return get_evolution_costs.info.get(mon_key, [])
-
-
-# Return the list of evolution costs depending on the form of the pokemon
-def get_evolution_cost_chain(j, id_, form_id_, a=None):
-    if a is None:
-        a = []
-    if form_id_ != "0":
-        evolutions = j[id_]["forms"][form_id_].get("evolutions", {})
-        for evo_id in evolutions:
-            if int(evo_id) > 1010:  # block unreleased generations
-                continue
-
-            candy_cost = int(evolutions[evo_id].get("candyCost", 0))
-            a.append(candy_cost)
-
-            get_evolution_cost_chain(
-                j,
-                str(evolutions[evo_id]["pokemon"]),
-                str(evolutions[evo_id]["form"]),
-                a,
-            )
-    else:
-        evolutions = j[id_].get("evolutions", {})
-        for evo_id in evolutions:
-            if int(evo_id) > 1010:  # block unreleased generations
-                continue
-
-            candy_cost = int(evolutions[evo_id].get("candyCost", 0))
-            a.append(candy_cost)
-
-            get_evolution_cost_chain(
-                j,
-                str(evolutions[evo_id]["pokemon"]),
-                "0",
-                a,
-            )
-    return a
+    return game_data.evolution_costs.get(mon_key, [])
 
 
 # Returns default form names for all the pokemon
 def get_raw_form_names():
-    try:
-        return get_raw_form_names.info
-    except AttributeError:
-        get_raw_form_names.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            get_raw_form_names.info[int(id_)] = {}
-            get_raw_form_names.info[int(id_)][0] = "Normal"
-            for form_id_ in j[id_].get("forms", {}):
-                if form_id_ != "0":
-                    get_raw_form_names.info[int(id_)][int(form_id_)] = j[id_]["forms"][
-                        form_id_
-                    ]["name"]
-
-        return get_raw_form_names.info
+    return game_data.form_names
 
 
 # Return CP multipliers
 def get_cp_multipliers():
-    try:
-        return get_cp_multipliers.info
-    except AttributeError:
-        file_ = get_path("data/cp_multipliers.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            get_cp_multipliers.info = {}
-            for lvl in j:
-                get_cp_multipliers.info[float(lvl)] = j[lvl]
-        return get_cp_multipliers.info
+    return game_data.cp_multipliers
 
 
 def get_cp_multiplier_squares():
-    try:
-        return get_cp_multiplier_squares.info
-    except AttributeError:
-        multipliers = get_cp_multipliers()
-        get_cp_multiplier_squares.info = {}
-        for lvl in multipliers:
-            get_cp_multiplier_squares.info[lvl] = multipliers[lvl] ** 2
-        return get_cp_multiplier_squares.info
+    return game_data.cp_multiplier_squares
 
 
 def bisect_levels(cp_limit, cp_base, first, last):
@@ -558,31 +309,9 @@ def calculate_cp_base(monster_id, form_id, atk, de, sta):
 
 
 def get_best_product(league, pokemon_id, form_id):
-    try:
-        get_best_product.info
-    except AttributeError:
-        get_best_product.info = {
-            "great": {},
-            "ultra": {},
-        }
-        file_ = get_path("data/stat_products.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            for form_id_ in j[id_]:
-                key_ = int(id_) * 100_000 + int(form_id_)
-                get_best_product.info["great"][key_] = j[id_][form_id_].get(
-                    "1500_highest_product"
-                )
-                get_best_product.info["ultra"][key_] = j[id_][form_id_].get(
-                    "2500_highest_product"
-                )
-
     base_key = pokemon_id * 100_000
-    return get_best_product.info[league].get(
-        base_key + form_id, get_best_product.info[league].get(base_key, 0)
-    )
+    products = game_data.best_products[league]
+    return products.get(base_key + form_id, products.get(base_key, 0))
 
 
 # Returns the highest possible stat product for PvP great league for a pkmn
@@ -598,19 +327,7 @@ def get_best_ultra_product(pokemon_id, form_id=0):
 # Returns a cp range for a certain level of a pokemon caught in a raid
 def get_pokemon_cp_range(level, pokemon_id, form_id=0):
     stats = get_base_stats(pokemon_id, form_id)
-
-    try:
-        cp_multi = get_pokemon_cp_range.info[level]
-    except AttributeError:
-        get_pokemon_cp_range.info = {}
-        file_ = get_path("data/cp_multipliers.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for lvl_ in j:
-            get_pokemon_cp_range.info[float(lvl_)] = j[lvl_]
-
-        cp_multi = get_pokemon_cp_range.info[level]
+    cp_multi = game_data.cp_multipliers[level]
 
     # minimum IV for a egg/raid pokemon is 10/10/10
     min_cp = int(
@@ -677,35 +394,8 @@ def get_gender_sym(gender):  # TODO - support other languages
 
 # Returns the types for a pokemon and its forms
 def get_base_types(pokemon_id, form_id=0):
-    try:
-        get_base_types.info
-    except AttributeError:
-        get_base_types.info = {}
-        file_ = get_path("data/pokemon_data.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for id_ in j:
-            normal_form_types = ([int(k) for k in j[id_].get("types")] + [0] * 2)[:2]
-            get_base_types.info[int(id_) * 100_000] = normal_form_types
-
-            for form_id_ in j[id_].get("forms", {}):
-                if form_id_ == "0":
-                    continue
-                form_ = j[id_]["forms"][form_id_]
-                if (
-                    form_["name"] in ("Shadow", "Purified", "Normal")
-                    or form_.get("types") is None
-                ):
-                    base_types = normal_form_types
-                else:
-                    base_types = ([int(k) for k in form_["types"]] + [0] * 2)[:2]
-
-                mon_key = int(id_) * 100_000 + int(form_id_)
-                get_base_types.info[mon_key] = base_types
-
     mon_key = pokemon_id * 100_000 + form_id
-    return get_base_types.info.get(mon_key, [0, 0])
+    return game_data.base_types.get(mon_key, [0, 0])
 
 
 # Returns the types for a pokemon
@@ -715,25 +405,7 @@ def get_mon_type(pokemon_id, form_id=0):
 
 
 def get_powerup_costs(type):
-    try:
-        return get_powerup_costs.info.get(type)
-    except AttributeError:
-        get_powerup_costs.info = {}
-        file_ = get_path("data/powerup_costs.json")
-        with open(file_, "r") as f:
-            j = json.loads(f.read())
-            f.close()
-        for type_ in j:
-            get_powerup_costs.info[type_] = []
-            for key in j[type_]:
-                levels = key.split("-")
-                level = float(levels[0])
-                endlevel = float(levels[1])
-                while level <= endlevel:
-                    get_powerup_costs.info[type_].append(int(j[type_][key]))
-                    level += 0.5
-
-        return get_powerup_costs.info.get(type)
+    return game_data.powerup_costs.get(type)
 
 
 # Return the list of stardust costs for powering up a pokemon
@@ -798,18 +470,7 @@ def calculate_evolution_cost(monster_id, target_id, evolutions, evolution_costs)
 
 # Return a boolean for whether the monster or the type is weather boosted
 def is_weather_boosted(weather_id, pokemon_id=0, form_id=0, mon_type=None):
-    try:
-        boosted_types = is_weather_boosted.info.get(str(weather_id), {})
-    except AttributeError:
-        is_weather_boosted.info = {}
-        file_ = get_path("data/weather_boosts.json")
-        with open(file_, "r") as f:
-            j = json.load(f)
-            f.close()
-        for w_id in j:
-            is_weather_boosted.info[w_id] = j[w_id]
-
-        boosted_types = is_weather_boosted.info.get(str(weather_id), {})
+    boosted_types = game_data.weather_boosts.get(str(weather_id), {})
 
     if mon_type is None:
         types = get_base_types(pokemon_id, form_id)
@@ -1110,7 +771,7 @@ def get_weather_id(weather_name):
         files = glob(get_path("locales/*.json"))
         for file_ in files:
             with open(file_, "r") as f:
-                j = json.load(f)
+                j = json_load(f)
                 f.close()
             j = j["weather"]
             for id_ in j:
@@ -12,6 +12,7 @@ import logging
 import json
 import os
 import sys
+import time
 import requests
 import traceback
 from glob import glob
@@ -26,8 +27,11 @@ import pytz
 import PokeAlarm.Events as Events
 from PokeAlarm import config
 from PokeAlarm.Utilities.Logging import setup_std_handler, setup_file_handler
-from PokeAlarm.Cache import cache_options
+from PokeAlarm.Utilities import JsonUtils, PvpUtils
+from PokeAlarm.Cache import Cache, RedisCache, cache_options
+from PokeAlarm.GameData import game_data
 from PokeAlarm.Manager import Manager
+from PokeAlarm.ManagerProcess import ManagerProcess, read_frames
 from PokeAlarm.Utils import get_path, parse_boolean
 from PokeAlarm.Load import parse_rules_file, parse_filters_file, parse_alarms_file
 
@@ -36,7 +40,9 @@ log = logging.getLogger("pokealarm.webserver")
 # Global Variables
 app = Flask(__name__)
 data_queue = queue.Queue()
+start_time = time.perf_counter()
 managers = {}
+workers = {}
 server = None
 
 
@@ -48,9 +54,15 @@ def index():
 @app.route("/", methods=["POST"])
 def accept_webhook():
     try:
-        data = json.loads(request.data)
+        data = JsonUtils.loads(request.data)
+        # Forward the request body as it was received to the manager processes
+        for group, worker in workers.items():
+            worker.send(request.data)
         count = 1
         if type(data) == dict:  # older webhook style
+            data_queue.put([data] if config["BATCH_INGEST"] else data)
+        elif config["BATCH_INGEST"]:  # Keep the frames together as one unit
+            count = len(data)
             data_queue.put(data)
         else:  # For data set in frame
             count = len(data)
@@ -84,6 +96,21 @@ def manage_webhook_data(_queue):
                 )
         # Distribute events to the other managers
         data = _queue.get(block=True)
+        if len(managers) == 0:  # All managers run in other processes
+            continue
+        if config["BATCH_INGEST"]:
+            events = Events.batch_event_factory(data)
+            if len(events) == 0:
+                continue
+            for name, mgr in managers.items():
+                mgr.update_batch(events)
+            log.debug(
+                "Distributed batch of %s event(s) to %s managers.",
+                len(events),
+                len(managers),
+            )
+            log_cold_start()
+            continue
         obj = Events.event_factory(data)
         if obj is None:  # TODO: Improve Event error checking
             continue
@@ -98,6 +125,18 @@ def manage_webhook_data(_queue):
                 mgr.update(obj)
         if not isinstance(obj, list):
             log.debug("Distributed event %s to %s managers.", obj.id, len(managers))
+        log_cold_start()
+
+
+# Log the time from start to the first processed webhook
+def log_cold_start():
+    global start_time
+    if start_time is not None:
+        log.info(
+            "First webhook processed %.2fs after start.",
+            time.perf_counter() - start_time,
+        )
+        start_time = None
 
 
 # Check for update
@@ -215,6 +254,14 @@ def check_for_update():
         log.critical("Missing PokeAlarm data")
         sys.exit(1)
 
+    # Rebuild the game data snapshot if the data has changed
+    if not game_data.load_snapshot():
+        try:
+            game_data.save_snapshot()
+        except Exception as e:
+            log.error("Unable to save game data snapshot: %s", e)
+            log.debug("Stack trace: \n %s", traceback.format_exc())
+
 
 # Download latest PokeAlarm data
 def download_data(sigdiff=None):
@@ -409,6 +456,11 @@ def start_server():
     # Start Webhook Manager in a Thread
     spawn(manage_webhook_data, data_queue)
 
+    # Manager processes are fed by their parent instead of the webserver
+    if config["WORKER_GROUP"] is not None:
+        read_frames(config["WORKER_FD"], data_queue, config["BATCH_INGEST"])
+        exit_gracefully(signal.SIGTERM, None)
+
     # Start up Server
     log.info(
         "PokeAlarm is listening for webhooks on http://%s:%s",
@@ -455,6 +507,60 @@ def parse_settings(root_path):
         help="Maximum concurrent connections for the webserver.",
         default=200,
     )
+    parser.add_argument(
+        "-bi",
+        "--batch-ingest",
+        action="store_true",
+        default=False,
+        help="Queue each webhook request as a single batch of events.",
+    )
+    parser.add_argument(
+        "-jb",
+        "--json-backend",
+        default="auto",
+        choices=JsonUtils.json_backend_options,
+        help="Json decoder used for webhooks and data files. Options: "
+        "['auto', 'orjson', 'ujson', 'json'] (Default: 'auto')",
+    )
+    parser.add_argument(
+        "-pcs",
+        "--pvp-cache-size",
+        type=int,
+        default=PvpUtils.PVP_CACHE_SIZE,
+        help="Number of PvP results to keep in memory, 0 to disable. "
+        f"(Default: {PvpUtils.PVP_CACHE_SIZE})",
+    )
+    parser.add_argument(
+        "-pp",
+        "--pvp-precompute",
+        action="store_true",
+        default=False,
+        help="Precompute PvP ratings of the monsters listed in monster filters.",
+    )
+    parser.add_argument(
+        "-gcs",
+        "--gym-cache-size",
+        type=int,
+        default=Cache.SIZES["gyms"],
+        help="Number of gyms each manager keeps cached details of, 0 for no "
+        f"limit. (Default: {Cache.SIZES['gyms']})",
+    )
+    parser.add_argument(
+        "-wcs",
+        "--weather-cache-size",
+        type=int,
+        default=Cache.SIZES["cells"],
+        help="Number of weather cells each manager keeps cached, 0 for no limit. "
+        f"(Default: {Cache.SIZES['cells']})",
+    )
+    parser.add_argument(
+        "-qcs",
+        "--quest-cache-size",
+        type=int,
+        default=Cache.SIZES["quests"],
+        help="Number of stops each manager keeps cached quests of, 0 for no limit. "
+        f"(Default: {Cache.SIZES['quests']})",
+    )
 
     parser.add_argument(
         "-d",
@@ -510,6 +616,18 @@ def parse_settings(root_path):
         default=[],
         help="Names of Manager processes to start.",
     )
+    parser.add_argument(
+        "-mp",
+        "--mgr-process",
+        action="append",
+        default=[None],
+        help="Name of a process group to run a manager in. "
+        "Managers in the same group share one OS process. default: None",
+    )
+    parser.add_argument("--worker-group", default=None, help=configargparse.SUPPRESS)
+    parser.add_argument(
+        "--worker-fd", type=int, default=None, help=configargparse.SUPPRESS
+    )
     parser.add_argument(
         "-mll",
         "--mgr-log-lvl",
@@ -661,7 +779,22 @@ def parse_settings(root_path):
         action="append",
         default=["mem"],
         choices=cache_options,
-        help="Specify the type of cache to use. Options: ['mem', 'file'] (Default: 'mem')",
+        help="Specify the type of cache to use. Options: ['mem', 'file', 'sqlite', "
+        "'redis'] (Default: 'mem')",
+    )
+    parser.add_argument(
+        "-ru",
+        "--redis-url",
+        default=RedisCache.DEFAULT_URL,
+        help="Server used by the 'redis' cache type, as "
+        f"redis://[:password@]host[:port][/db] (Default: '{RedisCache.DEFAULT_URL}')",
+    )
+    parser.add_argument(
+        "-sc",
+        "--shared-cache",
+        action="store_true",
+        default=False,
+        help="Share the cached gym details between the managers of a process.",
     )
     parser.add_argument(
         "-tl",
@@ -719,7 +852,19 @@ def parse_settings(root_path):
     config["HOST"] = args.host
     config["PORT"] = args.port
     config["CONCURRENCY"] = args.concurrency
+    config["BATCH_INGEST"] = args.batch_ingest
+    config["JSON_BACKEND"] = JsonUtils.set_json_backend(args.json_backend)
+    log.info("Using '%s' json backend.", config["JSON_BACKEND"])
+    PvpUtils.set_cache_size(args.pvp_cache_size)
+    config["REDIS_URL"] = args.redis_url
+    config["CACHE_SIZES"] = {
+        "gyms": args.gym_cache_size,
+        "cells": args.weather_cache_size,
+        "quests": args.quest_cache_size,
+    }
     config["DEBUG"] = args.debug
+    config["WORKER_GROUP"] = args.worker_group
+    config["WORKER_FD"] = args.worker_fd
 
     # Check to make sure that the same number of arguments are included
     for arg in [
@@ -744,6 +889,7 @@ def parse_settings(root_path):
         args.mgr_log_size,
         args.mgr_log_file,
         args.gmaps_signing_secret,
+        args.mgr_process,
     ]:
         if len(arg) > 1:  # Remove defaults from the list
             arg.pop(0)
@@ -774,11 +920,39 @@ def parse_settings(root_path):
         m_ct = len(args.manager_name)
         args.manager_name.append(f"Manager_{m_ct}")
 
+    # Manager names are also used for cache files, so check them up front
+    names = [str(name).lower() for name in args.manager_name]
+    if len(set(names)) != len(names):
+        log.critical(
+            "Names of Manager processes must be unique (not case sensitive)! Process will exit."
+        )
+        sys.exit(1)
+    shared = [n for n in names if n == "shared" or n.startswith("shared_")]
+    if args.shared_cache and len(shared) > 0:
+        log.critical(
+            "Manager names starting with 'shared' are used by the shared cache! "
+            "Process will exit."
+        )
+        sys.exit(1)
+
     # Check for a data update before building the managers
-    check_for_update()
+    if config["WORKER_GROUP"] is None:
+        check_for_update()
+    else:
+        game_data.load_snapshot()
 
     # Build the managers
+    groups = []
     for m_ct in range(args.manager_count):
+        # Skip managers running in another process
+        group = get_from_list(args.mgr_process, m_ct, args.mgr_process[0])
+        if str(group).lower() == "none":
+            group = None
+        if group != config["WORKER_GROUP"]:
+            if config["WORKER_GROUP"] is None and group not in groups:
+                groups.append(group)
+            continue
+
         # TODO: Fix this mess better next time
         log.info("----------- Setting up '%s'", args.manager_name[m_ct])
         config["UNITS"] = get_from_list(args.units, m_ct, args.units[0])
@@ -797,6 +971,7 @@ def parse_settings(root_path):
             location=get_from_list(args.location, m_ct, args.location[0]),
             geofence_file=get_from_list(args.geofences, m_ct, args.geofences[0]),
             debug=config["DEBUG"],
+            share_cache=args.shared_cache,
         )
 
         m.set_log_level(get_from_list(args.mgr_log_lvl, m_ct, args.mgr_log_lvl[0]))
@@ -832,11 +1007,25 @@ def parse_settings(root_path):
             )
             sys.exit(1)
         log.info("----------- Finished setting up '%s'", args.manager_name[m_ct])
+    if args.pvp_precompute:
+        monster_ids = set()
+        for m_name in managers:
+            monster_ids.update(managers[m_name].get_filtered_monster_ids())
+        PvpUtils.precompute_ratings(monster_ids)
     for m_name in managers:
         managers[m_name].start()
 
+    # Start a process for each group of managers
+    for group in groups:
+        workers[group] = ManagerProcess(group)
+        workers[group].start(os.path.abspath(__file__), sys.argv[1:])
+
     # Set up signal handlers for graceful exit
-    signal_handler(signal.SIGINT, exit_gracefully, signal.SIGINT, None)
+    if config["WORKER_GROUP"] is not None:
+        # Manager processes are shut down by their parent closing the feed
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    else:
+        signal_handler(signal.SIGINT, exit_gracefully, signal.SIGINT, None)
     signal_handler(signal.SIGTERM, exit_gracefully, signal.SIGTERM, None)
 
 
@@ -848,11 +1037,16 @@ def get_from_list(arg, i, default):
 def exit_gracefully(signum, frame):
     log.debug("Signal %s received", signal.Signals(signum).name)
     log.info("PokeAlarm is closing down!")
-    server.stop()
+    if server is not None:
+        server.stop()
+    for group in workers:
+        workers[group].stop()
     for m_name in managers:
         managers[m_name].stop()
     for m_name in managers:
         managers[m_name].join()
+    for group in workers:
+        workers[group].join()
     log.info("PokeAlarm exited!")
     exit(0)
 
@@ -46,6 +46,12 @@ class TestEggFilter(unittest.TestCase):
         self.pass_vals = [2, 3, 4]
         self.fail_vals = [1, 5]
 
+    def test_index_values(self):
+        filt = self.gen_filter({"min_egg_lvl": 2, "max_egg_lvl": 4})
+        self.assertEqual({2, 3, 4}, filt.index_values("egg_lvl"))
+        filt = self.gen_filter({"min_egg_lvl": 2})
+        self.assertIsNone(filt.index_values("egg_lvl"))
+
     @generic_filter_test
     def test_gym_name_contains(self):
         self.filt = {"gym_name_contains": ["pass"]}
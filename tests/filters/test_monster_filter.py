@@ -1,9 +1,11 @@
 from datetime import datetime, timedelta
 import time
 import unittest
+from unittest import mock
 import PokeAlarm.Filters as Filters
 import PokeAlarm.Events as Events
-from PokeAlarm.Geofence import load_geofence_file
+from PokeAlarm import Unknown
+from PokeAlarm.Geofence import Geofence, Geofences, load_geofence_file
 from tests.filters import MockManager, generic_filter_test, full_filter_test
 
 
@@ -59,6 +61,82 @@ class TestMonsterFilter(unittest.TestCase):
         self.pass_vals = [1, 2, 3]
         self.fail_vals = [5, 102, 30]
 
+    def test_index_values(self):
+        filt = self.gen_filter({"monsters": [1, "2"], "min_iv": 90})
+        self.assertEqual({1, 2}, filt.index_values("monster_id"))
+        self.assertIsNone(filt.index_values("form_id"))
+        self.assertIsNone(self.gen_filter({}).index_values("monster_id"))
+
+    def test_compiled_check(self):
+        filt = self.gen_filter(
+            {"monsters": [1, 2], "min_atk": 10, "max_cp": 500, "genders": ["male"]}
+        )
+        for values in [
+            {},
+            {"pokemon_id": 3},
+            {"individual_attack": 15, "cp": 400, "gender": 1},
+            {"individual_attack": 0, "cp": 400, "gender": 1},
+            {"individual_attack": 15, "cp": 600, "gender": 2},
+        ]:
+            event = self.gen_event(values)
+            self.assertEqual(filt.check_event_list(event), filt.check_event(event))
+
+    def test_reorder_checks(self):
+        filt = self.gen_filter({"monsters": [1, 2], "min_cp": 500})
+        self.assertEqual(["monster_id", "cp"], [c.name for c in filt._check_list])
+        for cp in [100, 200, 300, 600]:
+            filt.check_event(self.gen_event({"cp": cp}))
+        self.assertEqual(
+            [
+                {"check": "monster_id", "evaluated": 4, "rejected": 0},
+                {"check": "cp", "evaluated": 4, "rejected": 3},
+            ],
+            filt.check_stats(),
+        )
+        # The most rejecting check now runs first
+        filt.reorder_checks()
+        self.assertEqual(["cp", "monster_id"], [c.name for c in filt._check_list])
+        self.assertFalse(filt.check_event(self.gen_event({"cp": 100})))
+        self.assertTrue(filt.check_event(self.gen_event({"cp": 600})))
+        self.assertEqual(
+            [
+                {"check": "cp", "evaluated": 6, "rejected": 4},
+                {"check": "monster_id", "evaluated": 5, "rejected": 0},
+            ],
+            filt.check_stats(),
+        )
+
+    def test_reorder_checks_geofence_first(self):
+        filt = self.gen_filter({"min_iv": 90, "min_atk": 10, "geofences": ["First"]})
+        square = [[40.6, -74.1], [40.6, -73.95], [40.75, -73.95], [40.75, -74.1]]
+        geofences_ref = Geofences()
+        geofences_ref["First"] = Geofence("First", square)
+        filt._check_list[-1].override_geofences_ref(geofences_ref)
+        ivs = {
+            "individual_attack": 15,
+            "individual_defense": 15,
+            "individual_stamina": 15,
+        }
+        for lat in [10.0, 20.0, 30.0, 40.7]:
+            event = self.gen_event(dict(ivs, latitude=lat, longitude=-74.0))
+            filt.check_event(event)
+        # The selective geofence check now runs before the cheaper ones
+        filt.reorder_checks()
+        self.assertEqual(
+            ["geofences", "atk_iv", "iv"], [c.name for c in filt._check_list]
+        )
+        # The geofence is only set on events passing the whole filter
+        ivs["individual_attack"] = 0
+        event = self.gen_event(dict(ivs, latitude=40.7, longitude=-74.0))
+        self.assertFalse(filt.check_event(event))
+        self.assertEqual(Unknown.REGULAR, event.geofence)
+        self.assertFalse(filt.check_event_list(event))
+        self.assertEqual(Unknown.REGULAR, event.geofence)
+        ivs["individual_attack"] = 15
+        event = self.gen_event(dict(ivs, latitude=40.7, longitude=-74.0))
+        self.assertTrue(filt.check_event(event))
+        self.assertEqual("First", event.geofence)
+
     @generic_filter_test
     def test_rarity(self):
         self.filt = {"rarity": ["new spawn", "Very Rare"]}
@@ -362,7 +440,7 @@ class TestMonsterFilter(unittest.TestCase):
         filt._check_list[0].override_geofences_ref(geofences_ref)
 
         # Test passing
-        for (lat, lng) in [
+        for lat, lng in [
             (40.689256, -74.044510),
             (40.630720, -74.087673),
             (40.686905, -73.853559),
@@ -373,7 +451,7 @@ class TestMonsterFilter(unittest.TestCase):
             self.assertTrue(filt.check_event(event))
 
         # Test failing
-        for (lat, lng) in [
+        for lat, lng in [
             (38.920936, -77.047371),
             (48.858093, 2.294694),
             (-37.809022, 144.959003),
@@ -383,6 +461,24 @@ class TestMonsterFilter(unittest.TestCase):
             )
             self.assertFalse(filt.check_event(event))
 
+    def test_geofences_without_index(self):
+        filt = self.gen_filter({"geofences": ["First", "Second"]})
+        square = [[40.6, -74.1], [40.6, -73.95], [40.75, -73.95], [40.75, -74.1]]
+        geofences_ref = {
+            "First": Geofence("First", square),
+            "Second": Geofence("Second", square),
+        }
+        filt._check_list[0].override_geofences_ref(geofences_ref)
+
+        event = self.gen_event({"latitude": 40.7, "longitude": -74.0})
+        with mock.patch.object(
+            Geofence, "contains", autospec=True, side_effect=Geofence.contains
+        ) as contains:
+            self.assertTrue(filt.check_event(event))
+        # Only checked until the first geofence containing the event
+        self.assertEqual(1, contains.call_count)
+        self.assertEqual("First", event.geofence)
+
     def test_exclude_geofences(self):
         # Create the filter
         filt = self.gen_filter({"exclude_geofences": ["NewYork"]})
@@ -391,7 +487,7 @@ class TestMonsterFilter(unittest.TestCase):
         filt._check_list[0].override_geofences_ref(geofences_ref)
 
         # Test passing
-        for (lat, lng) in [
+        for lat, lng in [
             (38.920936, -77.047371),
             (48.858093, 2.294694),
             (-37.809022, 144.959003),
@@ -400,7 +496,7 @@ class TestMonsterFilter(unittest.TestCase):
             self.assertTrue(filt.check_event(event))
 
         # Test failing
-        for (lat, lng) in [
+        for lat, lng in [
             (40.689256, -74.044510),
             (40.630720, -74.087673),
             (40.686905, -73.853559),
@@ -458,6 +554,19 @@ class TestMonsterFilter(unittest.TestCase):
             },
         ]
 
+    def test_pvp_min_max_rank(self):
+        filt = self.gen_filter({"min_great_rank": 2, "max_great_rank": 100})
+        event = self.gen_event({})
+        for rank, passed in [(1, False), (2, True), (100, True), (101, False)]:
+            event.great_rank = rank
+            self.assertEqual(passed, filt.check_event(event), msg=rank)
+
+        filt = self.gen_filter({"max_ultra_rank": 10, "is_missing_info": False})
+        event = self.gen_event({})
+        self.assertFalse(filt.check_event(event))
+        event.ultra_rank = 10
+        self.assertTrue(filt.check_event(event))
+
     @full_filter_test
     def test_min_cp_great(self):
         self.filt = {"min_cp_great": 1000}
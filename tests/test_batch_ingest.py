@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+import gevent
+import PokeAlarm.Events as Events
+from PokeAlarm.Manager import Manager
+from tests.filters import (
+    test_egg_filter,
+    test_grunt_filter,
+    test_gym_filter,
+    test_monster_filter,
+    test_quest_filter,
+    test_raid_filter,
+    test_stop_filter,
+    test_weather_filter,
+)
+
+
+def message(test_case, event_class, values=None):
+    """Returns the webhook message a filter test case builds its events from."""
+    with mock.patch.object(Events, event_class, dict):
+        return test_case.gen_event(None, values or {})
+
+
+class TestBatchIngest(unittest.TestCase):
+    def setUp(self):
+        stop = message(test_stop_filter.TestStopFilter, "StopEvent")
+        grunt = message(test_grunt_filter.TestGruntFilter, "GruntEvent")
+        self.frames = [
+            {
+                "type": "pokemon",
+                "message": message(test_monster_filter.TestMonsterFilter, "MonEvent"),
+            },
+            {
+                "type": "raid",
+                "message": message(test_egg_filter.TestEggFilter, "EggEvent"),
+            },
+            {
+                "type": "raid",
+                "message": message(test_raid_filter.TestRaidFilter, "RaidEvent"),
+            },
+            {"type": "pokestop", "message": dict(stop, **grunt)},  # Two events
+            {"type": "invasion", "message": grunt},
+            {
+                "type": "gym_details",
+                "message": message(test_gym_filter.TestGymFilter, "GymEvent"),
+            },
+            {
+                "type": "weather",
+                "message": message(
+                    test_weather_filter.TestWeatherFilter, "WeatherEvent"
+                ),
+            },
+            {
+                "type": "quest",
+                "message": message(test_quest_filter.TestQuestFilter, "QuestEvent"),
+            },
+        ]
+
+    @staticmethod
+    def described(events):
+        return [(type(event), event.name, event.lat, event.lng) for event in events]
+
+    def test_same_as_event_factory(self):
+        expected = []
+        for frame in self.frames:
+            obj = Events.event_factory(frame)
+            expected.extend(obj if isinstance(obj, list) else [obj])
+        events = Events.batch_event_factory(self.frames)
+        self.assertEqual(self.described(expected), self.described(events))
+        self.assertEqual(
+            [
+                Events.MonEvent,
+                Events.EggEvent,
+                Events.RaidEvent,
+                Events.GruntEvent,
+                Events.StopEvent,
+                Events.GruntEvent,
+                Events.GymEvent,
+                Events.WeatherEvent,
+                Events.QuestEvent,
+            ],
+            [type(event) for event in events],
+        )
+
+    def test_invalid_frames_skipped(self):
+        invalid = [
+            {"type": "unknown", "message": {}},
+            {"type": "captcha", "message": {}},
+            {"type": "pokemon", "message": {}},
+            {"message": self.frames[0]["message"]},
+        ]
+        frames = invalid[:2] + self.frames[:3] + invalid[2:] + self.frames[3:]
+        with self.assertLogs("Events", "ERROR"):
+            events = Events.batch_event_factory(frames)
+        expected = Events.batch_event_factory(self.frames)
+        self.assertEqual(self.described(expected), self.described(events))
+
+    def test_update_batch(self):
+        mgr = Manager(
+            "batch", None, None, "en", "metric", None, 0, 3, None, "mem", None, False
+        )
+        events = Events.batch_event_factory(self.frames)
+        mgr.update_batch(events)
+        self.assertEqual(1, mgr._Manager__queue.qsize())  # Queued as one item
+        with mock.patch.object(mgr, "process_event") as process_event:
+            mgr.start()
+            self.addCleanup(mgr._Manager__process.kill)
+            gevent.sleep(0.1)
+        self.assertEqual([mock.call(e) for e in events], process_event.call_args_list)
+        self.assertEqual(0, mgr._Manager__queue.qsize())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from PokeAlarm import config, Unknown
+from PokeAlarm.Cache import Cache, FileCache, shared_cache, _shared
+from PokeAlarm.Cache.Cache import HistDict, LRUDict
+from tests.test_file_cache import MockManager
+
+
+class TestHistDict(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime.utcnow()
+
+    def at(self, minutes):
+        return self.now + timedelta(minutes=minutes)
+
+    def test_expire(self):
+        hist = HistDict({"a": self.at(-1), "b": self.at(1)})
+        hist["c"] = self.at(-2)
+        hist["d"] = self.at(2)
+        self.assertEqual(2, hist.expire(self.now))
+        self.assertEqual({"b": self.at(1), "d": self.at(2)}, hist)
+        self.assertEqual(0, hist.expire(self.now))
+        self.assertEqual(2, hist.expire(self.at(3)))
+        self.assertEqual({"size": 0, "heap": 0, "evicted": 4}, hist.stats())
+
+    def test_changed_and_deleted(self):
+        hist = HistDict()
+        hist["a"] = self.at(-1)
+        hist["a"] = self.at(1)  # Extended
+        hist["b"] = self.at(-1)
+        del hist["b"]
+        hist["c"] = self.at(1)
+        hist["c"] = self.at(-1)  # Shortened
+        self.assertEqual(1, hist.expire(self.now))
+        self.assertEqual({"a": self.at(1)}, hist)
+
+    def test_outdated_entries_dropped(self):
+        hist = HistDict()
+        for i in range(1000):
+            hist["a"] = self.at(i)
+        self.assertLess(hist.stats()["heap"], 200)
+        self.assertEqual(0, hist.expire(self.at(998)))
+        self.assertEqual(1, hist.expire(self.at(1000)))
+
+
+class TestLRUDict(unittest.TestCase):
+    def test_evict_least_recently_used(self):
+        lru = LRUDict(3)
+        for key in "abc":
+            lru[key] = key
+        self.assertEqual("a", lru.get("a"))
+        lru["b"] = "B"
+        lru["d"] = "d"
+        self.assertEqual(["a", "b", "d"], list(lru))
+        self.assertIsNone(lru.get("c"))
+        self.assertEqual({"size": 3, "maxsize": 3, "evicted": 1}, lru.stats())
+
+    def test_no_limit(self):
+        lru = LRUDict(0, {str(i): i for i in range(1000)})
+        lru["new"] = 1
+        self.assertEqual(1001, len(lru))
+
+    def test_limit_applied_to_initial_data(self):
+        lru = LRUDict(2, {"a": 1, "b": 2, "c": 3})
+        self.assertEqual({"b": 2, "c": 3}, dict(lru))
+
+
+class TestCache(unittest.TestCase):
+    def test_clean_hist(self):
+        cache = Cache(MockManager())
+        now = datetime.utcnow()
+        cache.monster_expiration("old", now - timedelta(minutes=1))
+        cache.monster_expiration("new", now + timedelta(minutes=1))
+        cache.raid_expiration("old", now - timedelta(minutes=1))
+        cache.clean_and_save()
+        self.assertIsNone(cache.monster_expiration("old"))
+        self.assertIsNone(cache.raid_expiration("old"))
+        self.assertIsNotNone(cache.monster_expiration("new"))
+        stats = cache.stats()
+        self.assertEqual({"size": 1, "heap": 1, "evicted": 1}, stats["mon_hist"])
+        self.assertEqual({"size": 0, "heap": 0, "evicted": 1}, stats["raid_hist"])
+
+    def test_gym_record(self):
+        cache = Cache(MockManager())
+        self.assertEqual(Unknown.TINY, cache.gym_team("gym"))
+        self.assertEqual(2, cache.gym_team("gym", 2))
+        self.assertEqual("Name", cache.gym_name("gym", "Name"))
+        self.assertEqual("Name", cache.gym_name("gym", Unknown.REGULAR))
+        self.assertEqual(2, cache.gym_team("gym"))
+        self.assertEqual(Unknown.TINY, cache.gym_slots("gym"))
+        self.assertEqual(Unknown.REGULAR, cache.gym_desc("gym"))
+        self.assertTrue(cache.gym_image("gym").endswith("icons/gym_0.png"))
+        self.assertEqual(1, len(cache._gyms))
+
+    def test_sizes(self):
+        config["CACHE_SIZES"] = {"gyms": 2}
+        self.addCleanup(config.pop, "CACHE_SIZES")
+        cache = Cache(MockManager())
+        for gym_id in ["a", "b", "c"]:
+            cache.gym_name(gym_id, gym_id.upper())
+        self.assertEqual(Unknown.REGULAR, cache.gym_name("a"))
+        self.assertEqual("C", cache.gym_name("c"))
+        self.assertEqual({"size": 2, "maxsize": 2, "evicted": 1}, cache.stats()["gyms"])
+        self.assertEqual(Cache.SIZES["quests"], cache.stats()["quests"]["maxsize"])
+
+
+class TestSharedCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.old_root = config["ROOT_PATH"]
+        config["ROOT_PATH"] = self.root
+        self.addCleanup(config.__setitem__, "ROOT_PATH", self.old_root)
+        self.addCleanup(_shared.clear)
+
+    def test_one_per_type(self):
+        cache = shared_cache("mem")
+        self.assertIs(cache, shared_cache("mem"))
+        self.assertIsInstance(shared_cache("file"), FileCache)
+        self.assertTrue(
+            os.path.isfile(os.path.join(self.root, "cache", "shared.cache"))
+        )
+
+    def test_worker_group(self):
+        config["WORKER_GROUP"] = "1"
+        self.addCleanup(config.pop, "WORKER_GROUP")
+        shared_cache("file")
+        path = os.path.join(self.root, "cache", "shared_1.cache")
+        self.assertTrue(os.path.isfile(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
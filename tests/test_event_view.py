@@ -0,0 +1,86 @@
+import unittest
+from unittest import mock
+import s2cell
+from PokeAlarm import Unknown
+from PokeAlarm.Cache import Cache
+from PokeAlarm.Events import BaseEvent, EventView, MonEvent
+from PokeAlarm.Locale import Locale
+from tests.filters import test_monster_filter
+from tests.test_file_cache import MockManager
+
+
+class TestEventView(unittest.TestCase):
+    def setUp(self):
+        ivs = {
+            "individual_attack": 15,
+            "individual_defense": 15,
+            "individual_stamina": 15,
+            "weather": 0,
+        }
+        self.mon = test_monster_filter.TestMonsterFilter.gen_event(None, ivs)
+
+    def test_attributes_set_on_view(self):
+        first, second = self.mon.view(), self.mon.view()
+        self.assertIsInstance(first, EventView)
+        first.name = "Bulbasaur"
+        first.distance = 100
+        first.custom_dts = {"rule": "first"}
+        self.assertEqual("Bulbasaur", first.name)
+        self.assertEqual(100, first.distance)
+        self.assertEqual(1, first.monster_id)  # Read from the event
+        self.assertEqual(Unknown.SMALL, second.distance)
+        self.assertEqual(Unknown.SMALL, self.mon.distance)
+        self.assertEqual({}, self.mon.custom_dts)
+        with self.assertRaises(AttributeError):
+            first.monster_id = 2  # Not derived by Managers
+
+    def test_methods_use_view(self):
+        view = self.mon.view()
+        cache = Cache(MockManager())
+        cell_id = s2cell.lat_lon_to_cell_id(self.mon.lat, self.mon.lng, 10)
+        cache.cell_weather_id(str(cell_id), 1)
+        view.update_with_cache(cache)
+        self.assertEqual(1, view.weather_id)
+        self.assertEqual(0, self.mon.weather_id)
+
+        view.geofence = "Park"
+        dts = view.generate_dts(Locale("en"), None, "metric")
+        self.assertEqual("Park", dts["geofence"])
+        self.assertEqual(1, dts["weather_id"])
+        dts = self.mon.view().generate_dts(Locale("en"), None, "metric")
+        self.assertEqual(Unknown.REGULAR, dts["geofence"])
+        self.assertEqual(0, dts["weather_id"])
+
+    def test_view_class(self):
+        view = self.mon.view()
+        self.assertEqual("MonEventView", type(view).__name__)
+        self.assertIn("weather_id", type(view).__slots__)
+        self.assertIs(self.mon.view().__class__, MonEvent._view_class)
+
+    def test_reads_without_getattr(self):
+        view = self.mon.view()
+        view.name = "Bulbasaur"
+        with mock.patch.object(EventView, "__getattr__") as getattr_:
+            self.assertEqual(1, view.monster_id)
+            self.assertEqual(100, view.iv)
+            self.assertEqual("Bulbasaur", view.name)
+            self.assertEqual(self.mon.lat, view.lat)
+            view.generate_dts  # Methods of the event too
+        getattr_.assert_not_called()
+        self.mon.iv = 50  # Not copied when the view was created
+        self.assertEqual(50, view.iv)
+
+
+class TestEventSlots(unittest.TestCase):
+    def test_no_dict(self):
+        for cls in BaseEvent.__subclasses__():
+            self.assertEqual(0, cls.__dictoffset__, cls.__name__)
+            self.assertEqual(0, cls._view_class.__dictoffset__, cls.__name__)
+        mon = test_monster_filter.TestMonsterFilter.gen_event(None, {})
+        self.assertFalse(hasattr(mon, "__dict__"))
+        with self.assertRaises(AttributeError):
+            mon.unknown = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
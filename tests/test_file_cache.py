@@ -0,0 +1,149 @@
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from PokeAlarm import config
+from PokeAlarm.Cache import FileCache
+
+
+class MockManager(object):
+    def get_name(self):
+        return "test"
+
+    def get_child_logger(self, name):
+        return logging.getLogger("test").getChild(name)
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.old_root = config["ROOT_PATH"]
+        config["ROOT_PATH"] = self.root
+        self.addCleanup(config.__setitem__, "ROOT_PATH", self.old_root)
+        self.file = os.path.join(self.root, "cache", "test.cache")
+
+    def test_journal(self):
+        cache = FileCache(MockManager())
+        self.assertTrue(os.path.isfile(self.file))
+        later = datetime.utcnow() + timedelta(hours=1)
+        cache.monster_expiration("a", later)
+        cache.monster_expiration("b", later)
+        cache.gym_name("gym", "Name")
+        cache.clean_and_save(wait=True)
+        self.assertTrue(os.path.isfile(self.file + ".journal"))
+
+        # Only changed keys are written
+        cache.gym_name("gym", "Name")
+        self.assertEqual([], cache._changes)
+        cache.monster_expiration("b", datetime.utcnow() - timedelta(hours=1))
+        cache.gym_name("gym", "Other")
+        cache.clean_and_save(wait=True)
+
+        cache = FileCache(MockManager())
+        self.assertEqual(later, cache.monster_expiration("a"))
+        self.assertIsNone(cache.monster_expiration("b"))
+        self.assertEqual("Other", cache.gym_name("gym"))
+        self.assertEqual(6, cache._journal_len)
+
+    def test_expire_after_load(self):
+        cache = FileCache(MockManager())
+        cache.monster_expiration("a", datetime.utcnow() + timedelta(seconds=1))
+        cache.clean_and_save(wait=True)
+        cache = FileCache(MockManager())
+        cache._clean_hist()
+        self.assertEqual(1, cache.stats()["mon_hist"]["heap"])
+        cache._mon_hist.expire(datetime.utcnow() + timedelta(seconds=2))
+        self.assertIsNone(cache.monster_expiration("a"))
+        cache.clean_and_save(wait=True)
+        cache = FileCache(MockManager())
+        self.assertIsNone(cache.monster_expiration("a"))
+
+    def test_compact(self):
+        cache = FileCache(MockManager())
+        cache.COMPACT_MIN = 2
+        for i in range(3):
+            cache.gym_team(str(i), i)
+        cache.clean_and_save(wait=True)
+        self.assertTrue(os.path.isfile(self.file + ".journal"))
+        # Journal becomes larger than the cache
+        cache.gym_team("0", 3)
+        cache.gym_team("1", 3)
+        cache.clean_and_save(wait=True)
+        self.assertFalse(os.path.isfile(self.file + ".journal"))
+        self.assertEqual(0, cache._journal_len)
+
+        cache = FileCache(MockManager())
+        self.assertEqual([3, 3, 2], [cache.gym_team(str(i)) for i in range(3)])
+
+    def test_evictions_saved(self):
+        cache = FileCache(MockManager())
+        cache._gyms.maxsize = 2
+        for gym_id in ["a", "b", "c"]:
+            cache.gym_name(gym_id, gym_id.upper())
+        cache.clean_and_save(wait=True)
+
+        cache = FileCache(MockManager())
+        self.assertEqual(["b", "c"], list(cache._gyms))
+        self.assertEqual("B", cache.gym_name("b"))
+
+    def test_interrupted_journal(self):
+        cache = FileCache(MockManager())
+        cache.gym_name("gym", "Name")
+        cache.clean_and_save(wait=True)
+        cache.gym_name("gym", "Other")
+        cache.clean_and_save(wait=True)
+        with open(self.file + ".journal", "r+b") as f:
+            f.truncate(os.path.getsize(self.file + ".journal") - 3)
+
+        cache = FileCache(MockManager())
+        self.assertEqual("Name", cache.gym_name("gym"))
+
+    def test_load_old_format(self):
+        later = datetime.utcnow() + timedelta(hours=1)
+        os.makedirs(os.path.dirname(self.file))
+        with open(self.file, "wb") as f:
+            pickle.dump(
+                {
+                    "mon_hist": {"a": later},
+                    "gym_team": {"gym": 2},
+                    "gym_name": {"gym": "Name"},
+                    "gym_desc": {"gym": "Desc"},
+                    "gym_image": {"gym": "https://image"},
+                    "cell_weather_id": {"cell": 3},
+                    "severity_id": {"cell": 1},
+                    "day_or_night_id": {"cell": 2},
+                    "quest_reward": {"stop": "reward"},
+                    "quest_task": {"stop": "task"},
+                },
+                f,
+            )
+        with open(self.file + ".journal", "wb") as f:
+            pickle.dump([("gym_name", "gym", "Other"), ("gym_team", "new", 1)], f)
+
+        cache = FileCache(MockManager())
+        self.assertEqual(later, cache.monster_expiration("a"))
+        self.assertEqual(2, cache.gym_team("gym"))
+        self.assertEqual("Other", cache.gym_name("gym"))
+        self.assertEqual("Desc", cache.gym_desc("gym"))
+        self.assertEqual("https://image", cache.gym_image("gym"))
+        self.assertEqual(1, cache.gym_team("new"))
+        self.assertEqual(3, cache.cell_weather_id("cell"))
+        self.assertEqual(1, cache.severity_id("cell"))
+        self.assertEqual(2, cache.day_or_night_id("cell"))
+        self.assertEqual(("reward", "task"), cache._quests["stop"][:2])
+
+        # Saved as records from now on
+        cache.COMPACT_MIN = 0
+        cache.gym_slots("gym", 4)
+        cache.clean_and_save(wait=True)
+        cache = FileCache(MockManager())
+        self.assertEqual((2, 4, "Other"), cache._gyms["gym"][:3])
+        self.assertEqual(("reward", "task"), cache._quests["stop"][:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
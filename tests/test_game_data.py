@@ -0,0 +1,96 @@
+import os
+import pickle
+import tempfile
+import unittest
+from unittest import mock
+from PokeAlarm.GameData import GameData
+
+
+class TestGameData(unittest.TestCase):
+    def setUp(self):
+        self.game_data = GameData()
+
+    def test_source_loaded_once(self):
+        base_stats = self.game_data.base_stats
+        self.assertIs(base_stats, self.game_data.base_stats)
+        # Tables of the same source are built in the same pass
+        self.assertIn("evolutions", self.game_data.__dict__)
+        self.assertNotIn("move_types", self.game_data.__dict__)
+
+    def test_stats(self):
+        self.game_data.cp_multipliers
+        stats = {s["table"]: s for s in self.game_data.stats()}
+        self.assertEqual({"cp_multipliers", "cp_multiplier_squares"}, set(stats))
+        for stat in stats.values():
+            self.assertEqual("cp_multipliers", stat["source"])
+            self.assertGreater(stat["size"], 0)
+            self.assertGreaterEqual(stat["parse_time"], 0)
+            self.assertGreaterEqual(stat["build_time"], 0)
+
+    def test_reload(self):
+        multipliers = self.game_data.cp_multipliers
+        self.game_data.reload()
+        self.assertEqual([], self.game_data.stats())
+        self.assertIsNot(multipliers, self.game_data.cp_multipliers)
+        self.assertEqual(multipliers, self.game_data.cp_multipliers)
+
+    def test_snapshot(self):
+        fd, path = tempfile.mkstemp(suffix=".pickle")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.game_data.SNAPSHOT_FILE = path
+        self.game_data.save_snapshot()
+
+        game_data = GameData()
+        game_data.SNAPSHOT_FILE = path
+        self.assertTrue(game_data.load_snapshot())
+        self.assertEqual(self.game_data.base_stats, game_data.base_stats)
+        self.assertEqual(self.game_data.move_dps, game_data.move_dps)
+        self.assertEqual(
+            {"snapshot"}, {s["source"] for s in game_data.stats()}, msg="no json"
+        )
+
+    def test_snapshot_outdated(self):
+        fd, path = tempfile.mkstemp(suffix=".pickle")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.game_data.SNAPSHOT_FILE = path
+        self.game_data.save_snapshot()
+
+        game_data = GameData()
+        game_data.SNAPSHOT_FILE = path
+        with mock.patch(
+            "PokeAlarm.GameData.data_signature", return_value={"data_version": "new"}
+        ):
+            self.assertFalse(game_data.load_snapshot())
+        self.assertEqual([], game_data.stats())
+
+        game_data.SNAPSHOT_FILE = path + ".missing"
+        self.assertFalse(game_data.load_snapshot())
+
+    def test_snapshot_corrupt(self):
+        fd, path = tempfile.mkstemp(suffix=".pickle")
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        self.game_data.SNAPSHOT_FILE = path
+        for data in [
+            b"",  # EOFError
+            b"cbuiltins\nno_such_name\n.",  # AttributeError
+            b"cno_such_module\nname\n.",  # ImportError
+            b"I1.5\n.",  # ValueError
+            b"cbuiltins\nlen\n)R.",  # TypeError
+            pickle.dumps(["not", "a", "snapshot"]),
+        ]:
+            with open(path, "wb") as f:
+                f.write(data)
+            with self.assertLogs("GameData", "WARNING"):
+                self.assertFalse(self.game_data.load_snapshot(), msg=data)
+        self.assertEqual(self.game_data.base_stats, GameData().base_stats)
+
+    def test_unknown_table(self):
+        with self.assertRaises(AttributeError):
+            self.game_data.not_a_table
+
+
+if __name__ == "__main__":
+    unittest.main()
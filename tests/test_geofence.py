@@ -0,0 +1,142 @@
+import math
+import os
+import random
+import tempfile
+import unittest
+from PokeAlarm.Geofence import (
+    Geofence,
+    Geofences,
+    EdgeArrays,
+    get_geofences,
+    np,
+    raycast,
+)
+
+
+class TestGeofenceIndex(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+        self.geofences = Geofences()
+        # Concave star with a collinear and a horizontal edge
+        star = []
+        for k in range(10):
+            r = 0.1 if k % 2 else 0.04
+            a = k * math.pi / 5
+            star.append([40.7 + r * math.cos(a), -74.0 + r * math.sin(a)])
+        star[3][1] = star[2][1]
+        self.geofences["Star"] = Geofence("Star", star)
+        self.geofences["Square"] = Geofence(
+            "Square", [[40.6, -74.1], [40.6, -73.95], [40.75, -73.95], [40.75, -74.1]]
+        )
+        self.geofences["Tiny"] = Geofence(
+            "Tiny", [[40.70, -74.0], [40.7001, -74.0], [40.7001, -73.9999]]
+        )
+        self.geofences.build_index()
+
+    def check(self, lat, lng):
+        expected = {
+            name for name, gf in self.geofences.items() if gf.contains(lat, lng)
+        }
+        self.assertEqual(
+            expected, self.geofences.containing(lat, lng), msg=f"{lat},{lng}"
+        )
+
+    def test_random_points(self):
+        for _ in range(20000):
+            self.check(random.uniform(40.55, 40.85), random.uniform(-74.15, -73.85))
+
+    def test_vertices_and_edges(self):
+        for gf in self.geofences.values():
+            points = gf.get_points()
+            for (ax, ay), (bx, by) in zip(points, points[1:] + points[:1]):
+                for t in [0.0, 0.25, 0.5, 1.0]:
+                    self.check(ax + t * (bx - ax), ay + t * (by - ay))
+
+    def test_outside(self):
+        self.assertEqual(frozenset(), self.geofences.containing(0.0, 0.0))
+        self.assertEqual(frozenset(), self.geofences.containing(-40.7, 74.0))
+
+    def test_index_rebuilt_on_change(self):
+        self.assertEqual({"Star", "Square"}, self.geofences.containing(40.7, -74.05))
+        del self.geofences["Square"]
+        self.assertEqual({"Star"}, self.geofences.containing(40.7, -74.05))
+
+
+class TestGetGeofences(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".txt")
+        os.close(fd)
+        self.write("[First]\n0,0\n0,1\n1,1\n", 1000000000)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def write(self, data, mtime):
+        with open(self.path, "w") as f:
+            f.write(data)
+        os.utime(self.path, (mtime, mtime))
+
+    def test_shared(self):
+        geofences = get_geofences(self.path)
+        self.assertEqual(["First"], list(geofences.keys()))
+        self.assertIs(geofences, get_geofences(self.path))
+        relative = os.path.relpath(self.path)
+        self.assertIs(geofences, get_geofences(relative))
+
+    def test_reloaded_when_modified(self):
+        geofences = get_geofences(self.path)
+        self.write("[Second]\n0,0\n0,1\n1,1\n", 1000000001)
+        reloaded = get_geofences(self.path)
+        self.assertIsNot(geofences, reloaded)
+        self.assertEqual(["Second"], list(reloaded.keys()))
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestGeofenceNumpy(unittest.TestCase):
+    def setUp(self):
+        random.seed(42)
+        # Same geofence as tests/filters/test_geofences.txt
+        self.new_york = Geofence(
+            "NewYork",
+            [
+                [40.48683230424025, -74.31541096584718],
+                [40.9655644121444, -73.92951619045655],
+                [40.9053923299183, -73.72489582912843],
+                [40.559904930284, -73.60679280178468],
+            ],
+        )
+        self.circle = Geofence(
+            "Circle",
+            [
+                [40.7 + 0.1 * math.cos(k / 50), -74.0 + 0.1 * math.sin(k / 50)]
+                for k in range(315)
+            ],
+        )
+
+    def points(self, gf):
+        min_x, max_x, min_y, max_y = gf.get_bounds()
+        points = [
+            (random.uniform(min_x, max_x), random.uniform(min_y, max_y))
+            for _ in range(5000)
+        ]
+        for x1, y1, x2, y2 in gf.get_edges():
+            points += [(x1, y1), ((x1 + x2) / 2, (y1 + y2) / 2)]
+        return points
+
+    def test_raycast(self):
+        for gf in [self.new_york, self.circle]:
+            edges = EdgeArrays(gf.get_edges())
+            for x, y in self.points(gf):
+                self.assertEqual(raycast(x, y, gf.get_edges()), edges.raycast(x, y))
+
+    def test_contains_many(self):
+        for gf in [self.new_york, self.circle]:
+            points = self.points(gf) + [(0.0, 0.0), (41.0, -74.0)]
+            expected = [raycast(x, y, gf.get_edges()) for x, y in points]
+            xs, ys = zip(*points)
+            self.assertEqual(expected, gf.contains_many(xs, ys))
+            self.assertEqual(expected, [gf.contains(x, y) for x, y in points])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+from itertools import product
+from unittest import mock
+from PokeAlarm.Utilities import PvpUtils
 from PokeAlarm.Utilities.PvpUtils import get_pvp_info
 
 
@@ -17,6 +20,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(133, 0, 1, 15, 15, 14)
 
         self.assertEqual(100.0, g_rating, msg="great league rating")
@@ -47,6 +52,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(197, 0, 0, 15, 14, 25)
 
         self.assertEqual(100.0, g_rating, msg="great league rating")
@@ -77,6 +84,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(454, 0, 0, 15, 12, 5)
 
         self.assertEqual(98.03, g_rating, msg="great league rating")
@@ -107,6 +116,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(183, 0, 0, 15, 15, 9)
 
         self.assertEqual(100.0, g_rating, msg="great league rating")
@@ -137,6 +148,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(412, 118, 0, 15, 15, 23)
 
         self.assertEqual(100.0, g_rating, msg="great league rating")
@@ -167,6 +180,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(412, 999999, 0, 15, 15, 23)
 
         self.assertEqual(0.0, g_rating, msg="great league rating")
@@ -197,6 +212,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(487, 90, 0, 14, 15, 20)
 
         self.assertEqual(0.0, g_rating, msg="great league rating")
@@ -227,6 +244,8 @@ class TestGetPvpInfo(unittest.TestCase):
             u_level,
             u_candy,
             u_stardust,
+            g_rank,
+            u_rank,
         ) = get_pvp_info(487, 91, 0, 14, 15, 20)
 
         self.assertEqual(0.0, g_rating, msg="great league rating")
@@ -244,5 +263,92 @@ class TestGetPvpInfo(unittest.TestCase):
         self.assertEqual(31000, u_stardust, msg="ultra league stardust")
 
 
+class TestPvpCache(unittest.TestCase):
+    def setUp(self):
+        PvpUtils._pvp_info.clear()
+        PvpUtils._precomputed.clear()
+        self.addCleanup(PvpUtils._precomputed.clear)
+        self.addCleanup(PvpUtils.set_cache_size, PvpUtils.PVP_CACHE_SIZE)
+
+    def test_hits_and_misses(self):
+        info = get_pvp_info(147, 0, 1, 15, 15, 14)
+        self.assertEqual(info, PvpUtils.calculate_pvp_info(147, 0, 1, 15, 15, 14))
+        self.assertIs(info, get_pvp_info(147, 0, 1, 15, 15, 14))
+        get_pvp_info(147, 0, 1, 15, 15, 15)
+        stats = PvpUtils.cache_stats()
+        self.assertEqual((1, 2, 2), (stats["hits"], stats["misses"], stats["size"]))
+
+    def test_eviction(self):
+        PvpUtils.set_cache_size(2)
+        for lvl in range(1, 5):
+            get_pvp_info(133, 0, 0, 0, 0, lvl)
+        self.assertEqual(2, PvpUtils.cache_stats()["size"])
+        get_pvp_info(133, 0, 0, 0, 0, 4)
+        get_pvp_info(133, 0, 0, 0, 0, 1)
+        self.assertEqual(1, PvpUtils.cache_stats()["hits"])
+
+        PvpUtils.set_cache_size(0)
+        self.assertEqual(0, PvpUtils.cache_stats()["size"])
+        get_pvp_info(133, 0, 0, 0, 0, 1)
+        self.assertEqual(0, PvpUtils.cache_stats()["size"])
+
+    def test_precompute(self):
+        PvpUtils.precompute_ratings([1])
+        # Both forms of the monster and their evolutions, for both leagues
+        self.assertEqual(4 * 2, PvpUtils.cache_stats()["precomputed"])
+        with mock.patch.object(PvpUtils, "np", None):
+            for ivs in [(0, 0, 0), (1, 15, 15), (15, 15, 15)]:
+                self.assertEqual(
+                    PvpUtils.calculate_rating(1500, 2, 0, *ivs),
+                    PvpUtils.pokemon_rating(1500, 2, 0, *ivs),
+                )
+                self.assertIsInstance(PvpUtils.pokemon_rank(1500, 2, 0, *ivs), int)
+            self.assertIsNone(PvpUtils.pokemon_rank(1500, 147, 0, 0, 0, 0))
+
+
+class TestRankTable(unittest.TestCase):
+    def setUp(self):
+        PvpUtils._rank_tables.clear()
+
+    def check_table(self, table, limit, monster_id, form_id):
+        ratings = []
+        for atk, de, sta in product(range(16), repeat=3):
+            rating = PvpUtils.calculate_rating(limit, monster_id, form_id, atk, de, sta)
+            self.assertEqual(rating, table.rating(atk, de, sta))
+            ratings.append((rating[0], table.rank(atk, de, sta)))
+        # Rank 1 is the highest product, equal products share a rank
+        ratings.sort(key=lambda r: -r[0])
+        self.assertEqual(ratings[0][0], table.best_product)
+        first = {}
+        for i, (p, rank) in enumerate(ratings):
+            self.assertEqual(first.setdefault(p, i + 1), rank)
+
+    def test_python_table(self):
+        with mock.patch.object(PvpUtils, "np", None):
+            table = PvpUtils.RankTable.build(1500, 148, 0)
+        self.check_table(table, 1500, 148, 0)
+
+    @unittest.skipIf(PvpUtils.np is None, "NumPy is not installed")
+    def test_numpy_table(self):
+        for limit in PvpUtils.LEAGUES:
+            for monster_id, form_id in [(1, 0), (3, 0), (133, 2000), (149, 0)]:
+                table = PvpUtils.RankTable.build(limit, monster_id, form_id)
+                self.check_table(table, limit, monster_id, form_id)
+
+    @unittest.skipIf(PvpUtils.np is None, "NumPy is not installed")
+    def test_rank_in_pvp_info(self):
+        info = get_pvp_info(133, 0, 1, 15, 15, 1)
+        great_id, ultra_id = info[1], info[7]
+        evolutions = dict([(133, 0)] + PvpUtils.utils.get_evolutions(133, 0))
+        self.assertEqual(
+            PvpUtils.rank_table(1500, great_id, evolutions[great_id]).rank(1, 15, 15),
+            info[12],
+        )
+        self.assertEqual(
+            PvpUtils.rank_table(2500, ultra_id, evolutions[ultra_id]).rank(1, 15, 15),
+            info[13],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
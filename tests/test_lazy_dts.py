@@ -0,0 +1,203 @@
+import logging
+import unittest
+from unittest import mock
+from PokeAlarm.Alarms import Alarm, Template, alarm_factory
+from PokeAlarm.Events import LazyDts, MonEvent
+from PokeAlarm.Locale import Locale
+from PokeAlarm.Utils import get_dts_keys
+from tests.filters import test_monster_filter
+
+
+class MockManager(object):
+    def get_child_logger(self, name):
+        return logging.getLogger("test").getChild(name)
+
+
+class TestLazyDts(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def compute(self, *values):
+        def func():
+            self.calls.append(values)
+            return values if len(values) > 1 else values[0]
+
+        return func
+
+    def test_computed_once_when_read(self):
+        dts = LazyDts()
+        dts["mon_name"] = "Eevee"
+        dts.lazy(("time_left", "12h_time"), self.compute("5m", "2:00pm"))
+        dts.lazy("max_cp", self.compute(1000))
+        self.assertEqual({"mon_name", "time_left", "12h_time", "max_cp"}, set(dts))
+        self.assertEqual([], self.calls)
+        self.assertEqual("2:00pm", dts["12h_time"])
+        self.assertEqual("5m", dts["time_left"])
+        self.assertEqual([("5m", "2:00pm")], self.calls)
+        self.assertIn("max_cp", dts)
+        self.assertNotIn("min_cp", dts)
+        with self.assertRaises(KeyError):
+            dts["min_cp"]
+
+    def test_compute(self):
+        dts = LazyDts()
+        dts.lazy("max_cp", self.compute(1000))
+        dts.lazy("min_cp", self.compute(10))
+        dts.compute(["max_cp", "unknown"])
+        self.assertEqual([(1000,)], self.calls)
+        self.assertEqual(1000, dts["max_cp"])
+
+    def test_overridden(self):
+        dts = LazyDts({"family": "custom", "mon_name": "custom"})
+        dts["mon_name"] = "Eevee"
+        dts.lazy(("time_left", "12h_time"), self.compute("5m", "2:00pm"))
+        dts["time_left"] = "gmaps"
+        self.assertEqual("gmaps", dts["time_left"])
+        self.assertEqual("2:00pm", dts["12h_time"])
+        self.assertEqual("Eevee", dts["mon_name"])
+        self.assertEqual("custom", dts["family"])
+
+    def test_custom_dts_use_event_dts(self):
+        dts = LazyDts({"family": "<mon_name> (<other>) <unknown>", "other": "<family>"})
+        dts["mon_name"] = "Eevee"
+        self.assertEqual("Eevee (<other>) <unknown>", dts["family"])
+        self.assertEqual("<family>", dts["other"])
+
+    def test_base(self):
+        base = LazyDts()
+        base["mon_name"] = "Eevee"
+        base.lazy("max_cp", self.compute(1000))
+        dts = LazyDts({"family": "<mon_name> <geofence>", "mon_name": "x"}, base)
+        dts["geofence"] = "Park"
+        self.assertEqual({"mon_name", "max_cp", "family", "geofence"}, set(dts))
+        self.assertEqual(4, len(dts))
+        self.assertEqual("Eevee Park", dts["family"])
+        dts.compute(["max_cp"])
+        self.assertEqual([(1000,)], self.calls)
+        self.assertEqual(1000, base["max_cp"])
+        dts["mon_name"] = "Vaporeon"
+        self.assertEqual("Vaporeon", dts["mon_name"])
+        self.assertEqual("Eevee", base["mon_name"])
+        self.assertNotIn("geofence", base)
+        with self.assertRaises(KeyError):
+            del dts["max_cp"]
+
+
+class TestDtsMemo(unittest.TestCase):
+    def setUp(self):
+        ivs = {
+            "individual_attack": 15,
+            "individual_defense": 15,
+            "individual_stamina": 15,
+        }
+        self.mon = test_monster_filter.TestMonsterFilter.gen_event(None, ivs)
+        self.calls = 0
+        generate_dts = MonEvent._generate_dts
+
+        def count(*args):
+            self.calls += 1
+            return generate_dts(*args)
+
+        patcher = mock.patch.object(MonEvent, "_generate_dts", count)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_shared_by_rules(self):
+        self.mon.custom_dts = {"rule": "first"}
+        self.mon.geofence = "Park"
+        first = self.mon.generate_dts(Locale("en"), None, "metric")
+        self.mon.custom_dts = {"rule": "second"}
+        self.mon.geofence = "Downtown"
+        second = self.mon.generate_dts(Locale("en"), None, "metric")
+        self.assertEqual(1, self.calls)
+        self.assertEqual(("first", "Park"), (first["rule"], first["geofence"]))
+        self.assertEqual(("second", "Downtown"), (second["rule"], second["geofence"]))
+        self.assertEqual(first["mon_name"], second["mon_name"])
+        second["mon_name"] = "Changed"  # Only for this rule
+        self.assertEqual("Bulbasaur", first["mon_name"])
+
+    def test_by_locale_units_and_manager(self):
+        self.mon.generate_dts(Locale("en"), None, "metric")
+        german = self.mon.generate_dts(Locale("de"), None, "metric")
+        self.mon.generate_dts(Locale("en"), None, "imperial")
+        self.mon.distance = 100
+        dts = self.mon.generate_dts(Locale("en"), None, "metric")
+        self.assertEqual(4, self.calls)
+        self.assertEqual("Bisasam", german["mon_name"])
+        self.assertEqual("100.0m", dts["distance"])
+
+
+class TestReplace(unittest.TestCase):
+    def test_only_used_dts_computed(self):
+        dts = LazyDts()
+        dts["mon_name"] = "Eevee"
+        dts["iv"] = 100.0
+        dts.lazy("max_cp", lambda: self.fail("Not used."))
+        self.assertEqual(
+            "<b>Eevee</b> 100.0% <mon_name",
+            Alarm.replace("<b><mon_name></b> <iv>% <mon_name", dts),
+        )
+        self.assertIsNone(Alarm.replace(None, dts))
+
+    def test_monster_dts(self):
+        ivs = {
+            "individual_attack": 15,
+            "individual_defense": 15,
+            "individual_stamina": 15,
+        }
+        mon = test_monster_filter.TestMonsterFilter.gen_event(None, ivs)
+        dts = mon.generate_dts(Locale("en"), None, "metric")
+        self.assertEqual(
+            "Bulbasaur https://pvpoke.com/rankings/all/1500/overall/bulbasaur/",
+            Alarm.replace("<mon_name> <great_pvpoke>", dts),
+        )
+
+    def test_template(self):
+        template = Template("<mon_name> <iv>% <unknown>")
+        self.assertEqual("<mon_name> <iv>% <unknown>", template)
+        self.assertEqual(
+            ["", "mon_name", " ", "iv", "% ", "unknown", ""], template._parts
+        )
+        dts = {"mon_name": "Eevee", "iv": 100.0}
+        self.assertEqual("Eevee 100.0% <unknown>", template.render(dts))
+        self.assertEqual("Eevee 100.0% <unknown>", Alarm.replace(template, dts))
+        self.assertEqual("No DTS", Template("No DTS").render(dts))
+
+    def test_alert_settings_parsed(self):
+        settings = {
+            "type": "discord",
+            "webhook_url": "https://discord.com/api/webhooks/<family>",
+            "monsters": {"fields": [{"name": "<cp>", "value": "<iv>"}]},
+        }
+        alarm = alarm_factory(MockManager(), settings, 3, None, None)
+        alert = alarm._DiscordAlarm__monsters
+        self.assertIsInstance(alert["webhook_url"], Template)
+        self.assertIsInstance(alert["title"], Template)
+        self.assertIsInstance(alert["fields"][0]["value"], Template)
+        self.assertIs(False, alert["disable_embed"])
+
+
+class TestDtsKeys(unittest.TestCase):
+    def test_get_dts_keys(self):
+        settings = {
+            "title": "<mon_name> <iv>%",
+            "fields": [{"name": "<cp>", "value": "CP"}],
+            "max_attempts": 3,
+        }
+        self.assertEqual({"mon_name", "iv", "cp"}, get_dts_keys(settings))
+
+    def test_alarm_dts_keys(self):
+        settings = {
+            "type": "discord",
+            "webhook_url": "https://discord.com/api/webhooks/<family>",
+            "monsters": {"title": "<mon_name> <iv>%"},
+        }
+        alarm = alarm_factory(MockManager(), settings, 3, None, None)
+        self.assertTrue({"family", "mon_name", "iv"} <= alarm.dts_keys)
+        # Templates of the default alerts are included
+        self.assertIn("raid_time_left", alarm.dts_keys)
+        self.assertNotIn("max_cp", alarm.dts_keys)
+
+
+if __name__ == "__main__":
+    unittest.main()
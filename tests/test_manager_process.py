@@ -0,0 +1,39 @@
+import socket
+import unittest
+import gevent
+from gevent.queue import Queue
+from PokeAlarm.ManagerProcess import ManagerProcess, read_frames
+
+
+class TestManagerProcess(unittest.TestCase):
+    def setUp(self):
+        self.worker = ManagerProcess("group")
+        self.worker._sock, child_sock = socket.socketpair()
+        self.child_fd = child_sock.detach()
+
+    def test_frames_sent(self):
+        self.worker._writer = gevent.spawn(self.worker._write)
+        self.worker.send(b'{"type": "pokemon", "message": {}}')
+        self.worker.send(b'[{"type": "raid"}, {"type": "egg"}]')
+        self.worker.stop()
+        self.worker._writer.join(timeout=5)
+        frames = Queue()
+        read_frames(self.child_fd, frames)
+        self.assertEqual(
+            ["pokemon", "raid", "egg"],
+            [frames.get()["type"] for _ in range(frames.qsize())],
+        )
+
+    def test_full_queue_drops(self):
+        self.worker._writer = gevent.spawn(lambda: None)  # Child not reading
+        for _ in range(ManagerProcess.MAX_QUEUED):
+            self.worker.send(b"{}")
+        with self.assertLogs("pokealarm.webserver", "WARNING"):
+            self.worker.send(b"{}")  # Dropped instead of blocking
+        self.assertEqual(ManagerProcess.MAX_QUEUED, self.worker._queue.qsize())
+        self.worker.stop()
+        socket.socket(fileno=self.child_fd).close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+import socketserver
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from PokeAlarm import config, Unknown
+from PokeAlarm.Cache import Cache, RedisCache
+from PokeAlarm.Cache.RedisCache import RedisClient, RedisError, RedisProtocolError
+from tests.test_file_cache import MockManager
+from tests import test_sqlite_cache
+
+
+class StandInServer(socketserver.ThreadingTCPServer):
+    """Server answering the commands used by RedisCache like Redis would."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        socketserver.ThreadingTCPServer.__init__(self, ("127.0.0.1", 0), RespHandler)
+        self.data = {}
+        self.expires = {}  # key -> time.time() it expires at
+        self.commands = []  # Commands received, in order
+        self.lock = threading.Lock()
+
+    def url(self, db=0):
+        return f"redis://:secret@127.0.0.1:{self.server_address[1]}/{db}"
+
+    def get(self, key):
+        if key in self.expires and self.expires[key] <= time.time():
+            del self.data[key], self.expires[key]
+        return self.data.get(key)
+
+    def run(self, command):
+        name, args = command[0].upper(), command[1:]
+        if name == b"AUTH":
+            return b"+OK" if args[0] == b"secret" else b"-ERR invalid password"
+        if name in (b"SELECT", b"PING"):
+            return b"+OK"
+        if name == b"SET":
+            options = [arg.upper() for arg in args]
+            if b"NX" in options and self.get(args[0]) is not None:
+                return b"$-1"
+            self.data[args[0]] = args[1]
+            self.expires.pop(args[0], None)
+            if b"PX" in options:
+                ttl = int(args[options.index(b"PX") + 1])
+                self.expires[args[0]] = time.time() + ttl / 1000
+            return b"+OK"
+        if name == b"GET":
+            return bulk(self.get(args[0]))
+        if name == b"HSET":
+            self.get(args[0])
+            self.data.setdefault(args[0], {})[args[1]] = args[2]
+            return b":1"
+        if name == b"HMGET":
+            fields = self.get(args[0]) or {}
+            replies = [bulk(fields.get(field)) for field in args[1:]]
+            return b"*%d\r\n" % len(replies) + b"\r\n".join(replies)
+        if name == b"PEXPIRE":
+            if self.get(args[0]) is None:
+                return b":0"
+            self.expires[args[0]] = time.time() + int(args[1]) / 1000
+            return b":1"
+        if name == b"BREAK":  # Reply not in the protocol
+            return b"?"
+        return b"-ERR unknown command '%s'" % name
+
+
+def bulk(value):
+    if value is None:
+        return b"$-1"
+    return b"$%d\r\n%s" % (len(value), value)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            with self.server.lock:
+                self.server.commands.append(command)
+                reply = self.server.run(command)
+            self.wfile.write(reply + b"\r\n")
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+
+class TestRedisCache(unittest.TestCase):
+    def setUp(self):
+        self.server = StandInServer()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        config["REDIS_URL"] = self.server.url()
+        self.addCleanup(config.pop, "REDIS_URL")
+        self.now = datetime.utcnow()
+
+    fill = test_sqlite_cache.TestSqliteCache.fill
+    values = test_sqlite_cache.TestSqliteCache.values
+
+    def test_same_as_mem_cache(self):
+        mem, redis = Cache(MockManager()), RedisCache(MockManager())
+        self.fill(mem)
+        self.fill(redis)
+        self.assertEqual(self.values(mem), self.values(redis))
+        redis.clean_and_save()
+        self.assertEqual(self.values(mem), self.values(redis))
+        self.assertEqual(("reward", "task", self.now), redis.quest_reward("stop"))
+
+    def test_shared_between_instances(self):
+        first, second = RedisCache(MockManager()), RedisCache(MockManager())
+        self.fill(first)
+        self.assertEqual(
+            self.now + timedelta(minutes=5), second.monster_expiration("mon")
+        )
+        self.assertEqual(Unknown.TINY, second.gym_team("gym"))  # Not sent yet
+        first.clean_and_save()
+        self.assertEqual(self.values(first), self.values(second))
+        self.assertEqual(("reward", "task", self.now), second.quest_reward("stop"))
+
+    def test_pipelined(self):
+        cache = RedisCache(MockManager())
+        pipelines = []
+        execute = cache._client.execute
+        cache._client.execute = lambda *cmds: pipelines.append(cmds) or execute(*cmds)
+        self.fill(cache)
+        self.assertEqual(3, len(pipelines))  # History values are sent at once
+        pipelines.clear()
+        cache.clean_and_save()
+        self.assertEqual(1, len(pipelines))
+        # Three records with their expiration set once
+        self.assertEqual(10, len(pipelines[0]))
+        self.assertEqual({}, cache._pending)
+
+    def test_expiration(self):
+        cache = RedisCache(MockManager())
+        cache.monster_expiration("mon", self.now + timedelta(hours=1))
+        cache.monster_expiration("old", self.now - timedelta(hours=1))
+        cache.gym_team("gym", 1)
+        cache.clean_and_save()
+        ttl = {
+            key.decode(): expires - time.time()
+            for key, expires in self.server.expires.items()
+        }
+        self.assertAlmostEqual(3600, ttl["pokealarm:test:mon:mon"], delta=5)
+        self.assertAlmostEqual(300, ttl["pokealarm:test:mon:old"], delta=5)
+        self.assertAlmostEqual(7 * 86400, ttl["pokealarm:test:gym:gym"], delta=5)
+
+    def test_processed_once(self):
+        first, second = RedisCache(MockManager()), RedisCache(MockManager())
+        expiration = self.now + timedelta(hours=1)
+        self.assertFalse(first.processed("monster", "mon", expiration))
+        self.assertTrue(second.processed("monster", "mon", expiration))
+        self.assertTrue(first.processed("monster", "mon", expiration))
+        self.assertFalse(second.processed("raid", "mon", expiration))
+        self.assertEqual(expiration, second.monster_expiration("mon"))
+        set_nx = [cmd for cmd in self.server.commands if b"NX" in cmd]
+        self.assertEqual(4, len(set_nx))
+
+    def test_protocol_error(self):
+        client = RedisClient(self.server.url())
+        with self.assertRaises(RedisError):
+            client.execute(("UNKNOWN",), ("SET", "key", "value"))
+        self.assertIsNotNone(client._sock)  # Still in sync with the server
+        with self.assertRaises(RedisProtocolError):
+            client.execute(("BREAK",), ("GET", "key"))
+        self.assertIsNone(client._sock)  # GET reply left unread
+        self.assertEqual(
+            ["OK", b"other"], client.execute(("SET", "key", "other"), ("GET", "key"))
+        )
+        client.close()
+
+    def test_server_down(self):
+        cache = RedisCache(MockManager())
+        cache.gym_team("gym", 1)
+        self.server.shutdown()
+        self.server.server_close()
+        cache._client.close()
+        cache.clean_and_save()
+        self.assertEqual(1, len(cache._pending))  # Kept to be sent later
+        self.assertEqual(1, cache.gym_team("gym"))
+        self.assertEqual(Unknown.TINY, cache.gym_team("other"))
+        self.assertIsNone(cache.monster_expiration("mon"))
+        self.assertFalse(cache.processed("monster", "mon", self.now))
+        self.assertTrue(cache.processed("monster", "mon", self.now))
+
+    def test_pending_capped(self):
+        cache = RedisCache(MockManager())
+        cache.MAX_PENDING = 3
+        self.server.shutdown()
+        self.server.server_close()
+        cache._client.close()
+        for gym_id in range(5):
+            cache.gym_team(gym_id, 1)
+        cache.clean_and_save()
+        self.assertEqual(3, len(cache._pending))
+        self.assertEqual(Unknown.TINY, cache.gym_team(0))  # Oldest dropped
+        self.assertEqual(1, cache.gym_team(4))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from PokeAlarm import config, Unknown
+from PokeAlarm.Cache import Cache, SqliteCache
+from tests.test_file_cache import MockManager
+
+
+class TestSqliteCache(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+        self.old_root = config["ROOT_PATH"]
+        config["ROOT_PATH"] = self.root
+        self.addCleanup(config.__setitem__, "ROOT_PATH", self.old_root)
+        self.now = datetime.utcnow()
+
+    def fill(self, cache):
+        now = self.now
+        cache.monster_expiration("mon", now + timedelta(minutes=5))
+        cache.monster_expiration("old", now - timedelta(minutes=5))
+        cache.quest_expiration("stop", now.replace(microsecond=123456))
+        cache.gym_team("gym", 2)
+        cache.gym_slots("gym", 0)
+        cache.gym_name("gym", "Name")
+        cache.gym_name("gym", Unknown.REGULAR)
+        cache.cell_weather_id(9749618446378729472, 3)
+        cache.quest_reward("stop", "reward", "task", now)
+
+    def values(self, cache):
+        return [
+            cache.monster_expiration("mon"),
+            cache.monster_expiration("old"),
+            cache.monster_expiration("missing"),
+            cache.quest_expiration("stop"),
+            cache.gym_team("gym"),
+            cache.gym_team("missing"),
+            cache.gym_slots("gym"),
+            cache.gym_name("gym"),
+            cache.gym_desc("gym"),
+            cache.gym_image("gym"),
+            cache.cell_weather_id(9749618446378729472),
+            cache.severity_id(9749618446378729472),
+        ]
+
+    def test_same_as_mem_cache(self):
+        mem, sqlite = Cache(MockManager()), SqliteCache(MockManager())
+        self.fill(mem)
+        self.fill(sqlite)
+        self.assertEqual(self.values(mem), self.values(sqlite))
+        mem.clean_and_save()
+        sqlite.clean_and_save()
+        self.assertEqual(self.values(mem), self.values(sqlite))
+        self.assertIsNone(sqlite.monster_expiration("old"))
+        self.assertEqual(
+            mem.stats()["mon_hist"]["size"], sqlite.stats()["mon_hist"]["size"]
+        )
+        self.assertEqual({"size": 1, "evicted": 1}, sqlite.stats()["mon_hist"])
+        self.assertEqual(("reward", "task", self.now), sqlite.quest_reward("stop"))
+
+    def test_persisted(self):
+        cache = SqliteCache(MockManager())
+        self.fill(cache)
+        cache.clean_and_save(wait=True)
+        expected = self.values(cache)
+        self.assertTrue(os.path.isfile(os.path.join(self.root, "cache", "test.sqlite")))
+        cache = SqliteCache(MockManager())
+        self.assertEqual(expected, self.values(cache))
+        self.assertEqual(("reward", "task", self.now), cache.quest_reward("stop"))
+
+    def test_batched_commit(self):
+        cache = SqliteCache(MockManager())
+        cache.gym_team("gym", 1)
+        other = SqliteCache(MockManager())
+        self.assertEqual(Unknown.TINY, other.gym_team("gym"))
+        cache._timer.join()  # Committed once the interval passed
+        self.assertEqual(1, other.gym_team("gym"))
+        self.assertIsNone(cache._timer)
+
+
+if __name__ == "__main__":
+    unittest.main()
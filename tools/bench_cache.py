@@ -0,0 +1,81 @@
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+
+class BenchManager(object):
+    """Bare manager providing what Caches need."""
+
+    def get_name(self):
+        return "bench"
+
+    def get_child_logger(self, name):
+        return logging.getLogger("bench").getChild(name)
+
+
+class CacheBench:
+    def __init__(self, kinds, entries=50000):
+        now = datetime.utcnow()
+        self.ids = [str(random.getrandbits(63)) for _ in range(entries)]
+        self.expirations = [
+            now + timedelta(seconds=random.randint(60, 3600)) for _ in self.ids
+        ]
+        print(f"Entries: {entries}")
+
+        root = tempfile.mkdtemp()
+        config["ROOT_PATH"] = root
+        try:
+            for name in kinds:
+                self.run(name)
+        finally:
+            shutil.rmtree(root)
+
+    def run(self, name):
+        start = time.perf_counter()
+        cache = cache_factory(BenchManager(), name)
+        opened = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for id_, expiration in zip(self.ids, self.expirations):
+            cache.monster_expiration(id_, expiration)
+            cache.gym_team(id_, 1)
+        writes = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache.clean_and_save(wait=True)
+        saved = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for id_ in self.ids:
+            cache.monster_expiration(id_)
+            cache.gym_team(id_)
+        reads = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache_factory(BenchManager(), name)
+        reopened = time.perf_counter() - start
+
+        count = 2 * len(self.ids)
+        print(
+            f"{name:>8}: open {opened * 1000:.1f} ms, "
+            f"{count / writes:,.0f} writes/s, "
+            f"{count / reads:,.0f} reads/s, "
+            f"save {saved * 1000:.1f} ms, "
+            f"reopen {reopened * 1000:.1f} ms"
+        )
+
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from PokeAlarm import config
+    from PokeAlarm.Cache import cache_factory
+
+    # The redis cache type needs a server, set by REDIS_URL
+    if "REDIS_URL" in os.environ:
+        config["REDIS_URL"] = os.environ["REDIS_URL"]
+    CacheBench(sys.argv[1:] or ["mem", "file", "sqlite"])
@@ -0,0 +1,84 @@
+import gc
+import os
+import random
+import sys
+import time
+import timeit
+import tracemalloc
+
+
+class EventBench:
+    def __init__(self, events=100000, frames=1000):
+        # Replay of distinct webhook frames, as parsed from the payload
+        payload = JsonBench.payload(frames)
+        replay = [payload[i % frames] for i in range(events)]
+        for frame in payload:  # Load game data and PvP info before measuring
+            Events.event_factory(frame)
+        print(f"Events: {events} ({frames} distinct frames)")
+
+        gc.collect()
+        start = time.perf_counter()
+        built = [Events.event_factory(frame) for frame in replay]
+        elapsed = time.perf_counter() - start
+        gc.collect()
+        start = time.perf_counter()
+        gc.collect()
+        collect = time.perf_counter() - start
+        del built
+
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        built = [Events.event_factory(frame) for frame in replay]
+        size = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+
+        print(f"Construction: {elapsed:.2f} s ({elapsed / events * 1e6:.1f} us/event)")
+        print(
+            f"Memory: {size / 1024 ** 2:.1f} MiB ({size / events:.0f} bytes/event), "
+            f"full collection {collect * 1000:.1f} ms"
+        )
+        print(f"Layout: {type(built[0]).__name__} uses {self.layout(built[0])}")
+        self.filter_path(built[:10000])
+
+    @staticmethod
+    def filter_path(events, rounds=5):
+        """Prints the cost of checking events and their views of a Manager."""
+        views = [event.view() for event in events]
+        for view in views:  # Set by the Manager before filtering
+            view.name = view.name
+            view.distance = random.uniform(0, 5000)
+        for name, settings in FilterBench.SETTINGS.items():
+            filt = Filters.MonFilter(BenchManager(), name, dict(settings))
+            results = []
+            for checked in (events, views):
+                best = min(
+                    timeit.repeat(
+                        lambda: [filt.check_event(e) for e in checked],
+                        number=1,
+                        repeat=rounds,
+                    )
+                )
+                results.append(best / len(checked) * 1e9)
+            print(
+                f"Filter {name:>8}: {results[0]:.0f} ns event, {results[1]:.0f} ns "
+                f"view per check ({results[1] / results[0]:.2f}x)"
+            )
+
+    @staticmethod
+    def layout(event):
+        if hasattr(event, "__dict__"):
+            return f"a __dict__ of {len(vars(event))} attributes"
+        slots = sum(
+            len(cls.__dict__.get("__slots__", ())) for cls in type(event).__mro__
+        )
+        return f"__slots__ for {slots} attributes"
+
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from PokeAlarm import Events
+    import PokeAlarm.Filters as Filters
+    from tools.bench_filters import BenchManager, FilterBench
+    from tools.bench_json import JsonBench
+
+    EventBench()
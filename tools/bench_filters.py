@@ -0,0 +1,87 @@
+import logging
+import os
+import random
+import sys
+import timeit
+from types import SimpleNamespace
+
+
+class BenchManager(object):
+    """Bare manager providing what Filters need at load time."""
+
+    def get_child_logger(self, name):
+        return logging.getLogger("bench").getChild(name)
+
+
+class FilterBench:
+    # Settings modeled on the ones exercised by tests/filters
+    SETTINGS = {
+        "monsters": {"monsters": [1, 4, 7, 25, 147, 149]},
+        "iv": {"min_iv": 90, "max_iv": 100, "min_cp": 10, "max_cp": 4000},
+        "pvp": {"min_great": 1, "max_great": 10, "min_cp_great": 1400},
+        "mixed": {
+            "monsters_exclude": [13, 16, 19],
+            "min_atk": 10,
+            "min_def": 10,
+            "min_sta": 10,
+            "genders": ["male", "female"],
+            "max_dist": 2000,
+            "min_time_left": 300,
+            "is_missing_info": False,
+        },
+    }
+
+    def __init__(self, events=10000, rounds=5):
+        mgr = BenchManager()
+        events = [self.event() for _ in range(events)]
+        print(f"Events: {len(events)}")
+
+        for name, settings in self.SETTINGS.items():
+            filt = Filters.MonFilter(mgr, name, dict(settings))
+            results = []
+            for check in (filt.check_event_list, filt.check_event):
+                best = min(
+                    timeit.repeat(
+                        lambda: [check(e) for e in events], number=1, repeat=rounds
+                    )
+                )
+                results.append(best / len(events) * 1e9)
+            assert [filt.check_event_list(e) for e in events] == [
+                filt.check_event(e) for e in events
+            ], f"Compiled filter '{name}' disagrees with its check list"
+            print(
+                f"{name:>8}: {results[0]:.0f} ns list, {results[1]:.0f} ns compiled "
+                f"per event ({results[0] / results[1]:.2f}x)"
+            )
+            print(
+                " " * 10
+                + ", ".join(
+                    f"{s['check']} {s['rejected'] / max(s['evaluated'], 1):.0%}"
+                    for s in filt.check_stats()
+                )
+            )
+
+    @staticmethod
+    def event():
+        unknown = random.random() < 0.1
+        return SimpleNamespace(
+            name="bench",
+            monster_id=random.randint(1, 151),
+            atk_iv="?" if unknown else random.randint(0, 15),
+            def_iv=random.randint(0, 15),
+            sta_iv=random.randint(0, 15),
+            iv=random.uniform(0, 100),
+            cp=random.randint(10, 3500),
+            great_product=random.randint(1, 100),
+            great_cp=random.randint(500, 1500),
+            gender=random.choice(["♂", "♀", "⚲"]),
+            distance=random.uniform(0, 5000),
+            time_left=random.randint(0, 3600),
+        )
+
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    import PokeAlarm.Filters as Filters
+
+    FilterBench()
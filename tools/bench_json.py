@@ -0,0 +1,57 @@
+import json
+import os
+import random
+import sys
+import time
+import timeit
+
+
+class JsonBench:
+    def __init__(self, frames=1000, rounds=50):
+        payload = json.dumps(self.payload(frames)).encode()
+        print(f"Payload: {frames} frames, {len(payload) / 1024:.1f} KiB")
+
+        for name, loads in JsonUtils.get_json_backends().items():
+            best = min(timeit.repeat(lambda: loads(payload), number=rounds, repeat=5))
+            print(f"{name:>8}: {best / rounds * 1000:.3f} ms per {frames} frames")
+
+    @staticmethod
+    def payload(frames):
+        now = time.time()
+        return [
+            {
+                "type": "pokemon",
+                "message": {
+                    "encounter_id": str(random.getrandbits(63)),
+                    "spawnpoint_id": f"{random.getrandbits(40):x}",
+                    "pokemon_id": random.randint(1, 905),
+                    "form": random.choice([0, None, 1360]),
+                    "latitude": 37.7876146 + random.uniform(-0.1, 0.1),
+                    "longitude": -122.390624 + random.uniform(-0.1, 0.1),
+                    "disappear_time": int(now) + random.randint(60, 3600),
+                    "disappear_time_verified": random.choice([True, False]),
+                    "individual_attack": random.randint(0, 15),
+                    "individual_defense": random.randint(0, 15),
+                    "individual_stamina": random.randint(0, 15),
+                    "move_1": random.randint(200, 300),
+                    "move_2": random.randint(13, 400),
+                    "cp": random.randint(10, 3500),
+                    "pokemon_level": random.randint(1, 35),
+                    "height": random.uniform(0.2, 2.0),
+                    "weight": random.uniform(1.0, 100.0),
+                    "gender": random.randint(1, 3),
+                    "weather": random.randint(0, 7),
+                    "costume": 0,
+                    "shiny": False,
+                    "username": "bench",
+                },
+            }
+            for _ in range(frames)
+        ]
+
+
+if __name__ == "__main__" and __package__ is None:
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from PokeAlarm.Utilities import JsonUtils
+
+    JsonBench()
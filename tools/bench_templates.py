@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import sys
+import time
+import timeit
+
+
+class BenchManager(object):
+    """Bare manager providing what Alarms need at load time."""
+
+    def get_child_logger(self, name):
+        return logging.getLogger("bench").getChild(name)
+
+
+def replace_each_key(string, pkinfo):
+    """Previous Alarm.replace, searching the string for every DTS."""
+    if string is None:
+        return None
+    s = string
+    for key in pkinfo:
+        s = s.replace(f"<{key}>", str(pkinfo[key]))
+    return s
+
+
+class TemplateBench:
+    def __init__(self, path, rounds=200):
+        with open(path) as f:
+            alarms = json.load(f)
+        event = Events.MonEvent(self.monster())
+        dts = dict(event.generate_dts(Locale("en"), None, "metric"))
+        print(f"Alarms: {path}, DTS: {len(dts)}")
+
+        for name, settings in alarms.items():
+            settings.pop("active", None)
+            try:
+                alarm = Alarms.alarm_factory(BenchManager(), settings, 3, None, None)
+            except ImportError as e:
+                print(f"{name:>16}: skipped ({e})")
+                continue
+            templates = self.templates(vars(alarm))
+            assert [replace_each_key(t, dts) for t in templates] == [
+                Alarm.replace(t, dts) for t in templates
+            ], f"Templates of '{name}' render differently"
+
+            results = []
+            for replace in (replace_each_key, Alarm.replace):
+                best = min(
+                    timeit.repeat(
+                        lambda: [replace(t, dts) for t in templates],
+                        number=rounds,
+                        repeat=5,
+                    )
+                )
+                results.append(best / rounds * 1e6)
+            print(
+                f"{name:>16}: {len(templates)} templates, "
+                f"{results[0]:.0f} us each key, {results[1]:.0f} us parsed "
+                f"({results[0] / results[1]:.1f}x)"
+            )
+
+    @staticmethod
+    def templates(settings):
+        """Returns the Templates of the alert settings of an alarm."""
+        if isinstance(settings, Template):
+            return [settings]
+        if isinstance(settings, dict):
+            settings = list(settings.values())
+        if not isinstance(settings, (list, tuple)):
+            return []
+        return [t for value in settings for t in TemplateBench.templates(value)]
+
+    @staticmethod
+    def monster():
+        return {
+            "encounter_id": "5286465306437441357",
+            "spawnpoint_id": "4c2d2a5b0e3",
+            "pokemon_id": 149,
+            "form": 0,
+            "latitude": 37.7876146,
+            "longitude": -122.390624,
+            "disappear_time": int(time.time()) + 1200,
+            "disappear_time_verified": True,
+            "individual_attack": 15,
+            "individual_defense": 14,
+            "individual_stamina": 15,
+            "move_1": 204,
+            "move_2": 83,
+            "cp": 3112,
+            "pokemon_level": 30,
+            "height": 2.2,
+            "weight": 210.0,
+            "gender": 1,
+            "weather": 5,
+            "costume": 0,
+        }
+
+
+if __name__ == "__main__" and __package__ is None:
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.append(root)
+    from PokeAlarm import Alarms, Events
+    from PokeAlarm.Alarms import Alarm, Template
+    from PokeAlarm.Locale import Locale
+
+    TemplateBench(
+        sys.argv[1] if len(sys.argv) > 1 else os.path.join(root, "alarms.json.example")
+    )
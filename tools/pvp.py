@@ -1,12 +1,20 @@
+import argparse
 import json
 import sys
 import os
-import itertools
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import requests
 
 
 class PVP:
-    def __init__(self, pa_root):
+    OUTPUT = "tools/generated_stat_products.json"
+    # Base stats the products in OUTPUT were generated from
+    STATE = "tools/.generated_stat_products_state.json"
+
+    def __init__(self, pa_root, workers=None, full=False):
+        start = time.perf_counter()
+
         # Fetch pokemon data
         master_file = "https://raw.githubusercontent.com/WatWowMap/Masterfile-Generator/master/master-latest-everything.json"
         master_file = requests.get(master_file)
@@ -15,76 +23,100 @@ class PVP:
             json.dump(monster_data, f, indent=2)
             f.close()
 
-        # Calculate PvP products
+        # Only regenerate the forms whose base stats changed since the last run
         monster_forms = utils.get_raw_form_names()
-        cp_multipliers = utils.get_cp_multipliers()
+        state = self.current_state(monster_forms)
+        previous_products, previous_state = {}, {}
+        if not full:
+            previous_products, previous_state = self.load_previous(pa_root)
+        if previous_state.get("cp_multipliers") != state["cp_multipliers"]:
+            previous_state = {}
 
         monster_products = {}
-
+        todo = {}
         for id_ in monster_forms:
             monster_products[id_] = {}
             for form_id_ in monster_forms[id_]:
-                monster_products[id_][form_id_] = {}
-                for limit in [1500, 2500]:
-                    highest_product = self.spreads(
-                        limit,
-                        id_,
-                        form_id_,
-                        self.min_level(limit, id_, form_id_),
-                        self.max_level(limit, id_, form_id_),
-                        cp_multipliers,
-                    )
-
-                    monster_products[id_][form_id_][
-                        f"{limit}_highest_product"
-                    ] = highest_product
-
+                key = f"{id_}_{form_id_}"
+                products = previous_products.get(str(id_), {}).get(str(form_id_))
+                if products is not None and previous_state.get(key) == state[key]:
+                    monster_products[id_][form_id_] = products
+                else:
+                    todo.setdefault(id_, []).append(form_id_)
+
+        # Calculate PvP products of each species in a process pool
+        total = sum(len(forms) for forms in todo.values())
+        count = len(state) - 1  # All but the cp multipliers
+        print(f"Generating {total} of {count} forms ({count - total} unchanged)")
+        done = 0
+        with ProcessPoolExecutor(
+            workers, initializer=init_worker, initargs=(pa_root,)
+        ) as pool:
+            futures = [
+                pool.submit(species_products, id_, forms) for id_, forms in todo.items()
+            ]
+            for future in as_completed(futures):
+                id_, products = future.result()
+                for form_id_, form_products in products.items():
+                    monster_products[id_][form_id_] = form_products
+                    done += 1
                     print(
-                        f"{id_}_{form_id_}: highest product at {limit}: {highest_product}"
+                        f"[{done}/{total}] {id_}_{form_id_}: highest products "
+                        f"{form_products['1500_highest_product']} (1500), "
+                        f"{form_products['2500_highest_product']} (2500)"
                     )
 
-        with open(f"{pa_root}/tools/generated_stat_products.json", "w+") as f:
+        with open(os.path.join(pa_root, self.OUTPUT), "w+") as f:
             json.dump(monster_products, f, indent=2)
             f.close()
+        with open(os.path.join(pa_root, self.STATE), "w") as f:
+            json.dump(state, f)
 
-    @staticmethod
-    def max_level(cp_limit, monster_id, form_id=0):
-        if utils.max_cp(monster_id, form_id) <= cp_limit:
-            return 50.0
-
-        cp_base = utils.calculate_cp_base(monster_id, form_id, 0, 0, 0)
-        cp, lvl = utils.bisect_levels(cp_limit, cp_base, 1, 50)
-        return min(lvl + 1, 50)
+        print(f"Done in {time.perf_counter() - start:.1f}s")
 
     @staticmethod
-    def min_level(cp_limit, monster_id, form_id=0):
-        if utils.max_cp(monster_id, form_id) <= cp_limit:
-            return 50.0
-
-        cp_base = utils.calculate_cp_base(monster_id, form_id, 15, 15, 15)
-        cp, lvl = utils.bisect_levels(cp_limit, cp_base, 1, 50)
-        return max(lvl - 1, 1)
-
-    @staticmethod
-    def spreads(limit, monster_id, form_id, min_level, max_level, cp_multipliers):
-        base_stats = utils.get_base_stats(monster_id, form_id)
-        highest_product = 0
-
-        for iv in itertools.product(range(16), range(16), range(16)):
-            cp_base = utils.calculate_cp_base(monster_id, form_id, iv[0], iv[1], iv[2])
-            cp, level = utils.bisect_levels(limit, cp_base, min_level, max_level)
-            if cp == 0:
-                continue
-
-            attack = (base_stats["attack"] + iv[0]) * cp_multipliers[level]
-            defense = (base_stats["defense"] + iv[1]) * cp_multipliers[level]
-            stamina = int((base_stats["stamina"] + iv[2]) * cp_multipliers[level])
-            product = attack * defense * stamina
-
-            if product > highest_product:
-                highest_product = product
-
-        return highest_product
+    def current_state(monster_forms):
+        multipliers = utils.get_cp_multipliers()
+        state = {"cp_multipliers": [[lvl, multipliers[lvl]] for lvl in multipliers]}
+        for id_ in monster_forms:
+            for form_id_ in monster_forms[id_]:
+                stats = utils.get_base_stats(id_, form_id_)
+                state[f"{id_}_{form_id_}"] = [
+                    stats["attack"],
+                    stats["defense"],
+                    stats["stamina"],
+                ]
+        return state
+
+    @classmethod
+    def load_previous(cls, pa_root):
+        try:
+            with open(os.path.join(pa_root, cls.OUTPUT), "r") as f:
+                products = json.load(f)
+            with open(os.path.join(pa_root, cls.STATE), "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}, {}
+        return products, state
+
+
+def init_worker(pa_root):
+    if pa_root not in sys.path:
+        sys.path.append(pa_root)
+
+
+def species_products(id_, forms):
+    from PokeAlarm.Utilities import PvpUtils
+
+    products = {}
+    for form_id_ in forms:
+        products[form_id_] = {
+            f"{limit}_highest_product": PvpUtils.rank_table(
+                limit, id_, form_id_
+            ).best_product
+            for limit in PvpUtils.LEAGUES
+        }
+    return id_, products
 
 
 if __name__ == "__main__" and __package__ is None:
@@ -92,4 +124,21 @@ if __name__ == "__main__" and __package__ is None:
     root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     import PokeAlarm.Utils as utils
 
-    PVP(root)
+    parser = argparse.ArgumentParser(
+        description="Generate the highest PvP stat products of every monster."
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of processes to use (Default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Regenerate all monsters, not only the ones whose stats changed",
+    )
+    args = parser.parse_args()
+
+    PVP(root, args.workers, args.full)